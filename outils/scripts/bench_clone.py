@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Etat.clone (partage structurel) contre copy.deepcopy (cabinet).
+
+Construit un état de fin de partie (définitions de cartes, decks, mains,
+historiques), puis simule des branches « et si » : chaque branche clone
+l'état, modifie un axe, pioche une carte pour un joueur et ajoute une entrée
+d'historique. Vérifie que les deux méthodes donnent les mêmes branches.
+
+    PYTHONPATH=packages python outils/scripts/bench_clone.py [--branches 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from cabinet.moteur.etat import Etat
+from cabinet.moteur.factories import construire_etat
+
+
+def _etat_long(cartes: int, joueurs: int, historiques: int) -> Etat:
+    ids = [f"C{i:04d}" for i in range(cartes)]
+    cfg = {
+        "axes_tension": [
+            {"id": f"axe{i}", "valeur": 5, "seuil_crise": 2, "poids": 1.0}
+            for i in range(12)
+        ],
+        "economie_initiale": {
+            "taux_impot_part": 0.20,
+            "taux_impot_ent": 0.20,
+            "taux_redevances": 0.05,
+            "taux_interet": 0.02,
+            "base_part": 1000,
+            "base_ent": 800,
+            "base_ressources": 200,
+            "depenses_postes": {f"poste{i}": 10 * i for i in range(10)},
+            "dette": 0,
+            "capacite_max": 3,
+            "efficience": 1.0,
+        },
+        "joueurs": {
+            f"J{j}": {"nom": f"J{j}", "capital": 5, "main": ids[j * 10 : j * 10 + 10]}
+            for j in range(joueurs)
+        },
+        "deck_global": {"pioche": ids[joueurs * 10 :], "defausse": []},
+        "deck_events": {"pioche": [f"E{i:03d}" for i in range(100)], "defausse": []},
+        "historiques": [
+            {"tour": t, "evt": "vote", "votes": {"J0": True, "J1": False}}
+            for t in range(historiques)
+        ],
+        "cartes_def": {
+            c: {"type": "mesure", "cout": 1, "effets": {"axe0": 1, "axe1": -1}}
+            for c in ids
+        },
+    }
+    return construire_etat(cfg)
+
+
+def _branche_profonde(etat: Etat, k: int) -> Etat:
+    b = etat.copie_profonde()
+    b.axes[f"axe{k % 12}"].valeur += 1
+    j = f"J{k % len(b.joueurs)}"
+    b.joueurs[j].main.append(b.deck_global.pioche.popleft())
+    b.historiques.append({"tour": b.tour, "evt": "simulation", "branche": k})
+    return b
+
+
+def _branche_partagee(etat: Etat, k: int) -> Etat:
+    b = etat.clone()
+    b.axe_mut(f"axe{k % 12}").valeur += 1
+    j = f"J{k % len(b.joueurs)}"
+    b.joueur_mut(j).main.append(b.deck_global_mut().pioche.popleft())
+    b.historiques_mut().append({"tour": b.tour, "evt": "simulation", "branche": k})
+    return b
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--branches", type=int, default=2_000)
+    ap.add_argument("--cartes", type=int, default=500)
+    ap.add_argument("--joueurs", type=int, default=6)
+    ap.add_argument("--historiques", type=int, default=5_000)
+    args = ap.parse_args()
+
+    etat = _etat_long(args.cartes, args.joueurs, args.historiques)
+    print(
+        f"état: {len(etat.cartes_def)} cartes, {len(etat.joueurs)} joueurs, "
+        f"{len(etat.historiques)} historiques, {len(etat.deck_global.pioche)} en pioche"
+    )
+    for k in range(min(args.branches, 20)):
+        if _branche_profonde(etat, k) != _branche_partagee(etat, k):
+            raise SystemExit(f"❌ branche {k} différente selon la méthode")
+    if etat != _etat_long(args.cartes, args.joueurs, args.historiques):
+        raise SystemExit("❌ l'état d'origine a été modifié par une branche")
+
+    print(f"{'méthode':24} {'µs/branche':>11}")
+    resultats = {}
+    for nom, branche in (
+        ("deepcopy", _branche_profonde),
+        ("clone (partage)", _branche_partagee),
+    ):
+        t0 = time.perf_counter()
+        for k in range(args.branches):
+            branche(etat, k)
+        resultats[nom] = (time.perf_counter() - t0) / args.branches
+        print(f"{nom:24} {resultats[nom] * 1e6:11.1f}")
+    gain = resultats["deepcopy"] / resultats["clone (partage)"]
+    print(f"gain: x{gain:.0f}")
+
+
+if __name__ == "__main__":
+    main()
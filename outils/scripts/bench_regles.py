@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: règle générique interprétée vs compilée (compiler_regles).
+
+Pour chaque action du YAML, mesure le temps moyen d'un appel de règle sur un état
+figé (phase autorisée, attention illimitée) et vérifie que les deux chemins
+produisent le même flux d'Evenement.
+
+    python outils/scripts/bench_regles.py [--regles docs/regles/reforme-x.yaml] [--n 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import time
+from pathlib import Path
+
+from moteur_jeu import Moteur, Action, EtatJeu, Joueur
+from moteur_jeu.regles_loader import charger_yaml, construire_regle_generique
+
+from regles_interpretees import construire_regle_interpretee
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _etat_initial() -> EtatJeu:
+    etat = EtatJeu(id="bench", tension=0, max_tours=10**9)
+    etat.joueurs["j1"] = Joueur(id="j1", nom="Alice", role="reformateur")
+    etat.joueurs["j2"] = Joueur(id="j2", nom="Bob", role="saboteur")
+    etat.contentieux["reforme_x"] = {"id": "reforme_x", "soutien": 0}
+    return etat
+
+
+def _flux(regle, etat: EtatJeu, action: Action, n: int):
+    m = Moteur(etat=etat, regles=[regle])
+    out = []
+    for _ in range(n):
+        out.append([(e.type, e.donnees) for e in regle(m.etat, action) or []])
+    return out
+
+
+def _chrono(regle, etat: EtatJeu, action: Action, phase: str, n: int) -> float:
+    Moteur(etat=etat, regles=[regle])
+    j = etat.joueurs[action.auteur_id]
+    t0 = time.perf_counter()
+    for _ in range(n):
+        etat.phase = phase
+        j.attention = 1_000
+        regle(etat, action)
+    return (time.perf_counter() - t0) / n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument(
+        "--regles", default=str(ROOT / "docs" / "regles" / "reforme-x.yaml")
+    )
+    ap.add_argument("--n", type=int, default=20_000)
+    args = ap.parse_args()
+
+    cfg = charger_yaml(args.regles)
+    compilee = construire_regle_generique(cfg)
+    interpretee = construire_regle_interpretee(cfg)
+
+    print(f"{'action':28} {'interp. µs':>11} {'compilée µs':>12} {'gain':>6}")
+    tot_i = tot_c = 0.0
+    for aid, a_cfg in cfg.actions.items():
+        phase = (a_cfg.get("allowed_phases") or ["definition"])[0]
+        action = Action(type=aid, auteur_id="j1", payload={})
+
+        base = _etat_initial()
+        base.phase = phase
+        base.joueurs["j1"].attention = 1_000
+        ref = _flux(interpretee, copy.deepcopy(base), action, 50)
+        cmp = _flux(compilee, copy.deepcopy(base), action, 50)
+        if ref != cmp:
+            raise SystemExit(f"❌ flux d'événements différent pour {aid}")
+
+        ti = _chrono(interpretee, copy.deepcopy(base), action, phase, args.n)
+        tc = _chrono(compilee, copy.deepcopy(base), action, phase, args.n)
+        tot_i += ti
+        tot_c += tc
+        print(f"{aid:28} {ti * 1e6:11.2f} {tc * 1e6:12.2f} {ti / tc:5.2f}x")
+
+    print(f"{'TOTAL':28} {tot_i * 1e6:11.2f} {tot_c * 1e6:12.2f} {tot_i / tot_c:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: formats de sauvegarde (JSON indenté, JSON compact, binaire .avp).
+
+Joue une longue partie reproductible avec les règles YAML, puis mesure pour chaque
+format la taille du fichier, le temps de sauvegarde et le temps de rechargement
+(moteur_depuis_fichier), et vérifie que l'état relu est identique.
+
+    python outils/scripts/bench_sauvegarde.py [--tours 2000] [--repetitions 5]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from moteur_jeu import Moteur, Action, EtatJeu, Joueur
+from moteur_jeu import persistence as P
+from moteur_jeu.regles_loader import appliquer_etat_initial_contentieux
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _partie_longue(regles: str, tours: int) -> Moteur:
+    etat = EtatJeu(id="bench", tension=0, max_tours=10**9)
+    etat.joueurs["j1"] = Joueur(id="j1", nom="Alice")
+    etat.joueurs["j2"] = Joueur(id="j2", nom="Bob")
+    m = Moteur(etat=etat)
+    cfg = m.attacher_regles_yaml(regles)
+    appliquer_etat_initial_contentieux(etat, cfg)
+    actions = list(cfg.actions)
+    for t in range(tours):
+        m.debut_nouveau_tour()
+        for jid in ("j1", "j2"):
+            a = actions[(t + len(jid)) % len(actions)]
+            m.appliquer_action(Action(type=a, auteur_id=jid, payload={}))
+    return m
+
+
+def _formats():
+    yield "json indent=2", "partie.json", {"indent": 2}
+    yield "json compact", "partie.json", {"indent": None}
+    yield "binaire json+zlib", "partie.avp", {"codec": "json", "compression": "zlib"}
+    if P.msgpack is not None:
+        yield "binaire msgpack", "partie.avp", {
+            "codec": "msgpack",
+            "compression": "aucune",
+        }
+        yield "binaire msgpack+zlib", "partie.avp", {
+            "codec": "msgpack",
+            "compression": "zlib",
+        }
+    if P.zstandard is not None:
+        yield "binaire défaut+zstd", "partie.avp", {"compression": "zstd"}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument(
+        "--regles", default=str(ROOT / "docs" / "regles" / "reforme-x.yaml")
+    )
+    ap.add_argument("--tours", type=int, default=2_000)
+    ap.add_argument("--repetitions", type=int, default=5)
+    args = ap.parse_args()
+
+    m = _partie_longue(args.regles, args.tours)
+    ref = P.etat_to_dict(m.etat)
+    print(
+        f"partie: {len(m.etat.journal)} entrées de journal, "
+        f"{len(m.etat.pile_evenements)} événements "
+        f"(msgpack={'oui' if P.msgpack else 'non'}, "
+        f"orjson={'oui' if P.orjson else 'non'}, "
+        f"zstd={'oui' if P.zstandard else 'non'})"
+    )
+    print(f"{'format':24} {'taille Ko':>10} {'save ms':>9} {'load ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for nom, fichier, opts in _formats():
+            path = str(Path(tmp) / fichier)
+            t0 = time.perf_counter()
+            for _ in range(args.repetitions):
+                P.sauvegarder(m.etat, path, **opts)
+            t_save = (time.perf_counter() - t0) / args.repetitions
+            t0 = time.perf_counter()
+            for _ in range(args.repetitions):
+                m2 = P.moteur_depuis_fichier(path)
+            t_load = (time.perf_counter() - t0) / args.repetitions
+            if P.etat_to_dict(m2.etat) != ref:
+                raise SystemExit(f"❌ état relu différent pour {nom}")
+            taille = Path(path).stat().st_size / 1024
+            print(f"{nom:24} {taille:10.1f} {t_save * 1e3:9.2f} {t_load * 1e3:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de charge: actions concurrentes sur l'API (verrou par partie).
+
+Crée N parties via le flux des tables, inscrit dans chacune une joueuse
+« reformatrice » puis, à chaque tour, lui envoie K `lobby_prive` simultanés
+(coût 1, attention 3). Vérifie que chaque tour accepte exactement 3 actions
+et que l'attention restante correspond aux réponses 200 (ni double paiement ni
+passage sous 0), toutes parties jouées en parallèle.
+
+    python outils/scripts/charge_api.py [--base http://127.0.0.1:8080] \
+        [--parties 20] [--concurrence 20] [--tours 5]
+    python outils/scripts/charge_api.py --asgi   # sans serveur, app en process
+
+Nécessite httpx (déjà tiré par fastapi[testclient]).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+COUT = 1
+ATTENTION_PAR_TOUR = 3
+
+
+async def _partie(c: httpx.AsyncClient) -> tuple[str, str]:
+    tid = (await c.post("/tables", json={})).json()["table"]["id"]
+    for nom in ("Alice", "Bob"):
+        await c.post(f"/tables/{tid}/join", json={"nom": nom})
+    r = await c.post(f"/tables/{tid}/start", json={"host": "Alice"})
+    pid = r.json()["pid"]
+    # ajouter_joueur attribue « reformateur » au premier inscrit à chaud
+    r = (await c.post(f"/parties/{pid}/inscrire", json={"nom": "Carla"})).json()
+    jid = r["joueur"]["id"]
+    corps = {"type": "ouvrir_negociation", "auteur_id": jid}
+    await c.post(f"/parties/{pid}/actions", json=corps)
+    return pid, jid
+
+
+async def _tour(c: httpx.AsyncClient, pid: str, jid: str, k: int) -> int:
+    corps = {"type": "lobby_prive", "auteur_id": jid}
+    reps = await asyncio.gather(
+        *(c.post(f"/parties/{pid}/actions", json=corps) for _ in range(k))
+    )
+    ok = sum(r.status_code == 200 for r in reps)
+    etat = (await c.get(f"/parties/{pid}")).json()
+    attention = etat["joueurs"][jid]["attention"]
+    max_ok = min(k, ATTENTION_PAR_TOUR // COUT)
+    if ok != max_ok or attention != ATTENTION_PAR_TOUR - COUT * ok:
+        raise AssertionError(
+            f"partie {pid}: {ok} actions acceptées, attention={attention}"
+        )
+    await c.post(f"/parties/{pid}/tour/debut")
+    return ok
+
+
+async def _scenario(c: httpx.AsyncClient, tours: int, k: int) -> int:
+    pid, jid = await _partie(c)
+    total = 0
+    for _ in range(tours):
+        total += await _tour(c, pid, jid, k)
+    return total
+
+
+async def main_async(args) -> int:
+    if args.asgi:
+        racine = os.path.dirname(os.path.abspath(__file__))
+        sys.path.insert(0, os.path.join(racine, "..", "..", "packages", "api"))
+        from api.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base = "http://asgi"
+    else:
+        transport = None
+        base = args.base
+    limites = httpx.Limits(max_connections=args.parties * args.concurrence)
+    async with httpx.AsyncClient(
+        base_url=base, transport=transport, limits=limites, timeout=30
+    ) as c:
+        t0 = time.perf_counter()
+        acceptees = await asyncio.gather(
+            *(_scenario(c, args.tours, args.concurrence) for _ in range(args.parties))
+        )
+        dt = time.perf_counter() - t0
+    envoyees = args.parties * args.tours * args.concurrence
+    print(
+        f"✅ {args.parties} parties x {args.tours} tours x {args.concurrence} "
+        f"requêtes concurrentes: {sum(acceptees)} acceptées / {envoyees} envoyées, "
+        f"{envoyees / dt:.0f} req/s"
+    )
+    return 0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument(
+        "--base", default=os.environ.get("API_BASE", "http://127.0.0.1:8080")
+    )
+    ap.add_argument("--parties", type=int, default=20)
+    ap.add_argument("--concurrence", type=int, default=20)
+    ap.add_argument("--tours", type=int, default=5)
+    ap.add_argument("--asgi", action="store_true", help="app en process, sans serveur")
+    args = ap.parse_args()
+    try:
+        sys.exit(asyncio.run(main_async(args)))
+    except AssertionError as e:
+        sys.exit(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interprète de référence des règles YAML (effets parcourus à chaque appel).
+
+Le moteur n'exécute que la forme compilée (regles_loader.compiler_regles) ;
+cet interprète sert de référence: bench_regles.py compare les temps, et
+tests/integration/test_regles_parite.py (cabinet) vérifie que les deux
+produisent le même flux d'Evenement.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from moteur_jeu.moteur import Action, EtatJeu, Evenement, Joueur
+from moteur_jeu.regles_loader import Regle, ReglesConfig, _check_preconditions
+
+
+def _apply_effects(
+    etat: "EtatJeu",
+    effects: List[Dict[str, Any]],
+    evts: List["Evenement"],
+    *,
+    moteur: Optional[Any] = None,
+    cfg: Optional["ReglesConfig"] = None,
+    auteur_id: Optional[str] = None,
+) -> None:
+    """
+    Applique une liste d'effets au jeu. Peut utiliser le RNG du moteur (via etat._moteur)
+    et le catalogue de perturbations de cfg.
+
+    """
+    for eff in effects:
+        etype = eff.get("type")
+        params = eff.get("params", {}) or {}
+
+        if etype == "tension_delta":
+            delta = int(params.get("delta", 0))
+            etat.tension += delta
+            evts.append(
+                Evenement(
+                    "tension_changee",
+                    {"delta": delta, "nouvelle_tension": etat.tension},
+                )
+            )
+
+        elif etype == "emit_event":
+            etype_ev = params.get("event_type", "evenement")
+            data = params.get("data", {}) or {}
+            evts.append(Evenement(etype_ev, data))
+
+        elif etype == "contentieux_delta":
+            cid = params["id"]
+            field = params["field"]
+            delta = int(params.get("delta", 0))
+            if not hasattr(etat, "contentieux") or cid not in etat.contentieux:
+                evts.append(
+                    Evenement("erreur", {"msg": "contentieux_introuvable", "id": cid})
+                )
+            else:
+                cont = etat.contentieux[cid]
+                cont[field] = int(cont.get(field, 0)) + delta
+                evts.append(
+                    Evenement(
+                        "contentieux_modifie",
+                        {
+                            "id": cid,
+                            "field": field,
+                            "delta": delta,
+                            "valeur": cont[field],
+                        },
+                    )
+                )
+
+        elif etype == "phase_set":
+            name = params.get("name")
+            if not name:
+                evts.append(Evenement("erreur", {"msg": "phase_invalide"}))
+            else:
+                etat.phase = name
+                evts.append(Evenement("phase_changee", {"phase": name}))
+
+        elif etype == "attention_delta":
+            target = params.get("target", "auteur")
+            delta = int(params.get("delta", 0))
+            jid = params.get("joueur_id") if target != "auteur" else auteur_id
+            j = etat.joueurs.get(jid) if jid else None
+            if not j:
+                evts.append(
+                    Evenement("erreur", {"msg": "joueur_introuvable", "cible": target})
+                )
+            else:
+                j.attention = max(0, j.attention + delta)
+                evts.append(
+                    Evenement(
+                        "attention_changee",
+                        {"joueur_id": j.id, "delta": delta, "valeur": j.attention},
+                    )
+                )
+
+        elif etype == "random_perturbation":
+            if moteur is None and hasattr(etat, "_moteur"):
+                moteur = getattr(etat, "_moteur")
+            cfg = cfg  # déjà reçu
+            if moteur is None or cfg is None or not cfg.perturbations:
+                evts.append(Evenement("erreur", {"msg": "aucune_perturbation"}))
+                continue
+
+            auteur = etat.joueurs.get(auteur_id) if auteur_id else None
+            items = []
+            weights = []
+            for p in cfg.perturbations:
+                ok = True
+                if auteur:
+                    only_roles = p.get("only_roles") or []
+                    only_tags = p.get("only_role_tags") or []
+                    if only_roles and auteur.role not in only_roles:
+                        ok = False
+                    if ok and only_tags:
+                        role_tags = (
+                            cfg.roles.get(auteur.role, {}).get("tags")
+                            if cfg.roles
+                            else []
+                        ) or []
+                        if not any(t in role_tags for t in only_tags):
+                            ok = False
+                if ok:
+                    items.append(p)
+                    weights.append(float(p.get("weight", 1.0)))
+
+            if not items:
+                evts.append(
+                    Evenement("erreur", {"msg": "aucune_perturbation_applicable"})
+                )
+                continue
+
+            choice = moteur._rng_choice_weighted(items, weights)
+            pid = choice.get("id")
+            evts.append(Evenement("perturbation_tiree", {"id": pid}))
+            sub_effects = choice.get("effects", []) or []
+            _apply_effects(
+                etat, sub_effects, evts, moteur=moteur, cfg=cfg, auteur_id=auteur_id
+            )
+
+        elif etype == "apply_perturbation":
+            pid = params.get("id")
+            found = None
+            for p in cfg.perturbations if cfg else []:
+                if p.get("id") == pid:
+                    found = p
+                    break
+            if not found:
+                evts.append(
+                    Evenement("erreur", {"msg": "perturbation_introuvable", "id": pid})
+                )
+            else:
+                evts.append(Evenement("perturbation_appliquee", {"id": pid}))
+                sub_effects = found.get("effects", []) or []
+                _apply_effects(
+                    etat, sub_effects, evts, moteur=moteur, cfg=cfg, auteur_id=auteur_id
+                )
+
+        else:
+            evts.append(Evenement("erreur", {"msg": "effet_inconnu", "type": etype}))
+
+
+def _check_victory(etat: EtatJeu, cfg: ReglesConfig, evts: List[Evenement]) -> None:
+    for rule in cfg.victoires:
+        t = rule["type"]
+        p = rule.get("params", {}) or {}
+        label = rule.get("label", t)
+        if t == "contentieux_gte":
+            cid = p["id"]
+            field = p["field"]
+            value = int(p["value"])
+            cur = int(getattr(etat, "contentieux", {}).get(cid, {}).get(field, 0))
+            if cur >= value:
+                evts.append(
+                    Evenement(
+                        "victoire",
+                        {
+                            "label": label,
+                            "id": cid,
+                            "field": field,
+                            "seuil": value,
+                            "valeur": cur,
+                        },
+                    )
+                )
+        elif t == "tension_gte":
+            value = int(p["value"])
+            if etat.tension >= value:
+                evts.append(
+                    Evenement(
+                        "defaite",
+                        {"label": label, "seuil": value, "valeur": etat.tension},
+                    )
+                )
+
+
+def construire_regle_interpretee(cfg: ReglesConfig) -> Regle:
+    """Règle générique non compilée: les effets relus du YAML à chaque appel."""
+
+    def regle(etat: EtatJeu, action: Action) -> Optional[List[Evenement]]:
+        a_cfg = cfg.actions.get(action.type)
+        if not a_cfg:
+            return None
+
+        # Vérifier préconditions et ressources
+        pre = _check_preconditions(etat, action, a_cfg)
+        if pre:
+            return [pre]
+
+        # Paiement de l'attention
+        j: Optional[Joueur] = etat.joueurs.get(action.auteur_id)
+        if not j:
+            return [
+                Evenement(
+                    "erreur",
+                    {"msg": "joueur_introuvable", "joueur_id": action.auteur_id},
+                )
+            ]
+        cost = int(a_cfg.get("attention_cost", 1))
+        j.attention -= cost
+
+        evts: List[Evenement] = [
+            Evenement(
+                "attention_depensee",
+                {"joueur_id": j.id, "reste": j.attention, "cost": cost},
+            )
+        ]
+
+        # Appliquer effets
+        # >>> IMPORTANT: on récupère le moteur via closure? pas direct. On l'injecte par setattr temporaire
+        moteur = getattr(etat, "_moteur", None)
+
+        _apply_effects(
+            etat,
+            a_cfg.get("effects", []),
+            evts,
+            moteur=moteur,
+            cfg=cfg,
+            auteur_id=action.auteur_id,
+        )
+
+        # Vérifier conditions de victoire/échec
+        _check_victory(etat, cfg, evts)
+        return evts
+
+    return regle
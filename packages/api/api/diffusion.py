@@ -0,0 +1,201 @@
+"""Diffusion des journaux de partie aux abonnés WebSocket.
+
+Un HubPartie par partie s'abonne au Moteur (Moteur.abonner) : chaque entrée de
+journal est sérialisée une seule fois, dans le thread qui l'a produite, puis
+remise à la boucle asyncio qui la pousse dans la file de chaque abonné.
+
+Une file pleine (client trop lent) n'est pas agrandie : l'abonné passe « en
+retard », ses messages en attente sont jetés et il se resynchronise en relisant
+le journal depuis son curseur. Le curseur (index de la prochaine entrée à
+envoyer) sert aussi à reprendre un abonnement après reconnexion.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from moteur_jeu.moteur import Moteur
+
+TAILLE_FILE = 256
+TAILLE_REPERES = 256  # versions dont on sait retrouver la position du journal
+
+
+def _serialiser(entrees: List[Dict[str, Any]]) -> str:
+    # format historique de /ws: une liste d'entrées de journal
+    return json.dumps(entrees, ensure_ascii=False)
+
+
+class Abonne:
+    def __init__(self, curseur: int, taille_file: Optional[int] = None):
+        self.curseur = curseur
+        self.file: asyncio.Queue[Tuple[int, str]] = asyncio.Queue(
+            taille_file or TAILLE_FILE
+        )
+        self.en_retard = False
+
+    def pousser(self, index: int, payload: str) -> None:
+        if self.en_retard:
+            return
+        try:
+            self.file.put_nowait((index, payload))
+        except asyncio.QueueFull:
+            self.en_retard = True
+
+
+class HubPartie:
+    def __init__(self, moteur: Moteur, verrou: asyncio.Lock):
+        self.loop = asyncio.get_running_loop()
+        self.verrou = verrou
+        self.abonnes: Set[Abonne] = set()
+        self.moteur: Optional[Moteur] = None
+        self.rattacher(moteur)
+
+    def rattacher(self, moteur: Moteur) -> None:
+        """Suit un nouveau Moteur pour la même partie (ex. après /parties/load)."""
+        if self.moteur is not None:
+            self.moteur.desabonner(self._sur_entree)
+        self.moteur = moteur
+        moteur.abonner(self._sur_entree)
+
+    # --- côté moteur (thread du threadpool, verrou de partie tenu) -----------
+    def _sur_entree(self, entree: Dict[str, Any]) -> None:
+        if not self.abonnes:
+            return
+        index = len(self.moteur.etat.journal) - 1
+        payload = _serialiser([entree])
+        self.loop.call_soon_threadsafe(self._diffuser, index, payload)
+
+    # --- côté boucle ------------------------------------------------------------
+    def _diffuser(self, index: int, payload: str) -> None:
+        for ab in self.abonnes:
+            ab.pousser(index, payload)
+
+    async def _lire_depuis(self, ab: Abonne) -> Optional[str]:
+        """Entrées [curseur, fin) lues sous le verrou de partie, curseur avancé."""
+        async with self.verrou:
+            journal = self.moteur.etat.journal
+            fin = len(journal)
+            if fin <= ab.curseur:
+                return None
+            entrees = list(journal.iter_depuis(ab.curseur, fin))
+            ab.curseur = fin
+        return _serialiser(entrees)
+
+    async def abonner(
+        self, depuis: Optional[int] = None
+    ) -> Tuple[Abonne, Optional[str]]:
+        """Inscrit un abonné et renvoie l'arriéré depuis `depuis` (None: rien).
+
+        L'abonné est inscrit avant la lecture du journal: une entrée ajoutée entre
+        les deux arrive dans sa file et sera ignorée (index < curseur) si
+        l'arriéré la contenait déjà.
+        """
+        ab = Abonne(len(self.moteur.etat.journal) if depuis is None else depuis)
+        self.abonnes.add(ab)
+        arriere = await self._lire_depuis(ab) if depuis is not None else None
+        return ab, arriere
+
+    def desabonner(self, ab: Abonne) -> None:
+        self.abonnes.discard(ab)
+
+    async def prochain(self, ab: Abonne) -> str:
+        """Prochain message à envoyer à cet abonné (attend s'il n'y en a pas)."""
+        while True:
+            index, payload = await ab.file.get()
+            if ab.en_retard:
+                while not ab.file.empty():
+                    ab.file.get_nowait()
+                ab.en_retard = False
+                msg = await self._lire_depuis(ab)
+                if msg is not None:
+                    return msg
+                continue
+            if index < ab.curseur:
+                continue  # déjà envoyé (arriéré ou resynchronisation)
+            ab.curseur = index + 1
+            return payload
+
+
+hubs: Dict[str, HubPartie] = {}
+
+
+def hub_pour(pid: str, moteur: Moteur, verrou: asyncio.Lock) -> HubPartie:
+    hub = hubs.get(pid)
+    if hub is None:
+        hub = hubs[pid] = HubPartie(moteur, verrou)
+    elif hub.moteur is not moteur:
+        hub.rattacher(moteur)
+    return hub
+
+
+class Veille:
+    """Long-poll d'une partie ou d'une table (GET .../changes).
+
+    Les requêtes en attente dorment sur une asyncio.Condition, réveillée à
+    chaque nouvelle version. Pour une partie, chaque version signalée est
+    notée avec la longueur du journal à ce moment: le client qui donne sa
+    version ne reçoit que les entrées ajoutées depuis.
+    """
+
+    def __init__(self):
+        self.condition = asyncio.Condition()
+        self.attente = 0  # requêtes en attente
+        self._reperes: Deque[Tuple[int, int]] = deque(maxlen=TAILLE_REPERES)
+
+    def noter(self, version: int, fin_journal: Optional[int]) -> None:
+        if fin_journal is None:
+            return
+        if self._reperes and self._reperes[-1][0] >= version:
+            self._reperes.clear()  # partie remplacée (/parties/load): on repart
+        self._reperes.append((version, fin_journal))
+
+    def position(self, version: int) -> Optional[int]:
+        """Longueur du journal à cette version (None: version non notée)."""
+        versions = [v for v, _ in self._reperes]
+        i = bisect.bisect_left(versions, version)
+        if i < len(versions) and versions[i] == version:
+            return self._reperes[i][1]
+        return None
+
+    async def signaler(self, version: int, fin_journal: Optional[int] = None) -> None:
+        async with self.condition:
+            self.noter(version, fin_journal)
+            self.condition.notify_all()
+
+    async def attendre(self, a_change: Callable[[], bool], delai: float) -> bool:
+        """Attend que a_change() soit vrai, au plus `delai` secondes."""
+        self.attente += 1
+        try:
+            async with self.condition:
+                await asyncio.wait_for(self.condition.wait_for(a_change), delai)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.attente -= 1
+
+
+veilles: Dict[str, Veille] = {}
+
+
+def veille_pour(cle: str) -> Veille:
+    veille = veilles.get(cle)
+    if veille is None:
+        veille = veilles[cle] = Veille()
+    return veille
+
+
+async def signaler(cle: str, version: int, fin_journal: Optional[int] = None) -> None:
+    """Nouvelle version de `cle` ("partie:<id>", "table:<id>")."""
+    veille = veilles.get(cle)
+    if veille is not None:
+        await veille.signaler(version, fin_journal)
+
+
+def oublier_veille(cle: str) -> None:
+    veille = veilles.get(cle)
+    if veille is not None and not veille.attente:
+        del veilles[cle]
@@ -0,0 +1,455 @@
+"""Parties en mémoire, éviction vers le magasin et rechargement à la demande.
+
+GestionnaireParties remplace le simple dict `parties` de l'API. Les parties
+inactives, terminées, ou les moins récemment utilisées quand les limites
+(nombre de parties, entrées de journal en mémoire) sont dépassées, sont
+écrites au format de sauvegarde du moteur puis retirées de la mémoire. Le
+prochain accès les recharge de façon transparente.
+
+Éviction et rechargement se font sous le verrou de la partie. Une partie
+verrouillée, suivie par des abonnés WebSocket ou attendue par un long-poll
+n'est pas évincée. Une partie redemandée pendant son écriture reste en mémoire.
+
+Avec un magasin partagé (plusieurs workers, cf. api.magasin), la mémoire
+n'est plus qu'un cache: session() relit la partie si sa version a bougé dans
+le magasin et, pour une modification, prend le bail de la partie puis écrit
+le résultat en compare-and-set sur la version (EtatJeu.version).
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from moteur_jeu.moteur import Moteur
+
+from .diffusion import hubs, oublier_veille, signaler, veilles
+from .magasin import PROPRIETAIRE, ConflitVersion, Magasin
+
+
+class PartieOccupee(Exception):
+    """Le bail de la partie est tenu par un autre worker."""
+
+
+@dataclass
+class ConfigParties:
+    dossier: Path = Path(".avpol") / "api-parties"
+    max_parties: int = 500  # parties gardées en mémoire
+    max_entrees: int = 2_000_000  # entrées de journal en mémoire (toutes parties)
+    inactivite: float = 1800.0  # s sans accès avant éviction
+    finies: float = 120.0  # idem pour une partie terminée
+    balayage: float = 30.0  # période du balayage
+    bail: float = 10.0  # durée d'un bail (magasin partagé)
+    attente_bail: float = 5.0  # attente maximale d'un bail tenu ailleurs
+
+    @classmethod
+    def depuis_env(cls) -> "ConfigParties":
+        env = os.environ.get
+        defaut = cls()
+        return cls(
+            dossier=Path(env("API_PARTIES_DIR", str(defaut.dossier))),
+            max_parties=int(env("API_PARTIES_MAX", defaut.max_parties)),
+            max_entrees=int(env("API_PARTIES_MAX_ENTREES", defaut.max_entrees)),
+            inactivite=float(env("API_PARTIES_INACTIVITE", defaut.inactivite)),
+            finies=float(env("API_PARTIES_FINIES", defaut.finies)),
+            balayage=float(env("API_PARTIES_BALAYAGE", defaut.balayage)),
+            bail=float(env("API_BAIL", defaut.bail)),
+            attente_bail=float(env("API_BAIL_ATTENTE", defaut.attente_bail)),
+        )
+
+
+def _resume(moteur: Moteur) -> Dict[str, Any]:
+    e = moteur.etat
+    return {
+        "id": e.id,
+        "joueurs": [j.nom for j in e.joueurs.values()],
+        "tour": e.tour,
+        "phase": e.phase,
+        "tension": e.tension,
+        "partie_status": e.partie_status,
+    }
+
+
+def _cle(pid: str) -> str:
+    return f"partie:{pid}"
+
+
+class GestionnaireParties:
+    def __init__(
+        self,
+        config: ConfigParties,
+        magasin: Magasin,
+        verrou_pour: Callable[[str], asyncio.Lock],
+        encoder: Callable[[Moteur], bytes],
+        decoder: Callable[[bytes], Moteur],
+    ):
+        self.config = config
+        self.magasin = magasin
+        self._verrou_pour = verrou_pour
+        self._encoder = encoder  # Moteur -> sauvegarde (format du moteur)
+        self._decoder = decoder  # sauvegarde -> Moteur (règles rattachées)
+        self._memoire: Dict[str, Moteur] = {}
+        self._acces: Dict[str, float] = {}
+        # version du magasin dont part la copie en mémoire (base du CAS)
+        self._base: Dict[str, int] = {}
+        # pid -> résumé (None: partie trouvée dans le magasin au démarrage)
+        self._disque: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._evictions: Dict[str, Moteur] = {}  # en cours d'écriture
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tache: Optional[asyncio.Task] = None
+        self._balayage_demande = False
+        self.compteurs = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "echecs": 0,
+            "relectures": 0,  # copie locale périmée (écrite par un autre worker)
+            "conflits": 0,
+        }
+
+    # --- cycle de vie ------------------------------------------------------------
+    def demarrer(self) -> None:
+        """Recense les parties déjà dans le magasin et lance le balayage."""
+        if not self.magasin.partage:
+            for cle in self.magasin.cles("partie:"):
+                pid = cle.partition(":")[2]
+                if pid not in self._memoire:
+                    self._disque.setdefault(pid, None)
+        self._loop = asyncio.get_running_loop()
+        self._tache = self._loop.create_task(self._balayer_en_boucle())
+
+    async def arreter(self) -> None:
+        """Arrête le balayage et écrit toutes les parties (survie au redémarrage)."""
+        if self._tache is not None:
+            self._tache.cancel()
+            self._tache = None
+        for pid in list(self._memoire):
+            await self.evincer(pid, force=True)
+
+    # --- accès -------------------------------------------------------------------
+    def __contains__(self, pid: str) -> bool:
+        return pid in self._memoire or pid in self._evictions or pid in self._disque
+
+    def ajouter(self, moteur: Moteur) -> None:
+        """Enregistre une partie (nouvelle ou rechargée par /parties/load).
+
+        Avec un magasin partagé, elle y est écrite (cette version fait foi):
+        appel bloquant, à faire depuis le threadpool.
+        """
+        pid = moteur.etat.id
+        if self.magasin.partage:
+            donnees = self._encoder(moteur)
+            self.magasin.ecrire(_cle(pid), donnees, moteur.etat.version, -1)
+            self._base[pid] = moteur.etat.version
+        self._memoire[pid] = moteur
+        self._acces[pid] = time.monotonic()
+        self._disque.pop(pid, None)
+        self._demander_balayage()
+
+    def en_memoire(self, pid: str) -> Optional[Moteur]:
+        return self._memoire.get(pid)
+
+    async def obtenir(self, pid: str) -> Optional[Moteur]:
+        """La partie, rechargée depuis le magasin si besoin (None si inconnue).
+
+        Sans point d'attente quand la partie est en mémoire: l'appelant peut
+        prendre le verrou de partie juste après sans fenêtre d'éviction.
+        """
+        m = self._memoire.get(pid) or self._reprendre(pid)
+        if m is not None:
+            self.compteurs["hits"] += 1
+            self._acces[pid] = time.monotonic()
+            return m
+        if pid not in self._disque and not self.magasin.partage:
+            return None
+        async with self._verrou_pour(pid):
+            m = self._memoire.get(pid)
+            if m is None:
+                m = await self._charger(pid)
+                if m is None:
+                    self._disque.pop(pid, None)
+                    return None
+                self.compteurs["misses"] += 1
+            self._acces[pid] = time.monotonic()
+        self._demander_balayage()
+        return m
+
+    async def _charger(self, pid: str) -> Optional[Moteur]:
+        # verrou de partie tenu
+        lu = await run_in_threadpool(self.magasin.lire, _cle(pid))
+        if lu is None:
+            return None
+        version, donnees = lu
+        m = await run_in_threadpool(self._decoder, donnees)
+        self._memoire[pid] = m
+        self._base[pid] = version
+        self._disque.pop(pid, None)
+        if pid in hubs:
+            hubs[pid].rattacher(m)
+        return m
+
+    def _reprendre(self, pid: str) -> Optional[Moteur]:
+        # redemandée pendant son écriture: elle reste (l'éviction est annulée)
+        m = self._evictions.get(pid)
+        if m is not None:
+            self._memoire[pid] = m
+        return m
+
+    @asynccontextmanager
+    async def bail(self, cle: str) -> AsyncIterator[None]:
+        """Réserve `cle` à ce worker (magasin partagé ; sinon sans effet)."""
+        if not self.magasin.partage:
+            yield
+            return
+        echeance = time.monotonic() + self.config.attente_bail
+        while not await run_in_threadpool(
+            self.magasin.prendre_bail, cle, PROPRIETAIRE, self.config.bail
+        ):
+            if time.monotonic() > echeance:
+                raise PartieOccupee(cle)
+            await asyncio.sleep(0.01)
+        try:
+            yield
+        finally:
+            await run_in_threadpool(self.magasin.rendre_bail, cle, PROPRIETAIRE)
+
+    @asynccontextmanager
+    async def session(
+        self, pid: str, moteur: Moteur, ecriture: bool = True
+    ) -> AsyncIterator[Moteur]:
+        """Verrou de partie ; avec un magasin partagé, partie relue si une autre
+        copie a été écrite, et (ecriture) bail puis CAS des modifications.
+
+        Une nouvelle version réveille les long-polls de la partie (Veille).
+        """
+        async with self._verrou_pour(pid):
+            # une session précédente a pu relire (remplacer) la partie
+            moteur = self._memoire.get(pid) or moteur
+            avant = moteur.etat.version
+            if not self.magasin.partage:
+                yield moteur
+            else:
+                async with self.bail(_cle(pid)) if ecriture else nullcontext():
+                    moteur = await self._rafraichir(pid, moteur)
+                    try:
+                        yield moteur
+                    except BaseException:
+                        if ecriture:  # état local peut-être à moitié modifié
+                            self._oublier(pid)
+                        raise
+                    if ecriture:
+                        await self._publier(pid, moteur)
+            apres, fin_journal = moteur.etat.version, len(moteur.etat.journal)
+        if apres != avant:
+            await signaler(_cle(pid), apres, fin_journal)
+
+    async def _rafraichir(self, pid: str, moteur: Moteur) -> Moteur:
+        version = await run_in_threadpool(self.magasin.version, _cle(pid))
+        if version is None or version == self._base.get(pid):
+            return moteur
+        self.compteurs["relectures"] += 1
+        return await self._charger(pid) or moteur
+
+    async def _publier(self, pid: str, moteur: Moteur) -> None:
+        base = self._base.get(pid)
+        if moteur.etat.version == base:
+            return
+        donnees = await run_in_threadpool(self._encoder, moteur)
+        ok = await run_in_threadpool(
+            self.magasin.ecrire, _cle(pid), donnees, moteur.etat.version, base
+        )
+        if not ok:  # bail expiré et partie écrite ailleurs entre-temps
+            self.compteurs["conflits"] += 1
+            self._oublier(pid)
+            raise ConflitVersion(pid)
+        self._base[pid] = moteur.etat.version
+
+    def _oublier(self, pid: str) -> None:
+        self._memoire.pop(pid, None)
+        self._base.pop(pid, None)
+        self._acces.pop(pid, None)
+
+    async def statut(self, pid: str) -> Optional[str]:
+        """partie_status sans recharger la partie (None: inconnue)."""
+        m = self._memoire.get(pid) or self._evictions.get(pid)
+        if m is not None:
+            return m.etat.partie_status
+        if pid in self._disque:
+            resume = self._disque[pid]
+            return resume["partie_status"] if resume else "sur_disque"
+        if self.magasin.partage:
+            version = await run_in_threadpool(self.magasin.version, _cle(pid))
+            return None if version is None else "sur_disque"
+        return None
+
+    def resumes(self) -> List[Dict[str, Any]]:
+        """Résumé de toutes les parties, en mémoire ou dans le magasin.
+
+        Bloquant avec un magasin partagé (liste des clés): depuis le threadpool.
+        """
+        data = [_resume(m) for m in list(self._memoire.values())]
+        connues = set(self._memoire)
+        for pid, resume in list(self._disque.items()):
+            connues.add(pid)
+            data.append(resume or {"id": pid, "partie_status": "sur_disque"})
+        if self.magasin.partage:
+            for cle in self.magasin.cles("partie:"):
+                pid = cle.partition(":")[2]
+                if pid not in connues:
+                    data.append({"id": pid, "partie_status": "sur_disque"})
+        return data
+
+    def identifiants(self) -> List[str]:
+        """Parties tenues par ce worker (en mémoire ou évincées dans son magasin)."""
+        return list(self._memoire) + [p for p in self._disque if p not in self._memoire]
+
+    async def ceder(
+        self, pid: str, remettre: Callable[[bytes], Awaitable[None]]
+    ) -> bool:
+        """Remet la partie à un autre worker (répartition entre shards) puis
+        l'oublie ici. La sauvegarde est passée à `remettre` sous le verrou de
+        partie ; si elle échoue, la partie reste à ce worker.
+
+        Avec un magasin partagé, rien n'est envoyé: la partie y reste et son
+        nouveau propriétaire la relira.
+        """
+        async with self._verrou_pour(pid):
+            m = self._memoire.get(pid)
+            if not self.magasin.partage:
+                if m is not None:
+                    donnees = await run_in_threadpool(self._encoder, m)
+                else:
+                    lu = await run_in_threadpool(self.magasin.lire, _cle(pid))
+                    if lu is None:
+                        return False
+                    donnees = lu[1]
+                await remettre(donnees)
+                self._disque.pop(pid, None)
+                await run_in_threadpool(self.magasin.supprimer, _cle(pid))
+            self._oublier(pid)
+            oublier_veille(_cle(pid))
+            hub = hubs.pop(pid, None)
+            if hub is not None and m is not None:
+                m.desabonner(hub._sur_entree)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.compteurs,
+            "en_memoire": len(self._memoire),
+            "sur_disque": len(self._disque),
+            "entrees_journal": self._entrees_en_memoire(),
+            "max_parties": self.config.max_parties,
+            "max_entrees": self.config.max_entrees,
+            "magasin": type(self.magasin).__name__,
+            "partage": self.magasin.partage,
+            "proprietaire": PROPRIETAIRE,
+        }
+
+    # --- éviction ----------------------------------------------------------------
+    def _entrees_en_memoire(self) -> int:
+        return sum(len(m.etat.journal) for m in list(self._memoire.values()))
+
+    def _hors_limites(self) -> bool:
+        return (
+            len(self._memoire) > self.config.max_parties
+            or self._entrees_en_memoire() > self.config.max_entrees
+        )
+
+    def _demander_balayage(self) -> None:
+        # appelable depuis le threadpool (routes sync): on repasse par la boucle
+        if self._loop is None or self._balayage_demande or not self._hors_limites():
+            return
+        self._balayage_demande = True
+        self._loop.call_soon_threadsafe(lambda: self._loop.create_task(self.balayer()))
+
+    def _occupee(self, pid: str) -> bool:
+        hub = hubs.get(pid)
+        veille = veilles.get(_cle(pid))
+        return (
+            self._verrou_pour(pid).locked()
+            or bool(hub and hub.abonnes)
+            or bool(veille and veille.attente)
+        )
+
+    async def evincer(self, pid: str, force: bool = False) -> bool:
+        """Écrit la partie dans le magasin et la retire de la mémoire.
+
+        Avec un magasin partagé, elle y est déjà (écrite à chaque session):
+        la copie locale est simplement oubliée.
+        """
+        m = self._memoire.get(pid)
+        if m is None or (self._occupee(pid) and not force):
+            return False
+        async with self._verrou_pour(pid):
+            if self._memoire.get(pid) is not m:
+                return False
+            if self.magasin.partage:
+                self._oublier(pid)
+                self._retirer_hub(pid, m)
+                self.compteurs["evictions"] += 1
+                return True
+            del self._memoire[pid]
+            self._evictions[pid] = m
+            try:
+                donnees = await run_in_threadpool(self._encoder, m)
+                await run_in_threadpool(
+                    self.magasin.ecrire, _cle(pid), donnees, m.etat.version, -1
+                )
+            except Exception:
+                self.compteurs["echecs"] += 1
+                self._memoire[pid] = m
+                return False
+            finally:
+                del self._evictions[pid]
+            if pid in self._memoire:  # reprise pendant l'écriture
+                return False
+            self._disque[pid] = _resume(m)
+            self._acces.pop(pid, None)
+            self._retirer_hub(pid, m)
+            self.compteurs["evictions"] += 1
+            return True
+
+    @staticmethod
+    def _retirer_hub(pid: str, m: Moteur) -> None:
+        oublier_veille(_cle(pid))
+        hub = hubs.get(pid)
+        if hub is not None and not hub.abonnes:
+            hubs.pop(pid)
+            m.desabonner(hub._sur_entree)
+
+    async def balayer(self) -> int:
+        """Évince les parties inactives/terminées, puis les moins récentes tant
+        que les limites sont dépassées. Renvoie le nombre de parties évincées."""
+        self._balayage_demande = False
+        maintenant = time.monotonic()
+        lru = sorted(self._memoire, key=lambda pid: self._acces.get(pid, 0.0))
+        n = 0
+        for pid in lru:
+            m = self._memoire.get(pid)
+            if m is None:
+                continue
+            delai = (
+                self.config.finies
+                if m.etat.est_terminee()
+                else self.config.inactivite
+            )
+            if maintenant - self._acces.get(pid, 0.0) >= delai:
+                n += await self.evincer(pid)
+        for pid in lru:
+            if not self._hors_limites():
+                break
+            if pid in self._memoire:
+                n += await self.evincer(pid)
+        return n
+
+    async def _balayer_en_boucle(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.balayage)
+            await self.balayer()
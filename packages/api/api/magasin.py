@@ -0,0 +1,313 @@
+"""Magasins de parties et de tables: mémoire, fichiers partagés, Redis.
+
+Un magasin stocke des blobs versionnés par clé ("partie:<id>", "table:<id>").
+L'écriture est conditionnelle (compare-and-set sur la version) et un bail
+(propriétaire + échéance) réserve une clé à un worker le temps d'une
+modification. Avec un magasin « partagé », plusieurs workers uvicorn servent
+les mêmes parties: chacun relit une partie dont la version a bougé et y écrit
+ses modifications sous bail.
+
+    API_MAGASIN=memoire            (défaut) parties propres au processus
+    API_MAGASIN=fichiers[:DOSSIER] dossier commun aux workers d'une même machine
+    API_MAGASIN=redis              REDIS_URL (paquet redis, optionnel)
+
+Les opérations sont bloquantes: l'API les appelle depuis le threadpool.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: pas de magasin fichiers
+    fcntl = None
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - on n'impose pas la présence en runtime
+    redis = None
+
+# identifiant de ce processus dans les baux (un worker uvicorn = un processus)
+PROPRIETAIRE = os.environ.get(
+    "API_WORKER_ID", f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+)
+
+
+class ConflitVersion(Exception):
+    """L'entrée a été modifiée ailleurs depuis sa dernière lecture."""
+
+
+class Magasin(ABC):
+    """Interface commune. `partage`: d'autres processus peuvent écrire."""
+
+    partage = False
+
+    @abstractmethod
+    def lire(self, cle: str) -> Optional[Tuple[int, bytes]]:
+        ...
+
+    def version(self, cle: str) -> Optional[int]:
+        lu = self.lire(cle)
+        return None if lu is None else lu[0]
+
+    @abstractmethod
+    def ecrire(
+        self, cle: str, donnees: bytes, version: int, attendue: Optional[int]
+    ) -> bool:
+        """Écrit si la version stockée vaut `attendue` (None: clé absente, ou
+        écriture inconditionnelle si `attendue` vaut -1)."""
+
+    @abstractmethod
+    def supprimer(self, cle: str) -> None:
+        ...
+
+    @abstractmethod
+    def cles(self, prefixe: str) -> List[str]:
+        ...
+
+    @abstractmethod
+    def prendre_bail(self, cle: str, proprietaire: str, duree: float) -> bool:
+        """Réserve (ou prolonge) la clé pour `proprietaire` pendant `duree` s."""
+
+    @abstractmethod
+    def rendre_bail(self, cle: str, proprietaire: str) -> None:
+        ...
+
+
+def _version_ok(courante: Optional[int], attendue: Optional[int]) -> bool:
+    return attendue == -1 or courante == attendue
+
+
+class MagasinMemoire(Magasin):
+    """Dans le processus: suffisant avec un seul worker."""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self._donnees: Dict[str, Tuple[int, bytes]] = {}
+        self._baux: Dict[str, Tuple[str, float]] = {}
+
+    def lire(self, cle):
+        return self._donnees.get(cle)
+
+    def ecrire(self, cle, donnees, version, attendue):
+        with self._verrou:
+            courante = self._donnees.get(cle)
+            if not _version_ok(courante and courante[0], attendue):
+                return False
+            self._donnees[cle] = (version, donnees)
+            return True
+
+    def supprimer(self, cle):
+        with self._verrou:
+            self._donnees.pop(cle, None)
+
+    def cles(self, prefixe):
+        return [c for c in list(self._donnees) if c.startswith(prefixe)]
+
+    def prendre_bail(self, cle, proprietaire, duree):
+        with self._verrou:
+            bail = self._baux.get(cle)
+            if bail and bail[0] != proprietaire and bail[1] > time.time():
+                return False
+            self._baux[cle] = (proprietaire, time.time() + duree)
+            return True
+
+    def rendre_bail(self, cle, proprietaire):
+        with self._verrou:
+            if self._baux.get(cle, (None,))[0] == proprietaire:
+                del self._baux[cle]
+
+
+class MagasinFichiers(Magasin):
+    """Un dossier commun aux workers d'une machine (verrous fcntl).
+
+    Une partie "partie:<id>" est écrite dans <id>.avp, au format de sauvegarde
+    du moteur (relisible par moteur_jeu.persistence.charger) ; sa version est
+    dans <id>.avp.v et son bail dans <id>.avp.bail.
+    """
+
+    def __init__(self, dossier: Path, partage: bool = True):
+        if fcntl is None:
+            raise RuntimeError("magasin fichiers indisponible (pas de fcntl)")
+        self.dossier = Path(dossier)
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        self.partage = partage
+
+    _EXTENSIONS = {"partie": ".avp", "table": ".table.json"}
+
+    def _chemin(self, cle: str) -> Path:
+        espace, _, nom = cle.partition(":")
+        nom = re.sub(r"[^\w.-]", "_", nom)
+        return self.dossier / (nom + self._EXTENSIONS.get(espace, "." + espace))
+
+    @contextmanager
+    def _verrouille(self, chemin: Path, exclusif: bool = True) -> Iterator[None]:
+        with open(f"{chemin}.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusif else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _lire_version(chemin: Path) -> Optional[int]:
+        try:
+            return int(Path(f"{chemin}.v").read_text())
+        except FileNotFoundError:
+            # fichier d'une ancienne éviction (sans .v): version inconnue
+            return 0 if chemin.exists() else None
+
+    def lire(self, cle):
+        chemin = self._chemin(cle)
+        with self._verrouille(chemin, exclusif=False):
+            version = self._lire_version(chemin)
+            if version is None:
+                return None
+            return version, chemin.read_bytes()
+
+    def version(self, cle):
+        chemin = self._chemin(cle)
+        with self._verrouille(chemin, exclusif=False):
+            return self._lire_version(chemin)
+
+    def ecrire(self, cle, donnees, version, attendue):
+        chemin = self._chemin(cle)
+        with self._verrouille(chemin):
+            if not _version_ok(self._lire_version(chemin), attendue):
+                return False
+            for cible, contenu in ((chemin, donnees), (Path(f"{chemin}.v"), None)):
+                tmp = f"{cible}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(contenu if contenu is not None else str(version).encode())
+                os.replace(tmp, cible)
+            return True
+
+    def supprimer(self, cle):
+        chemin = self._chemin(cle)
+        with self._verrouille(chemin):
+            for p in (chemin, Path(f"{chemin}.v"), Path(f"{chemin}.bail")):
+                p.unlink(missing_ok=True)
+
+    def cles(self, prefixe):
+        espace, _, debut = prefixe.partition(":")
+        ext = self._EXTENSIONS.get(espace, "." + espace)
+        noms = (p.name[: -len(ext)] for p in self.dossier.glob(f"*{ext}"))
+        return [f"{espace}:{n}" for n in sorted(noms) if n.startswith(debut)]
+
+    def _lire_bail(self, chemin: Path) -> Optional[Tuple[str, float]]:
+        try:
+            b = json.loads(Path(f"{chemin}.bail").read_text())
+            return b["p"], b["t"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def prendre_bail(self, cle, proprietaire, duree):
+        chemin = self._chemin(cle)
+        with self._verrouille(chemin):
+            bail = self._lire_bail(chemin)
+            if bail and bail[0] != proprietaire and bail[1] > time.time():
+                return False
+            Path(f"{chemin}.bail").write_text(
+                json.dumps({"p": proprietaire, "t": time.time() + duree})
+            )
+            return True
+
+    def rendre_bail(self, cle, proprietaire):
+        chemin = self._chemin(cle)
+        with self._verrouille(chemin):
+            bail = self._lire_bail(chemin)
+            if bail and bail[0] == proprietaire:
+                Path(f"{chemin}.bail").unlink(missing_ok=True)
+
+
+# CAS et bail atomiques côté serveur
+_LUA_ECRIRE = """
+local v = redis.call('HGET', KEYS[1], 'v')
+if ARGV[1] ~= '-1' and ((ARGV[1] == '' and v) or (ARGV[1] ~= '' and v ~= ARGV[1])) then
+  return 0
+end
+redis.call('HSET', KEYS[1], 'v', ARGV[2], 'd', ARGV[3])
+return 1
+"""
+_LUA_BAIL = """
+local p = redis.call('GET', KEYS[1])
+if p and p ~= ARGV[1] then return 0 end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return 1
+"""
+_LUA_RENDRE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then redis.call('DEL', KEYS[1]) end
+return 1
+"""
+
+
+class MagasinRedis(Magasin):
+    """Redis (REDIS_URL): un hash {v, d} par clé, baux en SET PX."""
+
+    partage = True
+
+    def __init__(self, url: str, prefixe: str = "avp:"):
+        if redis is None:
+            raise RuntimeError("API_MAGASIN=redis: paquet 'redis' non installé")
+        self.r = redis.Redis.from_url(url)
+        self.prefixe = prefixe
+        self._ecrire = self.r.register_script(_LUA_ECRIRE)
+        self._bail = self.r.register_script(_LUA_BAIL)
+        self._rendre = self.r.register_script(_LUA_RENDRE)
+
+    def lire(self, cle):
+        v, d = self.r.hmget(self.prefixe + cle, "v", "d")
+        return None if v is None else (int(v), d)
+
+    def version(self, cle):
+        v = self.r.hget(self.prefixe + cle, "v")
+        return None if v is None else int(v)
+
+    def ecrire(self, cle, donnees, version, attendue):
+        args = ["" if attendue is None else str(attendue), str(version), donnees]
+        return bool(self._ecrire(keys=[self.prefixe + cle], args=args))
+
+    def supprimer(self, cle):
+        self.r.delete(self.prefixe + cle, self.prefixe + "bail:" + cle)
+
+    def cles(self, prefixe):
+        n = len(self.prefixe)
+        motif = f"{self.prefixe}{prefixe}*"
+        return sorted(k.decode()[n:] for k in self.r.scan_iter(match=motif))
+
+    def prendre_bail(self, cle, proprietaire, duree):
+        args = [proprietaire, int(duree * 1000)]
+        return bool(self._bail(keys=[self.prefixe + "bail:" + cle], args=args))
+
+    def rendre_bail(self, cle, proprietaire):
+        self._rendre(keys=[self.prefixe + "bail:" + cle], args=[proprietaire])
+
+
+def magasin_depuis_env(dossier_defaut: Path) -> Magasin:
+    """API_MAGASIN: "memoire" (défaut), "fichiers[:DOSSIER]" ou "redis".
+
+    Par défaut les parties évincées vont tout de même dans dossier_defaut
+    (magasin fichiers non partagé: simple dépôt du processus).
+    """
+    choix = os.environ.get("API_MAGASIN", "memoire")
+    genre, _, arg = choix.partition(":")
+    if genre == "redis":
+        url = arg or os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+        return MagasinRedis(url)
+    if genre == "fichiers":
+        return MagasinFichiers(Path(arg) if arg else dossier_defaut, partage=True)
+    if genre != "memoire":
+        raise ValueError(f"API_MAGASIN inconnu: {choix}")
+    if fcntl is None:
+        return MagasinMemoire()
+    return MagasinFichiers(dossier_defaut, partage=False)
@@ -1,27 +1,150 @@
-import json
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+from anyio import from_thread
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
-import uuid
 import time
 
 # Import du moteur existant
 from moteur_jeu.moteur import Moteur, Action
-from moteur_jeu.persistence import sauvegarder, charger, moteur_depuis_fichier
-from moteur_jeu.regles_loader import charger_yaml, _check_preconditions
+from moteur_jeu.persistence import (
+    charger,
+    decoder_binaire,
+    empreinte_etat,
+    encoder_binaire,
+    etat_from_dict,
+    etat_to_dict,
+    moteur_depuis_fichier,
+    sauvegarder,
+)
+from moteur_jeu.regles_loader import charger_regles, _check_preconditions
+
+from .diffusion import Veille, hubs, hub_pour, oublier_veille, signaler, veille_pour
+from .gestion import ConfigParties, GestionnaireParties, PartieOccupee
+from .magasin import ConflitVersion, magasin_depuis_env
+from .routage import ConfigRoutage, Routeur
 
 
 # --- Configuration globale ---
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DOCS_DIR = PROJECT_ROOT / "docs" / "regles"
 YAML_DEFAULT = DOCS_DIR / "reforme-x.yaml"
+SCHEMA_REGLES = PROJECT_ROOT / "docs" / "schemas" / "regles.schema.json"
 
-app = FastAPI(title="Jeu Aventure Politique API", version="0.1.0")
 
-# Stocke les parties actives en mémoire (clé = partie_id)
-parties: Dict[str, Moteur] = {}
+@asynccontextmanager
+async def _cycle_de_vie(app: FastAPI):
+    parties.demarrer()
+    routeur.demarrer()
+    yield
+    await routeur.arreter()
+    await parties.arreter()
+
+
+app = FastAPI(
+    title="Jeu Aventure Politique API", version="0.1.0", lifespan=_cycle_de_vie
+)
+
+# Un verrou par partie: les appels qui touchent à un même Moteur s'exécutent
+# l'un après l'autre (dans l'ordre d'arrivée), des parties différentes en
+# parallèle. Le travail du moteur part dans le threadpool pour ne pas bloquer
+# la boucle asyncio.
+verrous: Dict[str, asyncio.Lock] = {}
+
+
+def _verrou(pid: str) -> asyncio.Lock:
+    v = verrous.get(pid)
+    if v is None:
+        v = verrous[pid] = asyncio.Lock()
+    return v
+
+
+def _encoder_partie(moteur: Moteur) -> bytes:
+    # même contenu qu'une sauvegarde .avp (relisible par /parties/load)
+    e = moteur.etat
+    meta = {"regles": "reforme-x.yaml", "empreinte": empreinte_etat(e)}
+    return encoder_binaire({"etat": etat_to_dict(e), "meta": meta})
+
+
+def _decoder_partie(donnees: bytes) -> Moteur:
+    return _moteur_depuis_sauvegarde(decoder_binaire(donnees))
+
+
+# Parties par id: en mémoire, ou évincées dans le magasin et rechargées au
+# prochain accès (limites et délais: variables API_PARTIES_*, cf. ConfigParties).
+# API_MAGASIN=fichiers|redis: magasin partagé entre workers (cf. api.magasin).
+_config_parties = ConfigParties.depuis_env()
+parties = GestionnaireParties(
+    _config_parties,
+    magasin_depuis_env(_config_parties.dossier),
+    verrou_pour=_verrou,
+    encoder=_encoder_partie,
+    decoder=_decoder_partie,
+)
+
+
+# Répartition des parties entre workers (API_SHARDS/API_SHARD_ID, cf. api.routage):
+# une requête pour une partie d'un autre shard lui est relayée.
+routeur = Routeur(ConfigRoutage.depuis_env())
+
+
+@app.middleware("http")
+async def _aiguiller(request: Request, call_next):
+    return await routeur.aiguiller(request, call_next)
+
+
+# réponses gzip (si le client envoie Accept-Encoding: gzip) au-delà de
+# API_GZIP_MIN octets ; 0 (défaut) désactive: en local, le CPU coûte plus cher
+# que les octets. Ajouté après le routeur, donc autour de lui: les listes
+# fusionnées et les réponses relayées sont compressées une seule fois, en sortie.
+GZIP_MIN = int(os.environ.get("API_GZIP_MIN", "0"))
+if GZIP_MIN > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN)
+
+
+async def _installer(moteur: Moteur, local: bool = False) -> None:
+    """Enregistre une partie créée/chargée ici, ou la remet à son shard."""
+    pid = moteur.etat.id
+    if not local and not routeur.est_local(pid):
+        donnees = await run_in_threadpool(_encoder_partie, moteur)
+        await routeur.remettre(routeur.proprietaire(pid), "/interne/parties", donnees)
+        return
+    # une partie rechargée sous le même id ne revient pas à une version déjà vue
+    # (ETag): elle repart après la version de celle qu'elle remplace
+    ancienne = await parties.obtenir(pid) if pid in parties else None
+    if ancienne is not None and ancienne is not moteur:
+        moteur.etat.version = max(moteur.etat.version, ancienne.etat.version + 1)
+    # remplace une éventuelle partie de même id sans couper un appel en cours
+    async with _verrou(pid):
+        await run_in_threadpool(parties.ajouter, moteur)
+        if pid in hubs:  # les spectateurs suivent la partie rechargée
+            hubs[pid].rattacher(moteur)
+    await signaler(f"partie:{pid}", moteur.etat.version, len(moteur.etat.journal))
+
+
+@app.exception_handler(ConflitVersion)
+async def _conflit_version(request, exc: ConflitVersion):
+    # modifiée par un autre worker pendant l'appel: le client peut rejouer
+    return JSONResponse(
+        {"error": "conflit", "reason": f"{exc} modifiée ailleurs"}, status_code=409
+    )
+
+
+@app.exception_handler(PartieOccupee)
+async def _partie_occupee(request, exc: PartieOccupee):
+    return JSONResponse(
+        {"error": "occupee", "reason": f"{exc} réservée par un autre worker"},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
 
 
 # ===============================
@@ -48,6 +171,11 @@ class ActionInput(BaseModel):
     payload: Dict[str, Any] = {}
 
 
+class ActionsBatchInput(BaseModel):
+    actions: List[ActionInput]
+    stop_on_refus: bool = False  # s'arrêter à la première action refusée
+
+
 class ValidationInput(BaseModel):
     type: str
     auteur_id: str
@@ -72,6 +200,7 @@ class TableEtat(BaseModel):
     regles_file: Optional[str] = None
     demarree: bool = False
     partie_id: Optional[str] = None
+    version: int = 0  # incrémentée à chaque modification (magasin partagé)
 
 
 class TableCreateRequest(BaseModel):
@@ -98,21 +227,14 @@ tables: Dict[str, TableEtat] = {}
 
 @app.get("/parties")
 def lister_parties():
-    """Retourne la liste des parties actives."""
-    data = []
-    for pid, moteur in parties.items():
-        e = moteur.etat
-        data.append(
-            {
-                "id": e.id,
-                "joueurs": [j.nom for j in e.joueurs.values()],
-                "tour": e.tour,
-                "phase": e.phase,
-                "tension": e.tension,
-                "partie_status": e.partie_status,
-            }
-        )
-    return JSONResponse(data)
+    """Retourne la liste des parties (y compris celles évincées sur disque)."""
+    return JSONResponse(parties.resumes())
+
+
+@app.get("/stats/parties")
+async def stats_parties():
+    """Compteurs du gestionnaire de parties (hits, misses, évictions...)."""
+    return parties.stats()
 
 
 @app.post("/parties")
@@ -124,7 +246,7 @@ def creer_partie(joueurs: List[str] = Body(...)):
         )
     moteur = Moteur.creer_partie(joueurs)
     moteur.charger_regles_yaml(str(YAML_DEFAULT))
-    parties[moteur.etat.id] = moteur
+    from_thread.run(_installer, moteur)
 
     # 👉 Phase verrouillée d'inscription
     m.etat.phase = "inscription"
@@ -141,13 +263,17 @@ def creer_partie(joueurs: List[str] = Body(...)):
 
 
 @app.post("/parties/{pid}/inscrire")
-def inscrire_joueur(pid: str, req: InscriptionRequest):
-    m = parties.get(pid)
+async def inscrire_joueur(pid: str, req: InscriptionRequest):
+    m = await parties.obtenir(pid)
     if not m:
         return JSONResponse(
             {"error": "not_found", "reason": "partie introuvable"}, status_code=404
         )
+    async with parties.session(pid, m) as m:
+        return await run_in_threadpool(_inscrire_joueur, m, req)
+
 
+def _inscrire_joueur(m: Moteur, req: InscriptionRequest):
     # existe déjà ?
     jid = _trouver_joueur_id_par_nom(m.etat, req.nom)
     if jid:
@@ -174,6 +300,7 @@ def inscrire_joueur(pid: str, req: InscriptionRequest):
     # Déverrouiller si assez de joueurs
     if len(m.etat.joueurs) >= 2 and m.etat.phase == "inscription":
         m.etat.phase = "definition"
+        m.etat.toucher()
         # journal minimal (optionnel)
         m._log(
             action={
@@ -197,79 +324,267 @@ def inscrire_joueur(pid: str, req: InscriptionRequest):
 
 
 @app.get("/parties/{partie_id}")
-def obtenir_etat(partie_id: str):
-    """Retourne l’état complet d’une partie."""
-    moteur = parties.get(partie_id)
+async def obtenir_etat(partie_id: str, request: Request):
+    """Retourne l’état complet d’une partie (304 si If-None-Match est à jour)."""
+    moteur = await parties.obtenir(partie_id)
     if not moteur:
         return JSONResponse({"error": "partie introuvable"}, status_code=404)
-    e = moteur.etat
-    return JSONResponse(
-        {
-            "id": e.id,
-            "joueurs": {j.id: j.__dict__ for j in e.joueurs.values()},
-            "tour": e.tour,
-            "phase": e.phase,
-            "tension": e.tension,
-            "contentieux": e.contentieux,
-            "partie_status": e.partie_status,
-            "journal": e.journal[-10:],  # les 10 derniers événements
-        }
+    # lecture courte, faite sur la boucle sous verrou: jamais d'état à moitié muté
+    async with parties.session(partie_id, moteur, ecriture=False) as moteur:
+        e = moteur.etat
+        etag = _etag(e.version)
+        if _non_modifie(request, etag):
+            return Response(status_code=304, headers=_entetes_cache(etag))
+        return JSONResponse(
+            {
+                "id": e.id,
+                "joueurs": {j.id: j.__dict__ for j in e.joueurs.values()},
+                "tour": e.tour,
+                "phase": e.phase,
+                "tension": e.tension,
+                "contentieux": e.contentieux,
+                "partie_status": e.partie_status,
+                "journal": e.journal.derniers(10),  # les 10 derniers événements
+            },
+            headers=_entetes_cache(etag),
+        )
+
+
+# long-poll: attente bornée (au-delà, les proxys coupent souvent la connexion)
+DELAI_CHANGES_MAX = 60.0
+
+
+async def _attendre_changement(
+    veille: Veille, a_change, delai: float, relire=None
+) -> bool:
+    """Attend a_change() au plus `delai` s. Avec un magasin partagé, un autre
+    worker peut écrire sans nous réveiller: on relit le magasin chaque seconde."""
+    echeance = time.monotonic() + min(max(delai, 0.0), DELAI_CHANGES_MAX)
+    while not a_change():
+        reste = echeance - time.monotonic()
+        if reste <= 0:
+            return False
+        if relire is None:
+            return await veille.attendre(a_change, reste)
+        await veille.attendre(a_change, min(reste, 1.0))
+        await relire()
+    return True
+
+
+@app.get("/parties/{partie_id}/changes")
+async def changements_partie(partie_id: str, since: int = -1, timeout: float = 25.0):
+    """Long-poll: attend une version différente de `since` (au plus `timeout` s).
+
+    Renvoie l'état sans journal, et les entrées de journal ajoutées depuis
+    `since` ("complet": false) ou, si `since` est inconnue, les 10 dernières
+    ("complet": true). 304 si rien n'a changé dans le délai.
+    """
+    moteur = await parties.obtenir(partie_id)
+    if not moteur:
+        return JSONResponse({"error": "partie introuvable"}, status_code=404)
+    veille = veille_pour(f"partie:{partie_id}")
+    if veille.position(moteur.etat.version) is None:
+        # repère de départ: le prochain delta sera exact pour ce client
+        veille.noter(moteur.etat.version, len(moteur.etat.journal))
+
+    def courante() -> Moteur:
+        return parties.en_memoire(partie_id) or moteur
+
+    async def relire():
+        async with parties.session(partie_id, courante(), ecriture=False):
+            pass
+
+    await _attendre_changement(
+        veille,
+        lambda: courante().etat.version != since,
+        timeout,
+        relire if parties.magasin.partage else None,
     )
+    async with parties.session(partie_id, courante(), ecriture=False) as moteur:
+        e = moteur.etat
+        etag = _etag(e.version)
+        if e.version == since:
+            return Response(status_code=304, headers=_entetes_cache(etag))
+        fin = len(e.journal)
+        debut = veille.position(since) if since >= 0 else None
+        complet = debut is None or debut > fin
+        if complet:
+            journal = e.journal.derniers(10)
+        else:
+            journal = list(e.journal.iter_depuis(debut, fin))
+        return JSONResponse(
+            {
+                "id": e.id,
+                "version": e.version,
+                "joueurs": {j.id: j.__dict__ for j in e.joueurs.values()},
+                "tour": e.tour,
+                "phase": e.phase,
+                "tension": e.tension,
+                "contentieux": e.contentieux,
+                "partie_status": e.partie_status,
+                "complet": complet,
+                "journal": journal,
+                "journal_fin": fin,
+            },
+            headers=_entetes_cache(etag),
+        )
+
+
+# ETag = version de l'état (EtatJeu.version, TableEtat.version): un client qui
+# sonde une partie inchangée reçoit un 304 vide, sans sérialisation.
+def _etag(version: int) -> str:
+    return f'"v{version}"'
+
+
+def _entetes_cache(etag: str) -> Dict[str, str]:
+    # no-cache: le client revalide à chaque fois (il n'y a pas de durée de vie)
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _non_modifie(request: Request, etag: str) -> bool:
+    valeur = request.headers.get("if-none-match")
+    if not valeur:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in valeur.split(",")]
+    return "*" in tags or etag in tags
 
 
 @app.post("/parties/{partie_id}/actions")
-def appliquer_action(partie_id: str, action: ActionInput):
-    moteur = parties.get(partie_id)
+async def appliquer_action(partie_id: str, action: ActionInput):
+    moteur = await parties.obtenir(partie_id)
     if not moteur:
         return JSONResponse({"error": "partie introuvable"}, status_code=404)
+    # validation + application sous le même verrou: pas d'entrelacement possible
+    # entre le contrôle des préconditions et le paiement de l'attention
+    async with parties.session(partie_id, moteur) as moteur:
+        return await run_in_threadpool(_appliquer_action, moteur, action)
+
 
+def _appliquer_action(moteur: Moteur, action: ActionInput):
     # dry-run rapide pour fournir une raison utile
-    vr = valider_action(partie_id, ValidationInput(**action.model_dump()))
+    vr = _valider_action(moteur, ValidationInput(**action.model_dump()))
     if not vr.ok:
         return JSONResponse({"error": "refus", "reason": vr.reason}, status_code=400)
 
     act = Action(type=action.type, auteur_id=action.auteur_id, payload=action.payload)
+    act.preconditions_verifiees = True  # contrôlées par le dry-run, même verrou
     evts = moteur.appliquer_action(act) or []
     return JSONResponse([e.__dict__ for e in evts])
 
 
-@app.get("/parties/{partie_id}/actions/possibles")
-def actions_possibles(partie_id: str, joueur_id: str):
-    moteur = parties.get(partie_id)
+@app.post("/parties/{partie_id}/actions/batch")
+async def appliquer_actions_batch(partie_id: str, batch: ActionsBatchInput):
+    """Applique une liste ordonnée d'actions sous un seul verrou, une réponse.
+
+    Les préconditions sont contrôlées une fois par action: un refus est
+    rapporté sans être journalisé, comme par POST /parties/{id}/actions.
+    """
+    moteur = await parties.obtenir(partie_id)
     if not moteur:
         return JSONResponse({"error": "partie introuvable"}, status_code=404)
+    async with parties.session(partie_id, moteur) as moteur:
+        return await run_in_threadpool(_appliquer_actions_batch, moteur, batch)
+
+
+# refus du moteur lui-même (partie terminée), journalisé comme pour /actions ;
+# un "erreur" après attention_depensee vient d'un effet, l'action a bien eu lieu
+_TYPES_REFUS = ("refus", "refus_precondition", "erreur")
+
+
+def _appliquer_actions_batch(moteur: Moteur, batch: ActionsBatchInput):
+    if getattr(moteur.etat, "_cfg", None) is None:
+        erreur = _assurer_cfg(moteur)
+        if erreur is not None:
+            return erreur
+    connues = moteur.etat._cfg.actions
+    resultats: List[Dict[str, Any]] = []
+    for i, action in enumerate(batch.actions):
+        if action.type not in connues:
+            # comme /actions/valider: rien n'est appliqué ni journalisé
+            res = {
+                "index": i,
+                "ok": False,
+                "reason": "action_inconnue",
+                "evenements": [],
+            }
+        else:
+            act = Action(action.type, action.auteur_id, action.payload)
+            pre = _check_preconditions(moteur.etat, act, connues[action.type])
+            if pre is not None:
+                # refusée: rien n'est payé, journalisé ni notifié
+                evts, refus = [pre], pre
+            else:
+                # contrôlées ci-dessus, sous le même verrou: la règle ne les refait pas
+                act.preconditions_verifiees = True
+                evts = moteur.appliquer_action(act) or []
+                refus = evts[0] if evts and evts[0].type in _TYPES_REFUS else None
+            res = {
+                "index": i,
+                "ok": refus is None,
+                "reason": None if refus is None else refus.donnees.get("msg"),
+                "evenements": [e.__dict__ for e in evts],
+            }
+        resultats.append(res)
+        if batch.stop_on_refus and not res["ok"]:
+            break
+    return JSONResponse(
+        {
+            "resultats": resultats,
+            "appliquees": sum(r["ok"] for r in resultats),
+            "interrompu": len(resultats) < len(batch.actions),
+        }
+    )
 
-    cfg = getattr(moteur.etat, "_cfg", None)
-    if not cfg:
-        # fallback: recharger la config de règles SANS toucher à l’état
-        try:
-            schema_path = PROJECT_ROOT / "docs" / "schemas" / "regles.schema.json"
-            cfg = charger_yaml(str(YAML_DEFAULT), schema_path=str(schema_path))
-            setattr(moteur.etat, "_cfg", cfg)
-        except Exception as ex:
-            return JSONResponse(
-                {"error": f"regles non chargees: {ex}"}, status_code=500
-            )
 
-    possibles = []
-    from moteur_jeu.regles_loader import _check_preconditions
-    from moteur_jeu.moteur import Action as A
+@app.get("/parties/{partie_id}/actions/possibles")
+async def actions_possibles(partie_id: str, joueur_id: str):
+    moteur = await parties.obtenir(partie_id)
+    if not moteur:
+        return JSONResponse({"error": "partie introuvable"}, status_code=404)
+    async with parties.session(partie_id, moteur, ecriture=False) as moteur:
+        if getattr(moteur.etat, "_cfg", None) is None:
+            erreur = await run_in_threadpool(_assurer_cfg, moteur)
+            if erreur is not None:
+                return erreur
+        # cache du moteur (signature des préconditions): court, fait sur la boucle
+        return {"possibles": moteur.actions_possibles(joueur_id)}
+
+
+@app.get("/parties/{partie_id}/actions/possibles/tous")
+async def actions_possibles_tous(partie_id: str):
+    """Actions jouables de chaque joueur, en un appel: {joueur_id: [...]}."""
+    moteur = await parties.obtenir(partie_id)
+    if not moteur:
+        return JSONResponse({"error": "partie introuvable"}, status_code=404)
+    async with parties.session(partie_id, moteur, ecriture=False) as moteur:
+        if getattr(moteur.etat, "_cfg", None) is None:
+            erreur = await run_in_threadpool(_assurer_cfg, moteur)
+            if erreur is not None:
+                return erreur
+        return {
+            "possibles": {
+                jid: moteur.actions_possibles(jid) for jid in moteur.etat.joueurs
+            }
+        }
+
 
-    for name, a_cfg in cfg.actions.items():
-        act = A(type=name, auteur_id=joueur_id, payload={})
-        pre = _check_preconditions(moteur.etat, act, a_cfg)
-        if pre is None:
-            possibles.append(name)
-    return {"possibles": possibles}
+def _assurer_cfg(moteur: Moteur) -> Optional[JSONResponse]:
+    # fallback: recharger la config de règles SANS toucher à l’état
+    try:
+        cfg = charger_regles(str(YAML_DEFAULT), schema_path=str(SCHEMA_REGLES))
+        setattr(moteur.etat, "_cfg", cfg)
+    except Exception as ex:
+        return JSONResponse({"error": f"regles non chargees: {ex}"}, status_code=500)
+    return None
 
 
 @app.post("/parties/{partie_id}/tour/debut")
-def debut_nouveau_tour(partie_id: str):
-    moteur = parties.get(partie_id)
+async def debut_nouveau_tour(partie_id: str):
+    moteur = await parties.obtenir(partie_id)
     if not moteur:
         return JSONResponse({"error": "partie introuvable"}, status_code=404)
-
-    evts = moteur.debut_nouveau_tour()
+    async with parties.session(partie_id, moteur) as moteur:
+        evts = await run_in_threadpool(moteur.debut_nouveau_tour)
     if evts is None:
         evts = []  # fallback si le moteur ne renvoie rien
 
@@ -280,60 +595,67 @@ def debut_nouveau_tour(partie_id: str):
 
 
 @app.post("/parties/{partie_id}/save")
-def sauvegarder_partie(partie_id: str, path: str = Body(..., embed=True)):
+async def sauvegarder_partie(partie_id: str, path: str = Body(..., embed=True)):
     """
     Sauvegarde l'état de la partie dans un fichier JSON (path absolu conseillé).
     """
-    moteur = parties.get(partie_id)
+    moteur = await parties.obtenir(partie_id)
     if not moteur:
         return JSONResponse({"error": "partie introuvable"}, status_code=404)
-    sauvegarder(moteur.etat, path, meta={"regles": "reforme-x.yaml"})
+    async with parties.session(partie_id, moteur, ecriture=False) as moteur:
+        await run_in_threadpool(
+            sauvegarder, moteur.etat, path, meta={"regles": "reforme-x.yaml"}
+        )
     return {"ok": True, "path": path}
 
 
 @app.post("/parties/load")
-def charger_partie(path: str = Body(..., embed=True)):
+async def charger_partie(path: str = Body(..., embed=True)):
+    moteur = await run_in_threadpool(_charger_partie, path)
+    await _installer(moteur)
+    e = moteur.etat
+    return {"id": e.id, "tour": e.tour, "phase": e.phase, "tension": e.tension}
+
+
+def _charger_partie(path: str) -> Moteur:
     # 1) Charger l’état + meta (utilise ton noyau)
     data = charger(path)  # retourne le dict serialisé
-    # Recréer un moteur avec cet état
-    from moteur_jeu.moteur import Moteur
-
-    etat_data = data["etat"]
     # Si ton noyau fournit moteur_depuis_fichier, tu peux l'utiliser.
     # Sinon, on reconstruit EtatJeu via une fonction existante (tu l'as dans les tests).
     m2 = moteur_depuis_fichier(path)  # préférable si dispo et testé
-    moteur = Moteur(etat=m2.etat, regles=m2.regles)
+    return _rattacher(Moteur(etat=m2.etat, regles=m2.regles), data.get("meta"))
 
-    # 2) Re-attacher moteur
-    setattr(moteur.etat, "_moteur", moteur)
 
-    # 3) Re-attacher cfg SANS ré-initialiser l’état
-    regles_name = (data.get("meta") or {}).get("regles", "reforme-x.yaml")
-    schema_path = PROJECT_ROOT / "docs" / "schemas" / "regles.schema.json"
-    cfg = charger_yaml(
-        str((PROJECT_ROOT / "docs" / "regles" / regles_name)),
-        schema_path=str(schema_path),
-    )
-    setattr(moteur.etat, "_cfg", cfg)
+def _moteur_depuis_sauvegarde(data: Dict[str, Any]) -> Moteur:
+    # sauvegarde déjà décodée (magasin de parties): pas de WAL à rejouer
+    return _rattacher(Moteur(etat=etat_from_dict(data["etat"])), data.get("meta"))
 
-    # 4) Enregistrer la partie en mémoire
-    parties[moteur.etat.id] = moteur
 
-    e = moteur.etat
-    return {"id": e.id, "tour": e.tour, "phase": e.phase, "tension": e.tension}
+def _rattacher(moteur: Moteur, meta: Optional[Dict[str, Any]]) -> Moteur:
+    # 2) Re-attacher moteur
+    setattr(moteur.etat, "_moteur", moteur)
+
+    # 3) Re-attacher cfg et règles SANS ré-initialiser l’état (config partagée
+    #    via le registre: pas de relecture du YAML tant qu'il ne change pas)
+    regles_name = (meta or {}).get("regles", "reforme-x.yaml")
+    moteur.attacher_regles_yaml(str(DOCS_DIR / regles_name))
+    return moteur
 
 
 @app.post("/parties/{partie_id}/actions/valider", response_model=ValidationResult)
-def valider_action(partie_id: str, data: ValidationInput):
-    moteur = parties.get(partie_id)
+async def valider_action(partie_id: str, data: ValidationInput):
+    moteur = await parties.obtenir(partie_id)
     if not moteur:
         raise HTTPException(404, "partie introuvable")
+    async with parties.session(partie_id, moteur, ecriture=False) as moteur:
+        return await run_in_threadpool(_valider_action, moteur, data)
 
+
+def _valider_action(moteur: Moteur, data: ValidationInput) -> ValidationResult:
     cfg = getattr(moteur.etat, "_cfg", None)
     if not cfg:
         # petit fallback si _cfg a sauté (ex: après /load)
-        schema_path = PROJECT_ROOT / "docs" / "schemas" / "regles.schema.json"
-        cfg = charger_yaml(str(YAML_DEFAULT), schema_path=str(schema_path))
+        cfg = charger_regles(str(YAML_DEFAULT), schema_path=str(SCHEMA_REGLES))
         setattr(moteur.etat, "_cfg", cfg)
 
     a_cfg = cfg.actions.get(data.type)
@@ -368,20 +690,92 @@ def valider_action(partie_id: str, data: ValidationInput):
     return ValidationResult(ok=True)
 
 
-@app.get("/tables")
-def lister_tables(active_only: int = 0):
-    # ménage léger: supprimer les tables démarrées dont la partie est finie/absente
+# Les routes /tables manipulent `tables` sur la boucle, sous le verrou de la
+# table pour les modifications. Avec un magasin partagé, `tables` n'est qu'un
+# cache: chaque table est relue du magasin et ses modifications y sont écrites
+# sous bail, en compare-and-set sur TableEtat.version.
+
+
+def _cle_table(tid: str) -> str:
+    return f"table:{tid}"
+
+
+async def _lire_table(tid: str) -> Optional[TableEtat]:
+    if not parties.magasin.partage:
+        return tables.get(tid)
+    lu = await run_in_threadpool(parties.magasin.lire, _cle_table(tid))
+    if lu is None:
+        tables.pop(tid, None)
+        return None
+    t = tables.get(tid)
+    if t is None or t.version != lu[0]:
+        t = tables[tid] = TableEtat.model_validate_json(lu[1])
+    return t
+
+
+async def _toutes_tables() -> List[TableEtat]:
+    if not parties.magasin.partage:
+        return list(tables.values())
+    cles = await run_in_threadpool(parties.magasin.cles, "table:")
+    lues = [await _lire_table(cle.partition(":")[2]) for cle in cles]
+    return [t for t in lues if t is not None]
+
+
+async def _ecrire_table(t: TableEtat, attendue: Optional[int]) -> None:
+    tables[t.id] = t
+    if not parties.magasin.partage:
+        return
+    donnees = t.model_dump_json().encode()
+    ok = await run_in_threadpool(
+        parties.magasin.ecrire, _cle_table(t.id), donnees, t.version, attendue
+    )
+    if not ok:
+        tables.pop(t.id, None)
+        raise ConflitVersion(_cle_table(t.id))
+
+
+async def _supprimer_table(tid: str) -> None:
+    tables.pop(tid, None)
+    oublier_veille(_cle_table(tid))
+    if parties.magasin.partage:
+        await run_in_threadpool(parties.magasin.supprimer, _cle_table(tid))
+
+
+@asynccontextmanager
+async def _table_modifiee(tid: str):
+    """La table (None: introuvable), enregistrée en sortie si elle a changé."""
+    async with _verrou(_cle_table(tid)), parties.bail(_cle_table(tid)):
+        t = await _lire_table(tid)
+        avant = t.model_dump() if t is not None else None
+        yield t
+        if t is not None and t.model_dump() != avant:
+            t.version += 1
+            await _ecrire_table(t, avant["version"])
+    if t is not None and t.version != avant["version"]:
+        await signaler(_cle_table(tid), t.version)
+
+
+async def _tables_a_nettoyer() -> List[str]:
+    # tables démarrées dont la partie est finie/absente
     to_delete = []
-    for tid, t in list(tables.items()):
-        if t.demarree and t.partie_id:
-            m = parties.get(t.partie_id)
-            if (m is None) or (m.etat.partie_status == "terminee"):
-                to_delete.append(tid)
+    for t in await _toutes_tables():
+        # partie d'un autre shard: son statut n'est pas connu ici
+        if t.demarree and t.partie_id and routeur.est_local(t.partie_id):
+            statut = await parties.statut(t.partie_id)
+            if statut in (None, "terminee"):
+                to_delete.append(t.id)
     for tid in to_delete:
-        tables.pop(tid, None)
+        await _supprimer_table(tid)
+    return to_delete
+
+
+@app.get("/tables")
+async def lister_tables(active_only: int = 0):
+    # ménage léger: supprimer les tables démarrées dont la partie est finie/absente
+    await _tables_a_nettoyer()
 
     items = []
-    for t in tables.values():
+    for t in await _toutes_tables():
         if active_only == 1 and t.demarree:
             # si on veut voir seulement les salles d’attente (non démarrées)
             continue
@@ -400,20 +794,14 @@ def lister_tables(active_only: int = 0):
 
 
 @app.post("/tables/cleanup")
-def cleanup_tables():
-    removed = []
-    for tid, t in list(tables.items()):
-        if t.demarree and t.partie_id:
-            m = parties.get(t.partie_id)
-            if (m is None) or (m.etat.partie_status == "terminee"):
-                removed.append(tid)
-                tables.pop(tid, None)
+async def cleanup_tables():
+    removed = await _tables_a_nettoyer()
     return {"ok": True, "removed": removed}
 
 
 @app.post("/tables")
-def creer_table(req: TableCreateRequest):
-    tid = str(uuid.uuid4())
+async def creer_table(req: TableCreateRequest):
+    tid = routeur.identifiant_local()  # table servie par ce shard
     t = TableEtat(
         id=tid,
         cree_a=time.time(),
@@ -425,78 +813,218 @@ def creer_table(req: TableCreateRequest):
         demarree=False,
         partie_id=None,
     )
-    tables[tid] = t
+    await _ecrire_table(t, None)
     return {"ok": True, "table": t.dict()}
 
 
 @app.get("/tables/{tid}")
-def etat_table(tid: str):
-    t = tables.get(tid)
+async def etat_table(tid: str, request: Request):
+    t = await _lire_table(tid)
     if not t:
         return JSONResponse(
             {"error": "not_found", "reason": "table introuvable"}, status_code=404
         )
-    return t.dict()
+    etag = _etag(t.version)
+    if _non_modifie(request, etag):
+        return Response(status_code=304, headers=_entetes_cache(etag))
+    return JSONResponse(t.dict(), headers=_entetes_cache(etag))
 
 
-@app.post("/tables/{tid}/join")
-def table_join(tid: str, req: TableJoinRequest):
-    t = tables.get(tid)
+@app.get("/tables/{tid}/changes")
+async def changements_table(tid: str, since: int = -1, timeout: float = 25.0):
+    """Long-poll: la table dès que sa version diffère de `since` ; 304 sinon."""
+    t = await _lire_table(tid)
     if not t:
         return JSONResponse(
             {"error": "not_found", "reason": "table introuvable"}, status_code=404
         )
-    if t.demarree:
-        return JSONResponse(
-            {"error": "already_started", "reason": "la partie est déjà démarrée"},
-            status_code=400,
-        )
-    # inscrit le joueur s'il n'existe pas
-    if req.nom not in t.joueurs:
-        t.joueurs[req.nom] = False
-        if not t.host:
-            t.host = req.nom
-    return {"ok": True, "table": t.dict(), "you_are_host": (t.host == req.nom)}
 
+    async def relire():
+        await _lire_table(tid)
 
-@app.post("/tables/{tid}/ready")
-def table_ready(tid: str, req: TableReadyRequest):
-    t = tables.get(tid)
+    await _attendre_changement(
+        veille_pour(_cle_table(tid)),
+        lambda: (tables.get(tid) or t).version != since,
+        timeout,
+        relire if parties.magasin.partage else None,
+    )
+    t = await _lire_table(tid)
     if not t:
         return JSONResponse(
             {"error": "not_found", "reason": "table introuvable"}, status_code=404
         )
-    if req.nom not in t.joueurs:
-        return JSONResponse(
-            {"error": "forbidden", "reason": "non inscrit à cette table"},
-            status_code=403,
-        )
-    t.joueurs[req.nom] = bool(req.ready)
-    return {"ok": True, "table": t.dict()}
+    etag = _etag(t.version)
+    if t.version == since:
+        return Response(status_code=304, headers=_entetes_cache(etag))
+    return JSONResponse(t.dict(), headers=_entetes_cache(etag))
+
+
+@app.post("/tables/{tid}/join")
+async def table_join(tid: str, req: TableJoinRequest):
+    async with _table_modifiee(tid) as t:
+        if not t:
+            return JSONResponse(
+                {"error": "not_found", "reason": "table introuvable"}, status_code=404
+            )
+        if t.demarree:
+            return JSONResponse(
+                {
+                    "error": "already_started",
+                    "reason": "la partie est déjà démarrée",
+                },
+                status_code=400,
+            )
+        # inscrit le joueur s'il n'existe pas
+        if req.nom not in t.joueurs:
+            t.joueurs[req.nom] = False
+            if not t.host:
+                t.host = req.nom
+        return {"ok": True, "table": t.dict(), "you_are_host": (t.host == req.nom)}
+
+
+@app.post("/tables/{tid}/ready")
+async def table_ready(tid: str, req: TableReadyRequest):
+    async with _table_modifiee(tid) as t:
+        if not t:
+            return JSONResponse(
+                {"error": "not_found", "reason": "table introuvable"}, status_code=404
+            )
+        if req.nom not in t.joueurs:
+            return JSONResponse(
+                {"error": "forbidden", "reason": "non inscrit à cette table"},
+                status_code=403,
+            )
+        t.joueurs[req.nom] = bool(req.ready)
+        return {"ok": True, "table": t.dict()}
 
 
 @app.post("/tables/{tid}/start")
-def table_start(tid: str, body: dict = Body(...)):
-    t = tables.get(tid)
-    if not t:
-        return JSONResponse({"error": "not_found"}, status_code=404)
+async def table_start(tid: str, body: dict = Body(...)):
+    async with _table_modifiee(tid) as t:
+        if not t:
+            return JSONResponse({"error": "not_found"}, status_code=404)
+        if t.demarree:  # deux "start" concurrents: une seule partie
+            return {"ok": True, "pid": t.partie_id}
+
+        host = (body or {}).get("host")
+        noms = (body or {}).get("joueurs", []) or list(t.joueurs.keys())
+        if host and host not in noms:
+            noms.append(host)
+
+        m = Moteur.creer_partie(noms)
+        try:
+            # la table est marquée démarrée avant de céder la main
+            t.demarree = True
+            await run_in_threadpool(m.charger_regles_yaml, str(YAML_DEFAULT))
+        except Exception as e:
+            t.demarree = False
+            return JSONResponse({"error": "regles", "reason": str(e)}, status_code=500)
 
-    host = (body or {}).get("host")
-    noms = (body or {}).get("joueurs", []) or list(t.joueurs.keys())
-    if host and host not in noms:
-        noms.append(host)
+        await _installer(m)
 
-    m = Moteur.creer_partie(noms)
-    try:
-        m.charger_regles_yaml(str(YAML_DEFAULT))
-    except Exception as e:
-        return JSONResponse({"error": "regles", "reason": str(e)}, status_code=500)
+        t.demarree = True
+        t.partie_id = m.etat.id
+        return {"ok": True, "pid": m.etat.id}
 
-    parties[m.etat.id] = m
 
-    t.demarree = True
-    t.partie_id = m.etat.id
-    return {"ok": True, "pid": m.etat.id}
+# ===============================
+# SHARDS (routes internes et administration)
+# ===============================
+
+
+class ShardsInput(BaseModel):
+    shards: Dict[str, str]  # id -> url de base
+    propager: bool = True  # transmettre la liste aux autres shards
+
+
+def _interdit(request: Request) -> Optional[JSONResponse]:
+    # hors sharding (ou sans API_SHARD_TOKEN), ces routes n'existent pas
+    if not routeur.administrable:
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+    if routeur.jeton_valide(request):
+        return None
+    return JSONResponse({"error": "forbidden"}, status_code=403)
+
+
+@app.post("/interne/parties")
+async def recevoir_partie(request: Request):
+    """Partie remise par un autre shard (sauvegarde binaire du moteur)."""
+    refus = _interdit(request)
+    if refus is not None:
+        return refus
+    moteur = await run_in_threadpool(_decoder_partie, await request.body())
+    await _installer(moteur, local=True)
+    routeur.compteurs["recues"] += 1
+    return {"ok": True, "id": moteur.etat.id}
+
+
+@app.post("/interne/tables")
+async def recevoir_table(request: Request):
+    refus = _interdit(request)
+    if refus is not None:
+        return refus
+    t = TableEtat.model_validate_json(await request.body())
+    async with _verrou(_cle_table(t.id)):
+        await _ecrire_table(t, -1)
+    await signaler(_cle_table(t.id), t.version)
+    routeur.compteurs["recues"] += 1
+    return {"ok": True, "id": t.id}
+
+
+@app.get("/admin/shards")
+async def etat_shards(request: Request):
+    refus = _interdit(request)
+    if refus is not None:
+        return refus
+    return routeur.etat()
+
+
+@app.put("/admin/shards")
+async def changer_shards(req: ShardsInput, request: Request):
+    """Nouvelle liste de shards (arrivée/départ d'un worker), puis
+    rééquilibrage: les parties et tables qui changent de shard lui sont remises.
+    """
+    refus = _interdit(request)
+    if refus is not None:
+        return refus
+    anciens = dict(routeur.config.shards)
+    try:
+        routeur.reconfigurer(req.shards)
+    except ValueError as ex:
+        return JSONResponse({"error": "shards", "reason": str(ex)}, status_code=400)
+    propages = {}
+    if req.propager:
+        # les anciens shards aussi: un partant doit remettre ses parties
+        for shard, url in {**anciens, **req.shards}.items():
+            if shard == routeur.config.moi:
+                continue
+            propages[shard] = await routeur.propager(url, req.shards)
+    return {"ok": True, **await _reequilibrer(), "propages": propages}
+
+
+async def _reequilibrer() -> Dict[str, int]:
+    parties_remises = 0
+    for pid in parties.identifiants():
+        if routeur.est_local(pid):
+            continue
+        shard = routeur.proprietaire(pid)
+        remettre = partial(routeur.remettre, shard, "/interne/parties")
+        parties_remises += await parties.ceder(pid, remettre)
+    tables_remises = 0
+    for t in await _toutes_tables():
+        if routeur.est_local(t.id):
+            continue
+        async with _verrou(_cle_table(t.id)):
+            if not parties.magasin.partage:
+                donnees = t.model_dump_json().encode()
+                await routeur.remettre(
+                    routeur.proprietaire(t.id), "/interne/tables", donnees
+                )
+                await _supprimer_table(t.id)
+            else:
+                tables.pop(t.id, None)
+        tables_remises += 1
+    return {"parties_remises": parties_remises, "tables_remises": tables_remises}
 
 
 # ===============================
@@ -507,37 +1035,61 @@ def table_start(tid: str, body: dict = Body(...)):
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     """
-    Un simple canal WebSocket pour recevoir les journaux en direct.
-    Le client envoie: {"type": "subscribe", "partie_id": "..."}
+    Canal WebSocket poussant les nouvelles entrées de journal d'une partie.
+    Le client envoie: {"type": "subscribe", "partie_id": "...", "depuis": n}
+    "depuis" (optionnel) renvoie d'abord les entrées à partir de l'index n
+    (reprise après reconnexion). Ensuite chaque message est une liste d'entrées,
+    poussée dès que le moteur journalise; le client n'a plus besoin de pinger.
     """
     await ws.accept()
-    moteur: Moteur = None
+    hub = ab = None
     try:
         msg = await ws.receive_json()
-        if msg.get("type") == "subscribe":
-            partie_id = msg.get("partie_id")
-            moteur = parties.get(partie_id)
-            if not moteur:
-                await ws.send_json({"error": "partie introuvable"})
-                return
-            await ws.send_json({"ok": True, "msg": f"Abonné à la partie {partie_id}"})
-        else:
+        if msg.get("type") != "subscribe":
             await ws.send_json({"error": "commande invalide"})
             return
-
-        # Boucle d’envoi du journal
-        last_len = 0
-        while True:
-            e = moteur.etat
-            if len(e.journal) > last_len:
-                new_entries = e.journal[last_len:]
-                await ws.send_text(json.dumps(new_entries, ensure_ascii=False))
-                last_len = len(e.journal)
-            await ws.receive_text()  # ping ou noop pour garder la connexion
+        partie_id = msg.get("partie_id")
+        if partie_id and not routeur.est_local(partie_id):
+            # pas de relais WebSocket: le client se reconnecte au bon shard
+            shard = routeur.proprietaire(partie_id)
+            url = routeur.config.shards[shard]
+            await ws.send_json({"error": "autre_shard", "shard": shard, "url": url})
+            return
+        moteur = await parties.obtenir(partie_id)
+        if not moteur:
+            await ws.send_json({"error": "partie introuvable"})
+            return
+        hub = hub_pour(partie_id, moteur, _verrou(partie_id))
+        ab, arriere = await hub.abonner(msg.get("depuis"))
+        # offset: index de la prochaine entrée après l'arriéré éventuel
+        ack = {"ok": True, "msg": f"Abonné à la partie {partie_id}"}
+        await ws.send_json({**ack, "offset": ab.curseur})
+        if arriere:
+            await ws.send_text(arriere)
+
+        async def _envoyer():
+            while True:
+                await ws.send_text(await hub.prochain(ab))
+
+        async def _ecouter():
+            # les messages du client (anciens pings) sont ignorés; sert à
+            # détecter la déconnexion
+            while True:
+                await ws.receive_text()
+
+        taches = [asyncio.create_task(_envoyer()), asyncio.create_task(_ecouter())]
+        fini, en_cours = await asyncio.wait(taches, return_when=asyncio.FIRST_COMPLETED)
+        for t in en_cours:
+            t.cancel()
+        for t in fini:
+            t.result()
     except WebSocketDisconnect:
         print("🔌 WebSocket déconnecté")
     except Exception as ex:
         await ws.send_json({"error": str(ex)})
+    finally:
+        if hub is not None and ab is not None:
+            hub.desabonner(ab)
 
 
 # ===============================
@@ -0,0 +1,352 @@
+"""Répartition des parties entre workers par hachage cohérent.
+
+Chaque partie (et chaque table) appartient à un shard, choisi par un anneau
+de hachage cohérent sur son id: la partie reste en mémoire dans ce seul
+processus, les règles y sont évaluées sans aller-retour de sérialisation.
+Une requête arrivée sur un autre worker est relayée au propriétaire (proxy
+httpx) ou redirigée (307), selon API_ROUTAGE.
+
+    API_SHARDS="a=http://127.0.0.1:8001,b=http://127.0.0.1:8002"
+    API_SHARD_ID=a               ce worker
+    API_ROUTAGE=proxy|redirect   (défaut proxy)
+    API_SHARD_TOKEN=...          jeton des routes /interne et /admin (requis)
+    API_SHARD_URLS="http://..."  urls admises en plus de API_SHARDS (ajouts)
+
+Sans API_SHARDS ou sans jeton, les routes /interne et /admin répondent 404:
+elles remplacent des parties et orientent le trafic vers d'autres serveurs.
+
+Quand un shard arrive ou part (PUT /admin/shards), seules les parties dont
+le propriétaire change sont remises à leur nouveau shard (~1/n des parties).
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import hmac
+import json
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import RedirectResponse, Response
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - on n'impose pas la présence en runtime
+    httpx = None
+
+# posé sur une requête relayée: le shard qui la reçoit la traite sans relayer
+ENTETE_RELAIS = "x-shard-relais"
+ENTETE_JETON = "x-shard-token"
+
+# en-têtes propres à une connexion, à ne pas recopier d'un saut à l'autre
+_HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+}
+# httpx rend le corps décompressé: l'encodage d'origine ne vaut plus
+_REPONSE_SANS = _HOP_BY_HOP | {"content-encoding"}
+
+# /parties/{id}/... et /tables/{id}/... (hors routes sans id)
+_ROUTE_PARTIE = re.compile(r"^/(parties|tables)/(?P<cle>[^/]+)")
+_SANS_CLE = {"load", "cleanup"}
+# listes fusionnées depuis tous les shards
+_LISTES = {"/parties", "/tables"}
+
+
+def _hachage(texte: str) -> int:
+    return int.from_bytes(hashlib.md5(texte.encode()).digest()[:8], "big")
+
+
+class AnneauCoherent:
+    """Anneau de hachage cohérent avec nœuds virtuels."""
+
+    def __init__(self, noeuds: Iterable[str] = (), virtuels: int = 64):
+        self.virtuels = virtuels
+        self._points: List[int] = []
+        self._noeud_du_point: Dict[int, str] = {}
+        self.noeuds: List[str] = []
+        for n in noeuds:
+            self.ajouter(n)
+
+    def ajouter(self, noeud: str) -> None:
+        if noeud in self.noeuds:
+            return
+        self.noeuds.append(noeud)
+        for i in range(self.virtuels):
+            h = _hachage(f"{noeud}#{i}")
+            if h not in self._noeud_du_point:
+                bisect.insort(self._points, h)
+                self._noeud_du_point[h] = noeud
+
+    def retirer(self, noeud: str) -> None:
+        if noeud not in self.noeuds:
+            return
+        self.noeuds.remove(noeud)
+        self._points = [h for h in self._points if self._noeud_du_point[h] != noeud]
+        self._noeud_du_point = {
+            h: n for h, n in self._noeud_du_point.items() if n != noeud
+        }
+
+    def noeud_pour(self, cle: str) -> str:
+        if not self._points:
+            raise LookupError("anneau vide")
+        i = bisect.bisect(self._points, _hachage(cle)) % len(self._points)
+        return self._noeud_du_point[self._points[i]]
+
+    def __len__(self) -> int:
+        return len(self.noeuds)
+
+
+def parser_shards(texte: str) -> Dict[str, str]:
+    """"a=http://h:1,b=http://h:2" -> {"a": "http://h:1", "b": "http://h:2"}."""
+    shards = {}
+    for morceau in filter(None, (m.strip() for m in texte.split(","))):
+        nom, sep, url = morceau.partition("=")
+        if not sep:
+            raise ValueError(f"API_SHARDS: '{morceau}' n'est pas de la forme id=url")
+        shards[nom.strip()] = url.strip().rstrip("/")
+    return shards
+
+
+@dataclass
+class ConfigRoutage:
+    shards: Dict[str, str] = field(default_factory=dict)  # id -> url de base
+    moi: Optional[str] = None
+    mode: str = "proxy"  # ou "redirect"
+    jeton: Optional[str] = None
+    # urls qu'un PUT /admin/shards peut faire entrer dans l'anneau
+    urls: FrozenSet[str] = frozenset()
+    virtuels: int = 64
+    delai: float = 10.0  # délai d'un relais (s)
+
+    @classmethod
+    def depuis_env(cls) -> "ConfigRoutage":
+        env = os.environ.get
+        defaut = cls()
+        shards = parser_shards(env("API_SHARDS", ""))
+        urls = (u.strip().rstrip("/") for u in env("API_SHARD_URLS", "").split(","))
+        return cls(
+            shards=shards,
+            moi=env("API_SHARD_ID") or None,
+            mode=env("API_ROUTAGE", defaut.mode),
+            jeton=env("API_SHARD_TOKEN") or None,
+            urls=frozenset(filter(None, urls)) | frozenset(shards.values()),
+            virtuels=int(env("API_SHARD_VIRTUELS", defaut.virtuels)),
+            delai=float(env("API_SHARD_DELAI", defaut.delai)),
+        )
+
+
+class Routeur:
+    """Propriétaire de chaque partie et relais vers les autres shards.
+
+    Inactif (tout est local) sans API_SHARDS/API_SHARD_ID.
+    """
+
+    def __init__(self, config: ConfigRoutage):
+        if config.mode not in ("proxy", "redirect"):
+            raise ValueError(f"API_ROUTAGE inconnu: {config.mode}")
+        if config.shards and config.moi not in config.shards:
+            raise ValueError(f"API_SHARD_ID '{config.moi}' absent de API_SHARDS")
+        if config.shards and httpx is None:
+            raise RuntimeError("API_SHARDS: paquet 'httpx' non installé")
+        self.config = config
+        self.anneau = AnneauCoherent(config.shards, config.virtuels)
+        self._client: Optional["httpx.AsyncClient"] = None
+        self.compteurs = {"relayees": 0, "redirigees": 0, "remises": 0, "recues": 0}
+
+    @property
+    def actif(self) -> bool:
+        # seul (ou sans configuration): tout est local
+        return bool(self.config.moi) and self.anneau.noeuds not in (
+            [],
+            [self.config.moi],
+        )
+
+    # --- cycle de vie ------------------------------------------------------------
+    def demarrer(self) -> None:
+        if httpx is not None and self.config.shards:
+            # connexions gardées ouvertes vers les autres shards
+            self._client = httpx.AsyncClient(timeout=self.config.delai)
+
+    async def arreter(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # --- propriété ---------------------------------------------------------------
+    def proprietaire(self, cle: str) -> str:
+        return self.anneau.noeud_pour(cle) if self.actif else self.config.moi
+
+    def est_local(self, cle: str) -> bool:
+        return not self.actif or self.proprietaire(cle) == self.config.moi
+
+    def identifiant_local(self) -> str:
+        """Un uuid dont ce shard est propriétaire (≈ n tirages pour n shards)."""
+        while True:
+            cle = str(uuid.uuid4())
+            if self.est_local(cle):
+                return cle
+
+    def cle_de(self, chemin: str) -> Optional[str]:
+        m = _ROUTE_PARTIE.match(chemin)
+        if m is None or m["cle"] in _SANS_CLE:
+            return None
+        return m["cle"]
+
+    @property
+    def administrable(self) -> bool:
+        # routes /interne et /admin: shards configurés et jeton posé
+        return bool(self.config.shards) and bool(self.config.jeton)
+
+    def jeton_valide(self, request: Request) -> bool:
+        if not self.administrable:
+            return False
+        recu = request.headers.get(ENTETE_JETON, "")
+        return hmac.compare_digest(recu.encode(), self.config.jeton.encode())
+
+    def _entetes(self, entetes: Iterable[Tuple[str, str]] = ()) -> Dict[str, str]:
+        # requête relayée: marquée (pas de second relais) et authentifiée
+        sortie = {k: v for k, v in entetes if k.lower() not in _HOP_BY_HOP}
+        sortie[ENTETE_RELAIS] = self.config.moi or ""
+        if self.config.jeton:
+            sortie[ENTETE_JETON] = self.config.jeton
+        return sortie
+
+    # --- relais ------------------------------------------------------------------
+    async def aiguiller(self, request: Request, call_next) -> Response:
+        """Middleware HTTP: traite localement, relaie ou fusionne les listes."""
+        if not self.actif or ENTETE_RELAIS in request.headers:
+            return await call_next(request)
+        chemin = request.url.path
+        if request.method == "GET" and chemin in _LISTES:
+            return await self._fusionner(request, call_next)
+        cle = self.cle_de(chemin)
+        if cle is None or self.est_local(cle):
+            return await call_next(request)
+        shard = self.proprietaire(cle)
+        url = self.config.shards[shard] + chemin
+        if request.url.query:
+            url += "?" + request.url.query
+        if self.config.mode == "redirect":
+            self.compteurs["redirigees"] += 1
+            return RedirectResponse(url, status_code=307)
+        self.compteurs["relayees"] += 1
+        try:
+            r = await self._client.request(
+                request.method,
+                url,
+                content=await request.body(),
+                headers=self._entetes(request.headers.items()),
+            )
+        except httpx.HTTPError as ex:
+            erreur = {"error": "shard_injoignable", "shard": shard, "reason": str(ex)}
+            return Response(
+                json.dumps(erreur), status_code=502, media_type="application/json"
+            )
+        entetes = {k: v for k, v in r.headers.items() if k.lower() not in _REPONSE_SANS}
+        return Response(r.content, status_code=r.status_code, headers=entetes)
+
+    async def _fusionner(self, request: Request, call_next) -> Response:
+        # GET /parties, GET /tables: la liste de chaque shard, concaténée
+        async def distante(url: str) -> List[Any]:
+            try:
+                r = await self._client.get(
+                    url + request.url.path,
+                    params=request.query_params,
+                    headers=self._entetes(),
+                )
+                return r.json() if r.status_code == 200 else []
+            except (httpx.HTTPError, ValueError):
+                return []  # un shard absent ne masque pas les autres
+
+        # lancées tout de suite (en parallèle de l'appel local), annulées si
+        # celui-ci échoue ou lève
+        autres = [
+            asyncio.ensure_future(distante(url))
+            for shard, url in self.config.shards.items()
+            if shard != self.config.moi and shard in self.anneau.noeuds
+        ]
+        try:
+            locale = await call_next(request)
+            if locale.status_code != 200:
+                return locale  # réponse locale telle quelle (corps, en-têtes)
+            corps = b"".join([morceau async for morceau in locale.body_iterator])
+            items = json.loads(corps)
+            for liste in await asyncio.gather(*autres):
+                items.extend(liste)
+        finally:
+            for tache in autres:
+                tache.cancel()  # sans effet sur une tâche terminée
+        return Response(json.dumps(items), media_type="application/json")
+
+    async def remettre(self, shard: str, route: str, donnees: bytes) -> None:
+        """Envoie une partie/table à son shard (route interne /interne/...)."""
+        r = await self._client.post(
+            self.config.shards[shard] + route,
+            content=donnees,
+            headers=self._entetes([("content-type", "application/octet-stream")]),
+        )
+        r.raise_for_status()
+        self.compteurs["remises"] += 1
+
+    async def propager(self, url: str, shards: Dict[str, str]) -> Any:
+        """Transmet la liste de shards à un autre shard (qui se rééquilibre)."""
+        try:
+            r = await self._client.put(
+                url + "/admin/shards",
+                json={"shards": shards, "propager": False},
+                headers=self._entetes(),
+                timeout=None,  # le rééquilibrage distant peut être long
+            )
+        except httpx.HTTPError as ex:
+            return {"error": str(ex)}
+        return r.json() if r.status_code == 200 else {"status": r.status_code}
+
+    # --- membres -----------------------------------------------------------------
+    def reconfigurer(self, shards: Dict[str, str]) -> None:
+        """Nouvelle liste de shards: seuls les arrivées/départs modifient l'anneau.
+
+        Un shard absent de la liste quitte l'anneau: il remet toutes ses
+        parties et ne fait plus que relayer.
+        """
+        if not shards:
+            raise ValueError("liste de shards vide")
+        shards = {nom: url.rstrip("/") for nom, url in shards.items()}
+        inconnues = sorted(
+            url
+            for url in shards.values()
+            if url not in self.config.urls and url not in self.config.shards.values()
+        )
+        if inconnues:
+            # seules les urls configurées (API_SHARDS, API_SHARD_URLS) sont admises
+            raise ValueError(f"urls de shard non configurées: {', '.join(inconnues)}")
+        for n in list(self.anneau.noeuds):
+            if n not in shards:
+                self.anneau.retirer(n)
+        for n in shards:
+            self.anneau.ajouter(n)
+        self.config.shards = dict(shards)
+        if self._client is None:
+            self.demarrer()
+
+    def etat(self) -> Dict[str, Any]:
+        return {
+            "moi": self.config.moi,
+            "shards": self.config.shards,
+            "mode": self.config.mode,
+            "actif": self.actif,
+            **self.compteurs,
+        }
@@ -5,7 +5,12 @@ from typing import Any, Dict, Optional
 import subprocess, shutil
 import yaml
 
-def _validate_with_schema(yaml_path: Path, schema_path: Path) -> None:
+try:  # validateurs compilés en process (partagés avec moteur_jeu)
+    from moteur_jeu import validation as _validation
+except ImportError:  # pragma: no cover - moteur_jeu/jsonschema absents
+    _validation = None
+
+def _validate_with_cli(yaml_path: Path, schema_path: Path) -> None:
     """Valide avec check-jsonschema si disponible ; sinon passe silencieusement."""
     exe = shutil.which("check-jsonschema")
     if not exe:
@@ -20,17 +25,29 @@ def _validate_with_schema(yaml_path: Path, schema_path: Path) -> None:
             f"{res.stdout}\n{res.stderr}"
         )
 
+def _validate_with_schema(yaml_path: Path, schema_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Valide le YAML ; renvoie les données déjà chargées si la validation s'est
+    faite en process (validateur en cache), None après le repli check-jsonschema.
+    """
+    if _validation is None:
+        _validate_with_cli(yaml_path, schema_path)
+        return None
+    return _validation.valider_yaml(yaml_path, schema_path) or {}
+
 def load_cfg(path_yaml: str | Path, schema_path: str | Path | None = None) -> Dict[str, Any]:
     """
-    Charge la config YAML. Si schema_path est fourni, tente une validation via check-jsonschema.
+    Charge la config YAML. Si schema_path est fourni, la valide (validateur
+    jsonschema en cache, sinon check-jsonschema).
     """
     yaml_p = Path(path_yaml)
+    data = None
     if schema_path is not None:
-        _validate_with_schema(yaml_p, Path(schema_path))
+        data = _validate_with_schema(yaml_p, Path(schema_path))
 
-    with open(yaml_p, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    if data is None:
+        with open(yaml_p, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
 
     # Normalisations éventuelles à ajouter ici...
     return data
-
@@ -1,10 +1,12 @@
 # packages/cabinet/moteur/etat.py
 from __future__ import annotations
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Literal, Optional, Any, Deque
+from typing import Dict, List, Literal, Optional, Any, Deque, Callable, TypeVar
 from collections import deque
 import copy
 
+T = TypeVar("T")
+
 AxeId = str
 
 @dataclass
@@ -89,9 +91,87 @@ class Etat:
     deck_global: DeckState = field(default_factory=DeckState)
     deck_events: EventDeckState = field(default_factory=EventDeckState)
 
+    # --- copie à partage structurel ----------------------------------------
+    # clone() ne copie rien: les deux états partagent axes, joueurs, decks,
+    # historiques et cartes_def. Toute modification d'un état cloné passe par
+    # un accesseur *_mut(), qui copie la partie visée à la première écriture
+    # (et seulement elle: un axe, un joueur, un deck...). Les champs scalaires
+    # (tour, termine, capital_collectif...) s'affectent directement.
+
+    def __post_init__(self) -> None:
+        self._exclusif = True                  # jamais cloné: tout est à nous
+        self._propres: Dict[int, Any] = {}     # id -> objet copié par cet état
+
     def clone(self) -> "Etat":
-        return copy.deepcopy(self)
+        autre = copy.copy(self)
+        # ce qui était à nous est désormais partagé, des deux côtés
+        for e in (self, autre):
+            e._exclusif = False
+            e._propres = {}
+        return autre
+
+    def copie_profonde(self) -> "Etat":
+        """Copie indépendante (ancien clone()), modifiable sans *_mut()."""
+        autre = copy.deepcopy(self)
+        autre._exclusif = True
+        autre._propres = {}
+        return autre
+
+    def _propre(self, obj: T, copier: Callable[[T], T]) -> T:
+        if self._exclusif or self._propres.get(id(obj)) is obj:
+            return obj
+        neuf = copier(obj)
+        self._propres[id(neuf)] = neuf  # garde l'objet: son id ne sera pas réattribué
+        return neuf
+
+    def axe_mut(self, axe_id: AxeId) -> Axe:
+        self.axes = self._propre(self.axes, dict)
+        axe = self._propre(self.axes[axe_id], copy.copy)
+        self.axes[axe_id] = axe
+        return axe
+
+    def joueur_mut(self, joueur_id: str) -> Joueur:
+        self.joueurs = self._propre(self.joueurs, dict)
+        j = self._propre(self.joueurs[joueur_id], _copier_joueur)
+        self.joueurs[joueur_id] = j
+        return j
+
+    def eco_mut(self) -> Economie:
+        self.eco = self._propre(self.eco, _copier_eco)
+        return self.eco
+
+    def programme_mut(self) -> Optional[ProgrammeTour]:
+        if self.programme is not None:
+            self.programme = self._propre(self.programme, copy.deepcopy)
+        return self.programme
+
+    def historiques_mut(self) -> List[Dict[str, Any]]:
+        """Liste propre à cet état; les entrées déjà écrites restent partagées."""
+        self.historiques = self._propre(self.historiques, list)
+        return self.historiques
+
+    def deck_global_mut(self) -> DeckState:
+        self.deck_global = self._propre(self.deck_global, _copier_deck)
+        return self.deck_global
+
+    def deck_events_mut(self) -> EventDeckState:
+        self.deck_events = self._propre(self.deck_events, _copier_deck)
+        return self.deck_events
+
+    def cartes_def_mut(self) -> Dict[str, Dict[str, Any]]:
+        self.cartes_def = self._propre(self.cartes_def, copy.deepcopy)
+        return self.cartes_def
 
     def asdict(self) -> Dict[str, Any]:
         return asdict(self)
 
+def _copier_joueur(j: Joueur) -> Joueur:
+    return Joueur(j.id, j.nom, j.capital_politique, list(j.main), list(j.defausse))
+
+def _copier_eco(e: Economie) -> Economie:
+    neuf = copy.copy(e)
+    neuf.depenses_postes = dict(e.depenses_postes)
+    return neuf
+
+def _copier_deck(d: T) -> T:
+    return type(d)(pioche=deque(d.pioche), defausse=deque(d.defausse))
@@ -2,6 +2,11 @@
 from __future__ import annotations
 import pathlib, shutil, subprocess, pytest
 
+try:
+    from moteur_jeu import validation
+except ImportError:
+    validation = None
+
 BASE = pathlib.Path(__file__).resolve().parents[2]
 SCHEMA = BASE / "schemas" / "regles.schema.json"
 SKINS_DIR = BASE / "skins"
@@ -21,3 +26,12 @@ def test_skin_valide(skin: pathlib.Path):
     )
     assert res.returncode == 0, f"{skin} invalide:\n{res.stdout}\n{res.stderr}"
 
+
+@pytest.mark.skipif(validation is None, reason="moteur_jeu/jsonschema absents")
+def test_skins_valides_en_lot():
+    # un seul validateur compilé pour toutes les skins, sans sous-processus
+    skins = validation.lister_yaml([SKINS_DIR])
+    assert skins == sorted(_iter_skins(SKINS_DIR))
+    rapports = validation.valider_lot(skins, SCHEMA)
+    echecs = {str(p): r for p, r in rapports.items() if r is not None}
+    assert not echecs, "\n".join(echecs.values())
@@ -0,0 +1,62 @@
+# packages/cabinet/tests/integration/test_api_batch_refus.py
+from __future__ import annotations
+import importlib.util, os, pathlib, subprocess, sys
+import pytest
+
+PACKAGES = pathlib.Path(__file__).resolve().parents[3]
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("fastapi") is None,
+    reason="fastapi non installé",
+)
+
+SCRIPT = """
+import copy, json
+from api.main import YAML_DEFAULT, ActionInput, ActionsBatchInput, _appliquer_action, _appliquer_actions_batch
+from moteur_jeu import Action, Moteur
+
+m = Moteur.creer_partie(["Alice", "Bob"])
+m.charger_regles_yaml(str(YAML_DEFAULT))
+m.etat.tension = 0
+j1, j2 = list(m.etat.joueurs)
+m.etat.joueurs[j2].attention = 0
+
+def trace(m):
+    return len(m.etat.journal), m.etat.version, len(m.etat.pile_evenements)
+
+refusees = [
+    ActionInput(type="lobby_prive", auteur_id=j1),          # phase interdite
+    ActionInput(type="proposer_reforme", auteur_id=j2),     # attention insuffisante
+    ActionInput(type="proposer_reforme", auteur_id="inconnu"),
+]
+avant = trace(m)
+r = json.loads(_appliquer_actions_batch(m, ActionsBatchInput(actions=refusees)).body)
+assert r["appliquees"] == 0, r
+assert [x["reason"] for x in r["resultats"]] == ["phase_interdite", "attention_insuffisante", "joueur_introuvable"], r
+assert trace(m) == avant, (trace(m), avant)
+# même verdict, même absence de trace, action par action
+for a in refusees:
+    assert _appliquer_action(m, a).status_code == 400
+assert trace(m) == avant, (trace(m), avant)
+
+# une action acceptée: mêmes événements que par le moteur seul (préconditions comprises)
+ref = copy.deepcopy(m)
+attendus = [(e.type, e.donnees) for e in ref.appliquer_action(Action("proposer_reforme", j1, {}))]
+r = json.loads(_appliquer_actions_batch(m, ActionsBatchInput(actions=[refusees[0], ActionInput(type="proposer_reforme", auteur_id=j1)])).body)
+assert r["appliquees"] == 1, r
+assert [(e["type"], e["donnees"]) for e in r["resultats"][1]["evenements"]] == attendus, r
+assert len(m.etat.journal) == avant[0] + 1 and m.etat.version > avant[1]
+"""
+
+def test_refus_dans_un_batch_non_journalise(tmp_path):
+    env = dict(os.environ)
+    env.update(
+        PYTHONPATH=os.pathsep.join(
+            [str(PACKAGES / "api"), str(PACKAGES / "moteur-jeu" / "src")]
+        )
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    if res.returncode != 0:
+        pytest.fail(f"échec:\nSTDOUT:\n{res.stdout}\nSTDERR:\n{res.stderr}")
@@ -0,0 +1,65 @@
+# packages/cabinet/tests/integration/test_api_shards_admin.py
+from __future__ import annotations
+import importlib.util, os, pathlib, subprocess, sys
+import pytest
+
+PACKAGES = pathlib.Path(__file__).resolve().parents[3]
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("fastapi") is None or importlib.util.find_spec("httpx") is None,
+    reason="fastapi/httpx non installés",
+)
+
+SANS_SHARDS = """
+assert c.get("/admin/shards").status_code == 404
+r = c.put("/admin/shards", json={"shards": {"evil": "http://127.0.0.1:9"}})
+assert r.status_code == 404, (r.status_code, r.text)
+assert c.post("/interne/parties", content=b"x").status_code == 404
+assert c.post("/interne/tables", content=b"{}").status_code == 404
+"""
+
+AVEC_JETON = """
+ok, faux = {"x-shard-token": "secret"}, {"x-shard-token": "secrex"}
+assert c.get("/admin/shards").status_code == 403
+assert c.get("/admin/shards", headers=faux).status_code == 403
+assert c.get("/admin/shards", headers=ok).json()["moi"] == "a"
+assert c.post("/interne/tables", content=b"{}").status_code == 403
+r = c.put("/admin/shards", headers=ok, json={"shards": {"a": "http://127.0.0.1:1", "evil": "http://127.0.0.1:9"}, "propager": False})
+assert r.status_code == 400 and "127.0.0.1:9" in r.text, (r.status_code, r.text)
+assert c.get("/admin/shards", headers=ok).json()["shards"] == {"a": "http://127.0.0.1:1", "b": "http://127.0.0.1:2"}
+r = c.put("/admin/shards", headers=ok, json={"shards": {"a": "http://127.0.0.1:1", "c": "http://127.0.0.1:3/"}, "propager": False})
+assert r.status_code == 200, (r.status_code, r.text)
+"""
+
+def _lancer(corps: str, tmp_path, **env_api):
+    script = (
+        "from fastapi.testclient import TestClient\n"
+        "from api.main import app\n"
+        "with TestClient(app, raise_server_exceptions=False) as c:\n"
+        + "".join(f"    {l}\n" for l in corps.strip().splitlines())
+    )
+    env = {k: v for k, v in os.environ.items() if not k.startswith("API_SHARD")}
+    env.update(
+        PYTHONPATH=os.pathsep.join(
+            [str(PACKAGES / "api"), str(PACKAGES / "moteur-jeu" / "src")]
+        ),
+        **env_api,
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    if res.returncode != 0:
+        pytest.fail(f"échec:\nSTDOUT:\n{res.stdout}\nSTDERR:\n{res.stderr}")
+
+def test_routes_internes_absentes_sans_sharding(tmp_path):
+    _lancer(SANS_SHARDS, tmp_path)
+
+def test_routes_internes_absentes_sans_jeton(tmp_path):
+    _lancer(SANS_SHARDS, tmp_path, API_SHARDS="a=http://127.0.0.1:1,b=http://127.0.0.1:2", API_SHARD_ID="a")
+
+def test_jeton_et_urls_verifies(tmp_path):
+    _lancer(
+        AVEC_JETON, tmp_path,
+        API_SHARDS="a=http://127.0.0.1:1,b=http://127.0.0.1:2", API_SHARD_ID="a",
+        API_SHARD_TOKEN="secret", API_SHARD_URLS="http://127.0.0.1:3",
+    )
@@ -0,0 +1,57 @@
+# packages/cabinet/tests/integration/test_api_shards_gzip.py
+from __future__ import annotations
+import importlib.util, os, pathlib, subprocess, sys
+import pytest
+
+PACKAGES = pathlib.Path(__file__).resolve().parents[3]
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("fastapi") is None or importlib.util.find_spec("httpx") is None,
+    reason="fastapi/httpx non installés",
+)
+
+GZIP = """
+for route in ("/tables", "/parties"):
+    r = c.get(route, headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200, (route, r.status_code, r.text)
+    assert r.headers.get("content-encoding") == "gzip", (route, r.headers)
+    assert r.json() == [], (route, r.text)
+"""
+
+ERREUR = """
+r = c.get("/tables", params={"active_only": "abc"})
+assert r.status_code == 422, (r.status_code, r.text)
+assert r.headers["content-type"] == "application/json", r.headers
+assert r.json()["detail"], r.text
+"""
+
+def _lancer(corps: str, tmp_path):
+    # l'API lit sa configuration (API_SHARDS, API_GZIP_MIN) à l'import: processus à part
+    script = (
+        "from fastapi.testclient import TestClient\n"
+        "from api.main import app\n"
+        "with TestClient(app, raise_server_exceptions=False) as c:\n"
+        + "".join(f"    {l}\n" for l in corps.strip().splitlines())
+    )
+    env = dict(os.environ)
+    env.update(
+        PYTHONPATH=os.pathsep.join(
+            [str(PACKAGES / "api"), str(PACKAGES / "moteur-jeu" / "src")]
+        ),
+        API_GZIP_MIN="1",
+        # l'autre shard est injoignable: la fusion garde la liste locale
+        API_SHARDS="a=http://127.0.0.1:9,b=http://127.0.0.1:9",
+        API_SHARD_ID="a",
+        PYTHONWARNINGS="error::RuntimeWarning",
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    if res.returncode != 0 or "never awaited" in res.stderr:
+        pytest.fail(f"échec:\nSTDOUT:\n{res.stdout}\nSTDERR:\n{res.stderr}")
+
+def test_listes_fusionnees_avec_gzip(tmp_path):
+    _lancer(GZIP, tmp_path)
+
+def test_liste_en_erreur_rendue_telle_quelle(tmp_path):
+    _lancer(ERREUR, tmp_path)
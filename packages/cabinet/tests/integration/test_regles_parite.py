@@ -0,0 +1,42 @@
+# packages/cabinet/tests/integration/test_regles_parite.py
+from __future__ import annotations
+import copy, importlib.util, pathlib
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[4]
+REGLES = ROOT / "docs" / "regles" / "reforme-x.yaml"
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("yaml") is None or not REGLES.exists(),
+    reason="PyYAML ou docs/regles/reforme-x.yaml absent",
+)
+
+def _etat(phase: str):
+    from moteur_jeu import EtatJeu, Joueur
+    etat = EtatJeu(id="parite", tension=0, max_tours=10**9, phase=phase)
+    etat.joueurs["j1"] = Joueur(id="j1", nom="Alice", role="reformateur", attention=1_000)
+    etat.joueurs["j2"] = Joueur(id="j2", nom="Bob", role="saboteur", attention=1_000)
+    etat.contentieux["reforme_x"] = {"id": "reforme_x", "soutien": 0}
+    return etat
+
+def _flux(regle, etat, action, n=20):
+    from moteur_jeu import Moteur
+    m = Moteur(etat=etat, regles=[regle])
+    return [[(e.type, e.donnees) for e in regle(m.etat, action) or []] for _ in range(n)], m.etat
+
+def test_regles_compilees_et_interpretees_meme_flux():
+    from moteur_jeu import Action
+    from moteur_jeu.regles_loader import charger_yaml, construire_regle_generique
+    from outils.scripts.regles_interpretees import construire_regle_interpretee
+
+    cfg = charger_yaml(str(REGLES))
+    compilee, interpretee = construire_regle_generique(cfg), construire_regle_interpretee(cfg)
+    for aid, a_cfg in cfg.actions.items():
+        phase = (a_cfg.get("allowed_phases") or ["definition"])[0]
+        for auteur in ("j1", "j2"):
+            action = Action(type=aid, auteur_id=auteur, payload={})
+            base = _etat(phase)
+            ref, etat_ref = _flux(interpretee, copy.deepcopy(base), action)
+            cmp, etat_cmp = _flux(compilee, copy.deepcopy(base), action)
+            assert cmp == ref, (aid, auteur)
+            assert etat_cmp == etat_ref, (aid, auteur)
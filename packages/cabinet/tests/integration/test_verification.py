@@ -0,0 +1,83 @@
+# packages/cabinet/tests/integration/test_verification.py
+from __future__ import annotations
+import importlib.util, json, pathlib
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[4]
+REGLES = ROOT / "docs" / "regles" / "reforme-x.yaml"
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("yaml") is None or not REGLES.exists(),
+    reason="PyYAML ou docs/regles/reforme-x.yaml absent",
+)
+
+def _partie(rejoindre: bool = False):
+    from moteur_jeu import Action, Moteur
+    m = Moteur.creer_partie(["Alice", "Bob"])
+    m.charger_regles_yaml(str(REGLES))
+    m.etat.tension = 0
+    j1, j2 = list(m.etat.joueurs)
+    m.appliquer_action(Action("cartographier_enjeux", j2, {}))
+    if rejoindre:
+        j2 = m.ajouter_joueur("Chloe").id  # hors tour: journalisé, pas de divergence
+    m.appliquer_action(Action("proposer_reforme", j2, {}))
+    m.debut_nouveau_tour()
+    m.appliquer_action(Action("faire_campagne", j1, {}))
+    return m
+
+def _sauver(m, tmp_path, nom="partie.json"):
+    from moteur_jeu.persistence import sauvegarder
+    chemin = tmp_path / nom
+    sauvegarder(m.etat, str(chemin), {"regles": str(REGLES)})
+    return chemin
+
+def _index(m, type_action):
+    return next(i for i, e in enumerate(m.etat.journal) if e["action"]["type"] == type_action)
+
+def test_partie_rejouee_ok(tmp_path):
+    from moteur_jeu.verification import verifier_fichier
+    r = verifier_fichier(str(_sauver(_partie(), tmp_path)))
+    assert r.statut == "ok", r
+    assert r.empreinte_obtenue == r.empreinte_attendue and not r.etat_initial_reconstruit
+
+def test_joueur_ajoute_en_cours_de_partie(tmp_path):
+    from moteur_jeu.verification import verifier_fichier
+    m = _partie(rejoindre=True)
+    assert m.etat.journal[_index(m, "_system_joueur_ajoute")]["action"]["payload"]["nom"] == "Chloe"
+    r = verifier_fichier(str(_sauver(m, tmp_path)))
+    assert r.statut == "ok", r
+
+def test_divergence_au_premier_index_touche(tmp_path):
+    from moteur_jeu.verification import verifier_fichier
+    m = _partie()
+    texte = REGLES.read_text(encoding="utf-8")
+    # faire_campagne: tension +1 -> +2
+    avant, apres = texte.split("- id: faire_campagne", 1)
+    apres = apres.replace("tension_delta, params: { delta: 1 }", "tension_delta, params: { delta: 2 }", 1)
+    modifie = avant + "- id: faire_campagne" + apres
+    assert modifie != texte
+    regles = tmp_path / "regles.yaml"
+    regles.write_text(modifie, encoding="utf-8")
+    r = verifier_fichier(str(_sauver(m, tmp_path)), str(regles))
+    assert r.statut == "divergence", r
+    assert r.index_divergence == _index(m, "faire_campagne")
+
+def test_sauvegarde_corrompue(tmp_path):
+    from moteur_jeu.verification import verifier_fichier
+    chemin = _sauver(_partie(), tmp_path)
+    data = json.loads(chemin.read_text(encoding="utf-8"))
+    data["etat"]["tension"] += 5
+    chemin.write_text(json.dumps(data), encoding="utf-8")
+    r = verifier_fichier(str(chemin))
+    assert r.statut == "corrompue", r
+
+def test_sauvegarde_sans_point_de_controle(tmp_path, capsys):
+    from moteur_jeu.verification import main, verifier_fichier
+    chemin = _sauver(_partie(rejoindre=True), tmp_path)
+    data = json.loads(chemin.read_text(encoding="utf-8"))
+    data["etat"]["points_controle"] = []  # sauvegarde d'avant les points de contrôle
+    chemin.write_text(json.dumps(data), encoding="utf-8")
+    r = verifier_fichier(str(chemin))
+    assert r.statut == "ok" and r.etat_initial_reconstruit, r
+    assert main([str(tmp_path), "--jobs", "1"]) == 0
+    assert "1 rejouées depuis un état initial reconstruit" in capsys.readouterr().out
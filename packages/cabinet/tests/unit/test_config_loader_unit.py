@@ -17,6 +17,8 @@ def test_load_cfg_validation_ok(monkeypatch, tmp_path):
     y = tmp_path / "ok.yaml"
     y.write_text("meta:\n  id: ok\n", encoding="utf-8")
 
+    # force le repli check-jsonschema (validation en process désactivée)
+    monkeypatch.setattr(cfgmod, "_validation", None)
     # Simule la présence de check-jsonschema + retour 0
     monkeypatch.setattr(cfgmod.shutil, "which", lambda _: "/usr/bin/check-jsonschema")
     class R: returncode=0; stdout=""; stderr=""
@@ -29,6 +31,7 @@ def test_load_cfg_validation_ko(monkeypatch, tmp_path):
     y = tmp_path / "ko.yaml"
     y.write_text("meta:\n  id: ko\n", encoding="utf-8")
 
+    monkeypatch.setattr(cfgmod, "_validation", None)
     monkeypatch.setattr(cfgmod.shutil, "which", lambda _: "/usr/bin/check-jsonschema")
     class R: returncode=1; stdout="OOPS"; stderr="bad"
     monkeypatch.setattr(cfgmod.subprocess, "run", lambda *a, **k: R)
@@ -36,3 +39,34 @@ def test_load_cfg_validation_ko(monkeypatch, tmp_path):
     with pytest.raises(ValueError) as ei:
         cfgmod.load_cfg(y, schema_path=tmp_path / "schema.json")
     assert "ne respecte pas le schéma" in str(ei.value)
+
+SCHEMA_META = '{"type": "object", "required": ["meta"], "properties": {"meta": {"type": "object", "required": ["id"]}}}'
+
+@pytest.mark.skipif(cfgmod._validation is None, reason="moteur_jeu/jsonschema absents")
+def test_load_cfg_validation_en_process_ok(monkeypatch, tmp_path):
+    y = tmp_path / "ok.yaml"
+    y.write_text("meta:\n  id: ok\n", encoding="utf-8")
+    s = tmp_path / "schema.json"
+    s.write_text(SCHEMA_META, encoding="utf-8")
+
+    def _interdit(*a, **k):
+        raise AssertionError("pas de sous-processus attendu")
+    monkeypatch.setattr(cfgmod.subprocess, "run", _interdit)
+
+    assert cfgmod.load_cfg(y, schema_path=s)["meta"]["id"] == "ok"
+    # même schéma: même validateur compilé
+    v = cfgmod._validation.validateur_pour(s)
+    assert cfgmod._validation.validateur_pour(s) is v
+
+@pytest.mark.skipif(cfgmod._validation is None, reason="moteur_jeu/jsonschema absents")
+def test_load_cfg_validation_en_process_ko(tmp_path):
+    y = tmp_path / "ko.yaml"
+    y.write_text("meta:\n  nom: ko\n", encoding="utf-8")
+    s = tmp_path / "schema.json"
+    s.write_text(SCHEMA_META, encoding="utf-8")
+
+    with pytest.raises(ValueError) as ei:
+        cfgmod.load_cfg(y, schema_path=s)
+    msg = str(ei.value)
+    assert "ne respecte pas le schéma" in msg
+    assert "ko.yaml::$.meta: 'id' is a required property" in msg
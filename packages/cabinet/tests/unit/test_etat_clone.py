@@ -0,0 +1,89 @@
+# packages/cabinet/tests/unit/test_etat_clone.py
+from __future__ import annotations
+from cabinet.moteur.factories import construire_etat
+
+def _etat_de_base():
+    cfg = {
+        "axes_tension": [
+            {"id": "sante", "valeur": 5, "seuil_crise": 2, "poids": 1.0},
+            {"id": "securite", "valeur": 5, "seuil_crise": 2, "poids": 1.0},
+        ],
+        "economie_initiale": {
+            "taux_impot_part": 0.20,
+            "taux_impot_ent": 0.20,
+            "taux_redevances": 0.00,
+            "taux_interet": 0.02,
+            "base_part": 0,
+            "base_ent": 0,
+            "base_ressources": 0,
+            "depenses_postes": {"sante": 10},
+            "dette": 0,
+            "capacite_max": 3,
+            "efficience": 1.0,
+        },
+        "joueurs": {
+            "J1": {"nom": "J1", "capital": 1, "main": ["C001"]},
+            "J2": {"nom": "J2", "capital": 1, "main": ["C002"]},
+        },
+        "deck_global": {"pioche": ["C003", "C004"], "defausse": []},
+        "historiques": [{"tour": 0, "evt": "debut"}],
+        "cartes_def": {"C001": {"type": "mesure", "effets": {"sante": 1}}},
+    }
+    return construire_etat(cfg)
+
+def test_clone_partage_tout_avant_ecriture():
+    e = _etat_de_base()
+    c = e.clone()
+    assert c == e
+    assert c.axes is e.axes and c.joueurs is e.joueurs
+    assert c.cartes_def is e.cartes_def and c.historiques is e.historiques
+
+def test_axe_mut_ne_copie_que_l_axe_modifie():
+    e = _etat_de_base()
+    c = e.clone()
+    c.axe_mut("sante").valeur = 9
+    assert e.axes["sante"].valeur == 5
+    assert c.axes["securite"] is e.axes["securite"]
+    # seconde écriture: l'axe est déjà à nous, pas de nouvelle copie
+    axe = c.axes["sante"]
+    assert c.axe_mut("sante") is axe
+
+def test_joueur_mut_isole_la_main():
+    e = _etat_de_base()
+    c = e.clone()
+    c.joueur_mut("J1").main.append(c.deck_global_mut().pioche.popleft())
+    assert c.joueurs["J1"].main == ["C001", "C003"]
+    assert e.joueurs["J1"].main == ["C001"]
+    assert list(e.deck_global.pioche) == ["C003", "C004"]
+    assert c.joueurs["J2"] is e.joueurs["J2"]
+
+def test_original_protege_apres_clone():
+    e = _etat_de_base()
+    c = e.clone()
+    e.eco_mut().depenses_postes["sante"] = 0
+    e.tour += 1
+    assert c.eco.depenses_postes["sante"] == 10
+    assert c.tour == e.tour - 1
+
+def test_historiques_prefixe_partage():
+    e = _etat_de_base()
+    c = e.clone()
+    c.historiques_mut().append({"tour": 1, "evt": "vote"})
+    assert len(e.historiques) == 1 and len(c.historiques) == 2
+    assert c.historiques[0] is e.historiques[0]
+
+def test_branches_successives():
+    e = _etat_de_base()
+    b1 = e.clone()
+    b2 = b1.clone()
+    b2.axe_mut("sante").valeur = 1
+    b1.axe_mut("sante").valeur = 7
+    assert [x.axes["sante"].valeur for x in (e, b1, b2)] == [5, 7, 1]
+
+def test_copie_profonde_independante():
+    e = _etat_de_base()
+    c = e.copie_profonde()
+    c.cartes_def["C001"]["effets"]["sante"] = 3
+    c.axes["sante"].valeur = 0
+    assert e.cartes_def["C001"]["effets"]["sante"] == 1
+    assert e.axes["sante"].valeur == 5
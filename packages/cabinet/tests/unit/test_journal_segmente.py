@@ -0,0 +1,71 @@
+# packages/cabinet/tests/unit/test_journal_segmente.py
+from __future__ import annotations
+import pickle
+import pytest
+from moteur_jeu.journal import JournalSegmente
+from moteur_jeu.moteur import Evenement, nouvelle_pile
+
+def _entrees(n):
+    return [{"i": i, "action": {"type": "a", "payload": {"k": [i, str(i)]}}} for i in range(n)]
+
+def _journal(n=23):
+    # fenêtre 4, segments de 5: 23 entrées -> 3 segments froids + 8 chaudes
+    return JournalSegmente(_entrees(n), fenetre=4, taille_segment=5)
+
+def test_segments_froids_et_fenetre_chaude():
+    j = _journal()
+    assert len(j) == 23 and len(j._segments) == 3 and len(j._chaud) == 8
+    assert all(isinstance(s[2], bytes) for s in j._segments)
+
+def test_index_positif_negatif_et_hors_bornes():
+    j, ref = _journal(), _entrees(23)
+    for i in range(-23, 23):
+        assert j[i] == ref[i], i
+    for i in (23, -24):
+        with pytest.raises(IndexError):
+            j[i]
+
+@pytest.mark.parametrize("tranche", [
+    slice(None), slice(3, 17), slice(-9, None), slice(-20, -2), slice(None, None, 3),
+    slice(1, 22, 4), slice(None, None, -1), slice(18, 2, -3), slice(-1, -30, -7), slice(30, 40),
+])
+def test_tranches(tranche):
+    assert _journal()[tranche] == _entrees(23)[tranche]
+
+def test_iteration_a_cheval_sur_froid_et_chaud():
+    j, ref = _journal(), _entrees(23)
+    assert list(j) == ref
+    assert list(j.iter_depuis(12, 19)) == ref[12:19]  # fin du dernier segment -> chaud
+    assert list(j.iter_depuis(3, 11)) == ref[3:11]  # deux segments froids
+    assert j.derniers(10) == ref[-10:]
+    vus = []
+    for e in j.iter_depuis(20):  # fin figée à l'appel
+        vus.append(e["i"])
+        j.append({"i": -1})
+    assert vus == [20, 21, 22]
+
+def test_egalite_avec_une_liste():
+    j, ref = _journal(), _entrees(23)
+    assert j == ref and ref == j and j == tuple(ref)
+    assert j != ref[:-1] and j != ref[:-1] + [{"i": 99}]
+    assert j == _journal() and j != "journal"
+
+def test_pickle_aller_retour():
+    j = _journal()
+    j[1]  # cache de segment rempli: non picklé
+    copie = pickle.loads(pickle.dumps(j))
+    assert copie._cache is None and copie == j
+    copie.append({"i": 23})
+    assert len(copie) == 24 and len(j) == 23
+
+def test_pile_d_evenements_encodee():
+    evts = [Evenement("e", {"n": i}, ts=float(i)) for i in range(600)]  # > fenêtre + segment
+    pile = nouvelle_pile(evts)
+    assert pile._segments and list(pile) == evts
+    assert pickle.loads(pickle.dumps(pile)) == evts
+
+def test_entrees_non_json_gardees_telles_quelles():
+    entrees = [{"i": i, "cles": {1: "un"}, "paire": (i, i)} for i in range(12)]
+    j = JournalSegmente(entrees, fenetre=2, taille_segment=5)
+    assert j._segments and not any(isinstance(s[2], bytes) for s in j._segments)
+    assert list(j) == entrees and j[0]["paire"] == (0, 0) and j[0]["cles"] == {1: "un"}
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import Any, TypedDict, Optional
 from .persistence import save_engine, load_engine, append_event, now_iso
 
-from moteur_jeu import Moteur, Action, Joueur
+from moteur_jeu import Moteur, Action
 
 
 class ActionSpec(TypedDict, total=False):
@@ -21,17 +21,28 @@ class FiltreActions(TypedDict, total=False):
 
 
 # helper souple: tente d’extraire les actions depuis etat._cfg si présent
-def _extract_actions_from_cfg(cfg: dict) -> list[ActionSpec]:
+def _extract_actions_from_cfg(cfg: Any) -> list[ActionSpec]:
     actions = []
-    # formalisme probable: cfg["actions"] = [{id/nom/phase/roles/params/cout_attention}, ...]
-    for a in cfg.get("actions", []):
+    # ReglesConfig (moteur): cfg.actions = {id: {name, attention_cost,
+    # allowed_phases, preconditions...}}; sinon dict brut, cfg["actions"] = [...]
+    if hasattr(cfg, "actions"):
+        items = list(cfg.actions.values())
+    else:
+        items = cfg.get("actions", [])
+    for a in items:
+        phases = a.get("allowed_phases") or []
+        role_requis = (a.get("preconditions") or {}).get("requires_role")
         spec: ActionSpec = {
             "id": a.get("id") or a.get("type") or a.get("nom") or "action",
-            "nom": a.get("nom") or a.get("id"),
+            "nom": a.get("nom") or a.get("name") or a.get("id"),
             "description": a.get("description", ""),
-            "cout_attention": int(a.get("cout_attention", 1)),
-            "phase": a.get("phase", ""),
-            "roles": a.get("roles", []) or a.get("role", []),
+            "cout_attention": int(
+                a.get("cout_attention", a.get("attention_cost", 1))
+            ),
+            "phase": a.get("phase") or (phases[0] if len(phases) == 1 else ""),
+            "roles": a.get("roles", [])
+            or a.get("role", [])
+            or ([role_requis] if role_requis else []),
             "params": a.get("params", {}) or a.get("payload_schema", {}),
         }
         actions.append(spec)
@@ -51,23 +62,18 @@ class SessionLocale:
     def charger_regles(self, chemin_yaml: str) -> None:
         self._ensure_loaded()
         self.engine.charger_regles_yaml(chemin_yaml)
-        save_engine(self.engine)
+        save_engine(self.engine, meta={"regles": chemin_yaml}, instantane=True)
         append_event(
             {"ts": now_iso(), "type": "charger_regles", "fichier": chemin_yaml}
         )
 
     # --- joueurs -------------------------------------------------------------
     def ajouter_joueur(self, nom: str, role: str | None = None) -> None:
-        """Ton moteur n’a pas d’API add; on modifie l’état proprement."""
+        """Ajout journalisé par le moteur (rejoué par la vérification)."""
         self._ensure_loaded()
-        import uuid
-
-        etat = self.engine.etat
-        jid = str(uuid.uuid4())
-        j = Joueur(id=jid, nom=nom, role=role or "citoyen")
-        etat.joueurs[jid] = j
-        etat.scores[jid] = 0
-        save_engine(self.engine)
+        j = self.engine.ajouter_joueur(nom, role or "citoyen")
+        jid = j.id
+        save_engine(self.engine, instantane=True)
         append_event(
             {
                 "ts": now_iso(),
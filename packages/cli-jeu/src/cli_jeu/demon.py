@@ -0,0 +1,163 @@
+"""Démon local: garde le Moteur en mémoire, la CLI n'en est plus qu'un client.
+
+    avpol demon &            # sert .avpol/daemon.sock
+    avpol jouer Alice ...    # relayé au démon s'il répond, sinon local
+    avpol demon --arreter
+
+Protocole: une ligne JSON par commande sur la socket Unix, {"argv": [...]},
+et une ligne JSON en retour, {"code": int, "sortie": str, "erreurs": str}.
+Une connexion peut enchaîner plusieurs commandes (avpol batch).
+
+Ce module n'importe ni typer ni le moteur côté client: une commande relayée
+ne paie que le démarrage de Python.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# même dossier que persistence.BASE (non importé: il charge le moteur)
+SOCKET = Path(".avpol") / "daemon.sock"
+
+# commandes jamais relayées: elles gèrent elles-mêmes le démon, ou ne lisent
+# que des fichiers (journal, dont --follow ne rendrait jamais la main)
+LOCALES = {"demon", "batch", "journal"}
+
+# vrai dans le processus du démon (batch n'y rappelle pas la socket)
+dans_le_demon = False
+
+
+def executer(argv: List[str]) -> Dict[str, Any]:
+    """Exécute une commande avpol dans ce processus, sortie capturée."""
+    import click
+
+    from .main import app, oublier_session
+
+    sortie, erreurs = io.StringIO(), io.StringIO()
+    code = 0
+    with contextlib.redirect_stdout(sortie), contextlib.redirect_stderr(erreurs):
+        try:
+            resultat = app(args=list(argv), prog_name="avpol", standalone_mode=False)
+            code = resultat if isinstance(resultat, int) else 0
+        except click.exceptions.Exit as ex:
+            code = ex.exit_code
+        except click.ClickException as ex:
+            ex.show(file=erreurs)
+            code = ex.exit_code
+        except click.exceptions.Abort:
+            code = 1
+        except Exception as ex:  # RuntimeError, ValueError... de la session
+            print(f"Erreur: {ex}", file=erreurs)
+            code = 1
+            # l'état en mémoire a pu diverger du disque: relu au prochain appel
+            oublier_session()
+    return {"code": code, "sortie": sortie.getvalue(), "erreurs": erreurs.getvalue()}
+
+
+class Connexion:
+    """Client de la socket du démon (plusieurs commandes par connexion)."""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._fichier = sock.makefile("rwb")
+
+    def envoyer(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        self._fichier.write(json.dumps(message).encode() + b"\n")
+        self._fichier.flush()
+        ligne = self._fichier.readline()
+        if not ligne:
+            raise ConnectionError("le démon a fermé la connexion")
+        return json.loads(ligne)
+
+    def commande(self, argv: List[str]) -> Dict[str, Any]:
+        return self.envoyer({"argv": list(argv)})
+
+    def fermer(self) -> None:
+        self._fichier.close()
+        self._sock.close()
+
+    def __enter__(self) -> "Connexion":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+
+def joindre(chemin: Path = SOCKET) -> Optional[Connexion]:
+    """Connexion au démon, ou None s'il ne tourne pas (socket absente/morte)."""
+    if dans_le_demon or not chemin.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(chemin))
+    except OSError:
+        sock.close()
+        return None
+    return Connexion(sock)
+
+
+def servir(chemin: Path = SOCKET) -> None:
+    """Boucle du démon: une connexion à la fois, les commandes en série."""
+    global dans_le_demon
+    if joindre(chemin) is not None:
+        raise RuntimeError(f"un démon répond déjà sur {chemin}")
+    chemin.parent.mkdir(exist_ok=True)
+    chemin.unlink(missing_ok=True)  # socket d'un démon mort
+    serveur = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    serveur.bind(str(chemin))
+    os.chmod(chemin, 0o600)
+    serveur.listen()
+    dans_le_demon = True
+    try:
+        while True:
+            sock, _ = serveur.accept()
+            with sock, sock.makefile("rwb") as f:
+                if not _traiter(f):
+                    return
+    finally:
+        dans_le_demon = False
+        serveur.close()
+        chemin.unlink(missing_ok=True)
+
+
+def _traiter(f) -> bool:
+    # False: demande d'arrêt
+    for ligne in f:
+        try:
+            message = json.loads(ligne)
+        except ValueError:
+            reponse = {"code": 2, "sortie": "", "erreurs": "requête illisible\n"}
+        else:
+            if message.get("arret"):
+                f.write(b'{"code": 0, "sortie": "", "erreurs": ""}\n')
+                f.flush()
+                return False
+            reponse = executer(message.get("argv") or [])
+        f.write(json.dumps(reponse, ensure_ascii=False).encode() + b"\n")
+        f.flush()
+    return True
+
+
+def afficher(reponse: Dict[str, Any]) -> int:
+    sys.stdout.write(reponse.get("sortie", ""))
+    sys.stderr.write(reponse.get("erreurs", ""))
+    return int(reponse.get("code", 1))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée `avpol`: relaie au démon s'il tourne, sinon exécute."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] not in LOCALES and not argv[0].startswith("-"):
+        connexion = joindre()
+        if connexion is not None:
+            with connexion:
+                sys.exit(afficher(connexion.commande(argv)))
+    from .main import app
+
+    app(args=argv, prog_name="avpol")
@@ -0,0 +1,253 @@
+"""Lecture de .avpol/journal.jsonl sans le charger en entier.
+
+- dernieres_lignes: lit le fichier par blocs depuis la fin;
+- suivre: rend les lignes ajoutées ensuite (avpol journal --follow);
+- IndexJournal: index journal.idx (position, type, joueur) pour filtrer.
+
+L'index est tenu à jour à la lecture: seules les lignes ajoutées depuis
+la dernière lecture sont analysées. Le premier passage sur un journal
+ancien le lit une fois en entier, les suivants non.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: index sans verrou
+    fcntl = None
+
+BLOC = 64 * 1024
+
+# en-tête: magique, version, position du journal couverte par l'index et
+# nombre d'enregistrements (au-delà: écriture interrompue, ignorée)
+_ENTETE = struct.Struct("<4sIQQ")
+_MAGIQUE = b"AVJI"
+_VERSION = 1
+# un enregistrement par ligne: position, crc32 du type, du joueur, de son id
+_ENREG = struct.Struct("<QIII")
+_PAR_LECTURE = 65536  # enregistrements relus d'un coup en remontant
+
+
+def dernieres_lignes(
+    chemin: Path, n: int, bloc: int = BLOC
+) -> Tuple[List[bytes], int]:
+    """Les n dernières lignes complètes, et la position qui suit la dernière.
+
+    Une ligne sans fin de ligne (écriture en cours) est laissée de côté:
+    suivre() la rendra une fois complète.
+    """
+    with open(chemin, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        morceaux: List[bytes] = []
+        sauts = 0
+        # n + 1 fins de ligne: la première ligne retenue est alors entière
+        while pos > 0 and sauts <= n:
+            lu = min(bloc, pos)
+            pos -= lu
+            f.seek(pos)
+            morceau = f.read(lu)
+            morceaux.append(morceau)
+            sauts += morceau.count(b"\n")
+    donnees = b"".join(reversed(morceaux))
+    coupe = donnees.rfind(b"\n") + 1
+    fin = pos + coupe
+    lignes = donnees[:coupe].split(b"\n")[:-1]
+    if pos > 0:
+        lignes = lignes[1:]  # début de ligne tronqué par le dernier bloc
+    return [l for l in lignes if l][-n:] if n > 0 else [], fin
+
+
+def suivre(chemin: Path, position: int, intervalle: float = 0.5) -> Iterator[bytes]:
+    """Rend les lignes écrites après `position`, indéfiniment (tail -f)."""
+    tampon = b""
+    while True:
+        try:
+            taille = os.path.getsize(chemin)
+        except FileNotFoundError:
+            taille = 0
+        if taille < position:  # journal tronqué ou recréé: on repart du début
+            position, tampon = 0, b""
+        if taille == position:
+            time.sleep(intervalle)
+            continue
+        with open(chemin, "rb") as f:
+            f.seek(position)
+            tampon += f.read(taille - position)
+        position = taille
+        *lignes, tampon = tampon.split(b"\n")
+        for ligne in lignes:
+            if ligne:
+                yield ligne
+
+
+def _crc(valeur: Any) -> int:
+    return zlib.crc32(str(valeur).encode()) if valeur else 0
+
+
+def correspond(
+    evt: Dict[str, Any], type_: Optional[str] = None, joueur: Optional[str] = None
+) -> bool:
+    """Filtre exact: type d'événement, joueur (nom ou id)."""
+    if type_ and evt.get("type") != type_:
+        return False
+    if joueur and joueur not in (evt.get("joueur"), evt.get("joueur_id")):
+        return False
+    return True
+
+
+def _decoder(ligne: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        evt = json.loads(ligne)
+    except ValueError:
+        return None
+    return evt if isinstance(evt, dict) else None
+
+
+def ligne_correspond(
+    ligne: bytes, type_: Optional[str] = None, joueur: Optional[str] = None
+) -> bool:
+    if not (type_ or joueur):
+        return True
+    evt = _decoder(ligne)
+    return evt is not None and correspond(evt, type_, joueur)
+
+
+class IndexJournal:
+    """Index journal.idx à côté du journal: un enregistrement de 20 octets
+    par ligne, parcouru depuis la fin pour trouver les n dernières lignes
+    d'un type ou d'un joueur sans relire le journal."""
+
+    def __init__(self, journal: Path, chemin: Optional[Path] = None):
+        self.journal = Path(journal)
+        self.chemin = Path(chemin) if chemin else self.journal.with_suffix(".idx")
+
+    @contextmanager
+    def _ouvert(self) -> Iterator[Any]:
+        with open(self.chemin, "a+b") as f:
+            if fcntl is not None:
+                # deux `avpol journal` simultanés ne complètent pas l'index ensemble
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _lire_entete(self, f) -> Tuple[int, int]:
+        f.seek(0)
+        entete = f.read(_ENTETE.size)
+        if len(entete) < _ENTETE.size:
+            return -1, 0
+        magique, version, couvert, nombre = _ENTETE.unpack(entete)
+        if magique != _MAGIQUE or version != _VERSION:
+            return -1, 0
+        return couvert, nombre
+
+    def mettre_a_jour(self) -> Tuple[int, int]:
+        """Indexe les lignes ajoutées depuis.
+
+        Retourne la position couverte du journal et le nombre de lignes.
+        """
+        with self._ouvert() as f:
+            couvert, nombre = self._lire_entete(f)
+            taille = os.path.getsize(self.journal)
+            if couvert < 0 or couvert > taille:
+                # index absent, illisible ou journal tronqué: on repart de zéro
+                couvert, nombre = 0, 0
+            f.truncate(_ENTETE.size + nombre * _ENREG.size)
+            if couvert == taille:
+                if nombre == 0:
+                    self._ecrire_entete(couvert, nombre)
+                return couvert, nombre
+            with open(self.journal, "rb") as j:
+                j.seek(couvert)
+                for ligne in j:
+                    if not ligne.endswith(b"\n"):
+                        break  # écriture en cours: indexée la prochaine fois
+                    evt = _decoder(ligne) or {}
+                    f.write(
+                        _ENREG.pack(
+                            couvert,
+                            _crc(evt.get("type")),
+                            _crc(evt.get("joueur")),
+                            _crc(evt.get("joueur_id")),
+                        )
+                    )
+                    couvert += len(ligne)
+                    nombre += 1
+            f.flush()
+            self._ecrire_entete(couvert, nombre)
+            return couvert, nombre
+
+    def _ecrire_entete(self, couvert: int, nombre: int) -> None:
+        # "a+b" écrit toujours en fin de fichier: l'en-tête passe par r+b
+        with open(self.chemin, "r+b") as e:
+            e.write(_ENTETE.pack(_MAGIQUE, _VERSION, couvert, nombre))
+
+    def chercher(
+        self,
+        n: int,
+        type_: Optional[str] = None,
+        joueur: Optional[str] = None,
+    ) -> Tuple[List[bytes], int]:
+        """Les n dernières lignes qui correspondent, et la position couverte."""
+        couvert, nombre = self.mettre_a_jour()
+        h_type, h_joueur = _crc(type_), _crc(joueur)
+        trouvees: List[bytes] = []
+        with open(self.chemin, "rb") as f, open(self.journal, "rb") as j:
+            fin = nombre
+            while fin > 0 and len(trouvees) < n:
+                debut = max(0, fin - _PAR_LECTURE)
+                f.seek(_ENTETE.size + debut * _ENREG.size)
+                champs = array("I", f.read((fin - debut) * _ENREG.size))
+                if sys.byteorder == "big":
+                    champs.byteswap()
+                # colonnes: position (2 mots), type, joueur, id du joueur
+                types, noms, ids = champs[2::5], champs[3::5], champs[4::5]
+                if h_type:
+                    rangs = _rangs(types, h_type)
+                elif h_joueur:
+                    rangs = sorted(
+                        set(_rangs(noms, h_joueur)) | set(_rangs(ids, h_joueur)),
+                        reverse=True,
+                    )
+                else:
+                    rangs = range(len(types) - 1, -1, -1)
+                for k in rangs:
+                    if h_joueur and h_joueur not in (noms[k], ids[k]):
+                        continue
+                    # crc32: une collision reste possible, on vérifie la ligne
+                    j.seek(champs[5 * k] | champs[5 * k + 1] << 32)
+                    ligne = j.readline().rstrip(b"\n")
+                    if ligne_correspond(ligne, type_, joueur):
+                        trouvees.append(ligne)
+                        if len(trouvees) == n:
+                            break
+                fin = debut
+        trouvees.reverse()
+        return trouvees, couvert
+
+
+def _rangs(colonne: array, valeur: int) -> List[int]:
+    """Rangs où la colonne vaut `valeur`, du dernier au premier (rfind en C)."""
+    octets = colonne.tobytes()
+    motif = array("I", [valeur]).tobytes()
+    rangs = []
+    i = len(octets)
+    while (i := octets.rfind(motif, 0, i)) != -1:
+        if i % 4 == 0:  # aligné sur une valeur, pas à cheval sur deux
+            rangs.append(i // 4)
+        else:
+            i += 3  # un alignement plus loin peut encore correspondre
+    return rangs
@@ -1,9 +1,29 @@
 import json
+import shlex
+from pathlib import Path
+
 import typer
 from .adaptateur import SessionLocale
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
+# une session par processus: en démon ou en batch, le moteur chargé sert
+# à toutes les commandes suivantes
+_session_courante: SessionLocale | None = None
+
+
+def _session() -> SessionLocale:
+    global _session_courante
+    if _session_courante is None:
+        _session_courante = SessionLocale()
+    return _session_courante
+
+
+def oublier_session() -> None:
+    """La prochaine commande relira la partie depuis .avpol/."""
+    global _session_courante
+    _session_courante = None
+
 
 @app.command("init-partie")
 def init_partie(
@@ -11,21 +31,21 @@ def init_partie(
         ..., "--joueur", "-j", help="Nom de joueur (option répétable)"
     ),
 ):
-    s = SessionLocale()
+    s = _session()
     s.nouvelle_partie(joueur)
     typer.echo(f"✅ Partie initialisée avec: {', '.join(joueur)}")
 
 
 @app.command("charger-regles")
 def charger_regles(path: str = typer.Argument(..., help="Chemin YAML des règles")):
-    s = SessionLocale()
+    s = _session()
     s.charger_regles(path)
     typer.echo(f"📜 Règles chargées depuis {path}")
 
 
 @app.command("ajouter-joueur")
 def ajouter_joueur(nom: str, role: str = typer.Option("citoyen", "--role", "-R")):
-    s = SessionLocale()
+    s = _session()
     s.ajouter_joueur(nom, role)
     typer.echo(f"👤 Joueur « {nom} » ajouté (role={role}).")
 
@@ -40,7 +60,7 @@ def actions(
     ),
     json_only: bool = typer.Option(False, "--json", help="Sortie JSON brute"),
 ):
-    s = SessionLocale()
+    s = _session()
     filtre = {}
     if joueur:
         filtre["joueur"] = joueur
@@ -78,7 +98,7 @@ def actions(
 def jouer(
     auteur: str, action: str, param: list[str] = typer.Option([], "--param", "-p")
 ):
-    s = SessionLocale()
+    s = _session()
     kv = {}
     for p in param:
         if "=" not in p:
@@ -91,7 +111,7 @@ def jouer(
 
 @app.command("tour")
 def tour():
-    s = SessionLocale()
+    s = _session()
     s.tour_suivant()
     e = s.etat_public()
     typer.echo(f"🔁 Nouveau tour = {e['tour']} (tension={e['tension']})")
@@ -99,7 +119,7 @@ def tour():
 
 @app.command("etat")
 def etat(json_only: bool = typer.Option(False, "--json")):
-    s = SessionLocale()
+    s = _session()
     e = s.etat_public()
     if json_only:
         typer.echo(json.dumps(e, ensure_ascii=False, indent=2))
@@ -112,12 +132,105 @@ def etat(json_only: bool = typer.Option(False, "--json")):
 
 
 @app.command("journal")
-def journal(n: int = typer.Option(25, "--n")):
-    from pathlib import Path
+def journal(
+    n: int = typer.Option(25, "--n"),
+    follow: bool = typer.Option(
+        False, "--follow", "-f", help="Afficher les lignes ajoutées ensuite"
+    ),
+    type_: str = typer.Option("", "--type", "-t", help="Type d'événement"),
+    joueur: str = typer.Option("", "--joueur", "-j", help="Joueur (nom ou id)"),
+):
+    from . import journal as jl
 
     p = Path(".avpol/journal.jsonl")
     if not p.exists():
         typer.echo("Aucun journal.")
         raise typer.Exit(0)
-    for line in p.read_text(encoding="utf-8").splitlines()[-n:]:
-        typer.echo(line)
+    # lecture depuis la fin; index journal.idx seulement pour filtrer
+    if type_ or joueur:
+        lignes, position = jl.IndexJournal(p).chercher(n, type_, joueur)
+    else:
+        lignes, position = jl.dernieres_lignes(p, n)
+    for line in lignes:
+        typer.echo(line.decode("utf-8"))
+    if not follow:
+        return
+    try:
+        for line in jl.suivre(p, position):
+            if jl.ligne_correspond(line, type_, joueur):
+                typer.echo(line.decode("utf-8"))
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("demon")
+def demon(
+    arreter: bool = typer.Option(False, "--arreter", help="Arrêter le démon"),
+):
+    """Garde la partie en mémoire et sert les commandes sur .avpol/daemon.sock."""
+    from . import demon as d
+
+    if arreter:
+        connexion = d.joindre()
+        if connexion is None:
+            typer.echo("Aucun démon en cours.")
+            raise typer.Exit(1)
+        with connexion:
+            connexion.envoyer({"arret": True})
+        typer.echo("🛑 Démon arrêté.")
+        return
+    if d.dans_le_demon:
+        raise typer.BadParameter("déjà dans le démon")
+    typer.echo(f"🔌 Démon à l'écoute sur {d.SOCKET} (Ctrl-C pour arrêter)")
+    try:
+        d.servir()
+    except RuntimeError as ex:
+        typer.echo(str(ex), err=True)
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("batch")
+def batch(
+    fichier: Path = typer.Argument(
+        ..., help="Une commande avpol par ligne (# commentaire)"
+    ),
+    continuer: bool = typer.Option(
+        False, "--continuer", help="Poursuivre après une commande en erreur"
+    ),
+):
+    """Exécute un fichier de commandes dans un seul processus (ou via le démon)."""
+    from . import demon as d
+
+    lignes = []
+    for num, ligne in enumerate(fichier.read_text(encoding="utf-8").splitlines(), 1):
+        argv = shlex.split(ligne, comments=True)
+        if argv and argv[0] == "avpol":
+            argv = argv[1:]
+        if not argv:
+            continue
+        if argv[0] in ("demon", "batch"):
+            raise typer.BadParameter(f"ligne {num}: '{argv[0]}' interdit en batch")
+        lignes.append((num, argv))
+
+    connexion = d.joindre()
+    echecs = 0
+    try:
+        for num, argv in lignes:
+            if connexion is not None:
+                reponse = connexion.commande(argv)
+            else:
+                reponse = d.executer(argv)
+            code = d.afficher(reponse)
+            if code:
+                echecs += 1
+                commande = shlex.join(argv)
+                typer.echo(f"✗ ligne {num}: {commande} (code {code})", err=True)
+                if not continuer:
+                    break
+    finally:
+        if connexion is not None:
+            connexion.fermer()
+    if echecs:
+        raise typer.Exit(1)
@@ -5,26 +5,74 @@ import datetime
 from pathlib import Path
 from typing import Any
 
+from moteur_jeu import Moteur
+from moteur_jeu.persistence import (
+    JournalEcriture,
+    chemin_wal,
+    charger,
+    etat_from_dict,
+    rejouer_wal,
+)
+
 BASE = Path(".avpol")
 BASE.mkdir(exist_ok=True)
-SESSION = BASE / "session.pkl"
+# instantané binaire + journal d'écriture (session.avp.wal) ; chaque action ou
+# tour n'ajoute qu'une ligne au WAL, l'instantané est réécrit tous les N coups
+SNAPSHOT = BASE / "session.avp"
+SESSION = BASE / "session.pkl"  # ancien format (pickle complet), migré au chargement
 JOURNAL = BASE / "journal.jsonl"
 
+_ecriture: JournalEcriture | None = None
+
 
 def now_iso() -> str:
     return datetime.datetime.now(datetime.timezone.utc).isoformat()
 
 
-def save_engine(engine: Any) -> None:
-    with SESSION.open("wb") as f:
-        pickle.dump(engine, f)
+def _suivre(engine: Any, meta: dict | None = None) -> JournalEcriture:
+    global _ecriture
+    if _ecriture is not None:
+        _ecriture.detacher()
+    _ecriture = JournalEcriture(str(SNAPSHOT), meta=meta).attacher(engine)
+    return _ecriture
+
+
+def save_engine(
+    engine: Any, meta: dict | None = None, instantane: bool = False
+) -> None:
+    """Persiste la session.
+
+    Les actions et tours sont déjà dans le WAL (l'écriture est abonnée au
+    journal du moteur) : sans `instantane`, il n'y a rien à réécrire. Les
+    modifications hors journal (joueurs, règles) demandent un instantané.
+    """
+    if _ecriture is None or _ecriture.moteur is not engine:
+        _suivre(engine, meta)
+        instantane = True
+    elif meta:
+        _ecriture.meta.update(meta)
+    if instantane:
+        _ecriture.instantane()
 
 
 def load_engine() -> Any | None:
+    if SNAPSHOT.exists():
+        data = charger(str(SNAPSHOT))
+        etat = etat_from_dict(data["etat"])
+        rejouer_wal(etat, chemin_wal(str(SNAPSHOT)))
+        engine = Moteur(etat=etat)
+        meta = data.get("meta") or {}
+        if meta.get("regles"):
+            engine.attacher_regles_yaml(meta["regles"])
+        _suivre(engine, meta)
+        return engine
     if not SESSION.exists():
         return None
     with SESSION.open("rb") as f:
-        return pickle.load(f)
+        engine = pickle.load(f)
+    engine.etat.__post_init__()  # listes -> journaux segmentés
+    save_engine(engine, instantane=True)
+    return engine
 
 
 def append_event(evt: dict) -> None:
@@ -0,0 +1,175 @@
+# packages/moteur-jeu/src/moteur_jeu/journal.py
+from __future__ import annotations
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+import json
+import zlib
+
+try:  # encodeur rapide optionnel, même format JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# --- Journal segmenté ---------------------------------------------------------
+#
+# Séquence append-only dont seule une fenêtre récente ("chaude") reste en mémoire
+# sous forme d'objets Python. Les entrées plus anciennes sont regroupées en
+# segments JSON compressés (zlib), décodés à la demande (le dernier segment lu
+# est gardé en cache).
+
+
+def _json_simple(lot: List[Any]) -> Optional[bytes]:
+    """lot encodé en JSON, ou None s'il ne se relirait pas à l'identique."""
+    try:
+        if orjson is not None:
+            brut = orjson.dumps(lot)
+        else:
+            brut = json.dumps(lot, ensure_ascii=False, separators=(",", ":"))
+            brut = brut.encode("utf-8")
+    except (TypeError, ValueError):  # objet non sérialisable, clé non str (orjson)
+        return None
+    relu = orjson.loads(brut) if orjson is not None else json.loads(brut)
+    # tuple relu en list, clé int relue en str (json): pas rendu tel quel
+    return brut if relu == lot else None
+
+
+class JournalSegmente(Sequence):
+    """Liste append-only à mémoire bornée (journal, pile d'événements).
+
+    S'utilise comme une liste en lecture (len, index, tranches, itération) ;
+    en écriture seuls append/extend sont permis. Les entrées froides sont
+    relues depuis leur segment : les muter n'a donc pas d'effet durable.
+
+    Les entrées (après `encoder`) doivent être du JSON simple : dict à clés
+    str, list, str, nombres, booléens, None. Un segment qui ne survit pas à
+    l'aller-retour JSON (tuple, clé int...) reste en objets Python, non
+    compressé, plutôt que d'être relu modifié.
+    """
+
+    def __init__(
+        self,
+        entrees: Iterable[Any] = (),
+        *,
+        fenetre: int = 256,
+        taille_segment: int = 256,
+        encoder: Optional[Callable[[Any], Any]] = None,
+        decoder: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.fenetre = fenetre
+        self.taille_segment = taille_segment
+        self.encoder = encoder
+        self.decoder = decoder
+        # segments froids: (index global de début, nb d'entrées, bytes | entrées)
+        self._segments: List[Tuple[int, int, Union[bytes, List[Any]]]] = []
+        self._debuts: List[int] = []
+        self._chaud: List[Any] = []
+        self._debut_chaud = 0
+        self._cache: Optional[Tuple[int, List[Any]]] = None
+        self.extend(entrees)
+
+    # --- écriture -------------------------------------------------------------
+    def append(self, entree: Any) -> None:
+        self._chaud.append(entree)
+        if len(self._chaud) >= self.fenetre + self.taille_segment:
+            self._deverser()
+
+    def extend(self, entrees: Iterable[Any]) -> None:
+        for e in entrees:
+            self.append(e)
+
+    def _deverser(self) -> None:
+        """Gèle les taille_segment plus anciennes entrées chaudes en un segment."""
+        n = self.taille_segment
+        lot, self._chaud = self._chaud[:n], self._chaud[n:]
+        enc = self.encoder
+        lot_enc = [enc(e) for e in lot] if enc else lot
+        stockage: Union[bytes, List[Any]] = lot
+        brut = _json_simple(lot_enc)
+        if brut is not None:
+            stockage = zlib.compress(brut, 6)
+        self._segments.append((self._debut_chaud, n, stockage))
+        self._debuts.append(self._debut_chaud)
+        self._debut_chaud += n
+
+    # --- lecture --------------------------------------------------------------
+    def _segment(self, k: int) -> List[Any]:
+        if self._cache is not None and self._cache[0] == k:
+            return self._cache[1]
+        _, _, stockage = self._segments[k]
+        if not isinstance(stockage, bytes):
+            return stockage  # segment resté en objets Python
+        brut = zlib.decompress(stockage)
+        items = orjson.loads(brut) if orjson is not None else json.loads(brut)
+        if self.decoder:
+            items = [self.decoder(d) for d in items]
+        self._cache = (k, items)
+        return items
+
+    def _lire(self, i: int) -> Any:
+        if i >= self._debut_chaud:
+            return self._chaud[i - self._debut_chaud]
+        k = bisect_right(self._debuts, i) - 1
+        return self._segment(k)[i - self._debuts[k]]
+
+    def __len__(self) -> int:
+        return self._debut_chaud + len(self._chaud)
+
+    def __getitem__(self, i):
+        n = len(self)
+        if isinstance(i, slice):
+            debut, fin, pas = i.indices(n)
+            if pas == 1:
+                return list(self.iter_depuis(debut, fin))
+            return [self._lire(k) for k in range(debut, fin, pas)]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("index hors du journal")
+        return self._lire(i)
+
+    def iter_depuis(self, debut: int = 0, fin: Optional[int] = None) -> Iterator[Any]:
+        """Itère les entrées [debut, fin), segment par segment.
+
+        fin est figée à l'appel (len courant par défaut) : les entrées ajoutées
+        pendant l'itération ne sont pas vues.
+        """
+        fin = len(self) if fin is None else min(fin, len(self))
+        i = max(0, debut)
+        while i < fin and i < self._debut_chaud:
+            k = bisect_right(self._debuts, i) - 1
+            items = self._segment(k)
+            base = self._debuts[k]
+            stop = min(fin, base + len(items))
+            yield from items[i - base : stop - base]
+            i = stop
+        while i < fin:
+            yield self._chaud[i - self._debut_chaud]
+            i += 1
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_depuis(0)
+
+    def derniers(self, n: int) -> List[Any]:
+        return list(self.iter_depuis(max(0, len(self) - n)))
+
+    # --- divers ---------------------------------------------------------------
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (JournalSegmente, list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"JournalSegmente(len={len(self)}, segments={len(self._segments)}, "
+            f"chaud={len(self._chaud)})"
+        )
+
+    def __getstate__(self):
+        d = dict(self.__dict__)
+        d["_cache"] = None
+        return d
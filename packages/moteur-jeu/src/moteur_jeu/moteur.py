@@ -1,11 +1,18 @@
 # packages/moteur-jeu/src/moteur_jeu/moteur.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+import copy
 import uuid
 import time
 import random
 
+from .journal import JournalSegmente
+
 # --- Événements --------------------------------------------------------------
 
 
@@ -16,6 +23,21 @@ class Evenement:
     ts: float = field(default_factory=lambda: time.time())
 
 
+def _evenement_vers_dict(e: Evenement) -> Dict[str, Any]:
+    return {"type": e.type, "donnees": e.donnees, "ts": e.ts}
+
+
+def _evenement_depuis_dict(d: Dict[str, Any]) -> Evenement:
+    return Evenement(type=d["type"], donnees=d["donnees"], ts=d.get("ts", 0.0))
+
+
+def nouvelle_pile(evts=()) -> JournalSegmente:
+    """Pile d'événements segmentée (les segments froids sont stockés en JSON)."""
+    return JournalSegmente(
+        evts, encoder=_evenement_vers_dict, decoder=_evenement_depuis_dict
+    )
+
+
 # --- Actions ----------------------------------------------------------------
 
 
@@ -24,6 +46,9 @@ class Action:
     type: str
     auteur_id: str
     payload: Dict[str, Any]
+    # préconditions déjà contrôlées par l'appelant, sans rien modifier depuis:
+    # la règle YAML ne les refait pas (jamais journalisé, faux au replay)
+    preconditions_verifiees: bool = field(default=False, compare=False, repr=False)
 
 
 # --- État du jeu -------------------------------------------------------------
@@ -52,7 +77,8 @@ class EtatJeu:
         "guerre": 0
     })
     joueurs: Dict[str, Joueur] = field(default_factory=dict)
-    pile_evenements: List[Evenement] = field(default_factory=list)
+    # journal/pile: fenêtre récente en mémoire, segments plus anciens compressés
+    pile_evenements: JournalSegmente = field(default_factory=nouvelle_pile)
     contentieux: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     # gestion de fin de partie
@@ -62,7 +88,7 @@ class EtatJeu:
     scores: Dict[str, int] = field(default_factory=dict)
 
     # journal des actions/événements
-    journal: List[Dict[str, Any]] = field(default_factory=list)
+    journal: JournalSegmente = field(default_factory=JournalSegmente)
 
     # Gestion des phases
     phase: str = "definition"
@@ -71,6 +97,26 @@ class EtatJeu:
     rng_seed: int = 42
     rng_calls: int = 0
 
+    # points de contrôle pour le replay: {"index": n, "etat": état compact + RNG}
+    points_controle: List[Dict[str, Any]] = field(default_factory=list)
+
+    # compteur de modifications (cf. toucher): versionnage optimiste côté API
+    version: int = 0
+
+    def __post_init__(self):
+        if not hasattr(self, "points_controle"):  # EtatJeu dépicklé d'avant
+            self.points_controle = []
+        # compat: listes fournies par etat_from_dict / anciens appels
+        if not isinstance(self.pile_evenements, JournalSegmente):
+            self.pile_evenements = nouvelle_pile(self.pile_evenements)
+        if not isinstance(self.journal, JournalSegmente):
+            self.journal = JournalSegmente(self.journal)
+
+    def toucher(self) -> int:
+        """Compte une modification de l'état (journalisée ou non)."""
+        self.version += 1
+        return self.version
+
     # --- Helpers tensions ---
     def _assurer_axes(self):
         """Si la tension est encore un int (ancien sauvegarde/YAML), la convertir en axes."""
@@ -89,6 +135,73 @@ class EtatJeu:
             return float(sum(self.tension.values()))
         return float(sum(self.tension.get(a, 0) * w for a, w in poids.items()))
 
+    # --- Helpers RNG ---
+    def rng_vivant(self) -> random.Random:
+        """Générateur courant, conservé entre les tirages.
+
+        S'il manque (ancienne sauvegarde sans rng_state) ou si rng_seed/rng_calls
+        ont été modifiés de l'extérieur, on le reconstruit une fois en rejouant
+        rng_calls tirages depuis rng_seed.
+        """
+        r = self.__dict__.get("_rng")
+        if r is not None and self.__dict__.get("_rng_pos") == (
+            self.rng_seed,
+            self.rng_calls,
+        ):
+            return r
+        r = random.Random(self.rng_seed)
+        for _ in range(self.rng_calls):
+            r.random()
+        self._rng = r
+        self._rng_pos = (self.rng_seed, self.rng_calls)
+        return r
+
+    def restaurer_rng(self, state: List[Any]) -> None:
+        """Réinstalle un état exact (cf. rng_etat) correspondant à rng_calls."""
+        version, interne, gauss = state
+        r = random.Random()
+        r.setstate((version, tuple(interne), gauss))
+        self._rng = r
+        self._rng_pos = (self.rng_seed, self.rng_calls)
+
+    def rng_random(self) -> float:
+        """Un tirage uniforme [0, 1) ; avance rng_calls."""
+        x = self.rng_vivant().random()
+        self.rng_calls += 1
+        self._rng_pos = (self.rng_seed, self.rng_calls)
+        return x
+
+    def rng_etat(self) -> List[Any]:
+        """État exact du générateur, sous forme JSON (listes)."""
+        version, interne, gauss = self.rng_vivant().getstate()
+        return [version, list(interne), gauss]
+
+    # --- Index des types d'événements ---
+    def empiler_evenements(self, evts: List[Evenement]) -> None:
+        self.pile_evenements.extend(evts)
+        self._index_evenements()
+
+    def _index_evenements(self) -> Dict[str, int]:
+        """Compteur {type: occurrences} de pile_evenements, tenu à jour par la fin.
+
+        Ne relit que les événements ajoutés depuis le dernier passage (y compris
+        ceux ajoutés directement à la pile) ; reconstruit si la pile a rétréci.
+        """
+        idx = self.__dict__.get("_types_evenements")
+        n = self.__dict__.get("_types_indexes", 0)
+        pile = self.pile_evenements
+        if idx is None or n > len(pile):
+            idx, n = {}, 0
+        if n < len(pile):
+            for e in pile[n:]:
+                idx[e.type] = idx.get(e.type, 0) + 1
+        self._types_evenements = idx
+        self._types_indexes = len(pile)
+        return idx
+
+    def compte_evenements(self, type_ev: str) -> int:
+        return self._index_evenements().get(type_ev, 0)
+
     def snapshot(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -96,7 +209,7 @@ class EtatJeu:
             "tension": self.tension,
             "joueurs": {jid: vars(j) for jid, j in self.joueurs.items()},
             "contentieux": self.contentieux,
-            "evenements": [vars(e) for e in self.pile_evenements[-10:]],
+            "evenements": [vars(e) for e in self.pile_evenements.derniers(10)],
             "partie_status": self.partie_status,
             "raison_fin": self.raison_fin,
             "max_tours": self.max_tours,
@@ -130,13 +243,59 @@ REGLES_PAR_DEFAUT: List[Regle] = [
 
 
 class Moteur:
+    # un point de contrôle (état compact + RNG) au plus toutes les N entrées
+    intervalle_points_controle: int = 100
+
     def __init__(
         self, etat: Optional[EtatJeu] = None, regles: Optional[List[Regle]] = None
     ):
         self.etat = etat or EtatJeu(id=str(uuid.uuid4()))
         self.regles = regles or REGLES_PAR_DEFAUT
+        # callbacks appelés avec chaque nouvelle entrée de journal
+        self._observateurs: List[Callable[[Dict[str, Any]], None]] = []
+        # joueur_id -> (cfg, signature des préconditions, actions jouables)
+        self._actions_legales: Dict[str, Tuple[Any, Tuple[Any, ...], List[str]]] = {}
         setattr(self.etat, "_moteur", self)
 
+    def __getstate__(self):
+        # les observateurs (fichiers, sockets, files d'attente) ne voyagent pas
+        d = dict(self.__dict__)
+        d["_observateurs"] = []
+        d["_actions_legales"] = {}  # cache: référence la config (non picklable)
+        return d
+
+    def abonner(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Appelle callback(entree) après chaque ajout au journal."""
+        if not hasattr(self, "_observateurs"):  # moteur dépicklé d'une vieille session
+            self._observateurs = []
+        self._observateurs.append(callback)
+
+    def desabonner(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        if callback in getattr(self, "_observateurs", []):
+            self._observateurs.remove(callback)
+
+    def _ajouter_au_journal(self, entree: Dict[str, Any]) -> None:
+        self.etat.journal.append(entree)
+        self.etat.toucher()
+        for cb in list(getattr(self, "_observateurs", [])):
+            cb(entree)
+
+    def _point_de_controle(self) -> None:
+        """Mémorise l'état si le dernier point de contrôle date d'au moins N entrées.
+
+        Appelé en tête d'appliquer_action/debut_nouveau_tour: aucun appel n'est
+        en cours, l'état correspond donc exactement à journal[:index].
+        """
+        pcs = self.etat.points_controle
+        n = len(self.etat.journal)
+        if pcs and n - pcs[-1]["index"] < self.intervalle_points_controle:
+            return
+        from .persistence import etat_to_dict
+
+        # copie profonde: etat_to_dict partage contentieux/tension/scores avec l'état
+        compact = copy.deepcopy(etat_to_dict(self.etat, historique=False))
+        pcs.append({"index": n, "etat": compact})
+
     @staticmethod
     def creer_partie(noms_joueurs: List[str]) -> "Moteur":
         etat = EtatJeu(id=str(uuid.uuid4()))
@@ -146,8 +305,14 @@ class Moteur:
             etat.scores[jid] = 0
         return Moteur(etat=etat)
 
-    def ajouter_joueur(self, nom: str, role: Optional[str] = None):
-        """Ajoute un joueur à chaud dans la partie (si non existant)."""
+    def ajouter_joueur(
+        self, nom: str, role: Optional[str] = None, joueur_id: Optional[str] = None
+    ):
+        """Ajoute un joueur à chaud dans la partie (si non existant).
+
+        L'arrivée est journalisée (_system_joueur_ajoute): le replay la refait,
+        avec le même id, au même endroit du journal.
+        """
         # refuse doublon par nom
         for j in self.etat.joueurs.values():
             if j.nom == nom:
@@ -163,13 +328,29 @@ class Moteur:
             else:
                 role = "saboteur"
 
-        jid = str(uuid.uuid4())
+        self._point_de_controle()
+        jid = joueur_id or str(uuid.uuid4())
         j = Joueur(id=jid, nom=nom, role=role, attention=3, score=0)
         self.etat.joueurs[jid] = j
+        self.etat.scores.setdefault(jid, 0)
+        ev = Evenement("joueur_ajoute", {"joueur_id": jid, "nom": nom, "role": role})
+        self.etat.empiler_evenements([ev])
+        self._ajouter_au_journal(
+            {
+                "ts": time.time(),
+                "tour": self.etat.tour,
+                "action": {
+                    "type": "_system_joueur_ajoute",
+                    "auteur_id": "_system",
+                    "payload": {"id": jid, "nom": nom, "role": role},
+                },
+                "evenements": [vars(ev)],
+            }
+        )
         return j
 
     def _journaliser(self, action: Action, evenements: List[Evenement]):
-        self.etat.journal.append(
+        self._ajouter_au_journal(
             {
                 "ts": time.time(),
                 "tour": self.etat.tour,
@@ -189,10 +370,12 @@ class Moteur:
             # NEW: scoring
             cfg = getattr(self.etat, "_cfg", None)
             if cfg:
+                from .regles_loader import evaluer_scores
+
                 evts_scores = evaluer_scores(self.etat, cfg)
-                self.etat.pile_evenements.extend(evts_scores)
+                self.etat.empiler_evenements(evts_scores)
                 # journalise
-                self.etat.journal.append(
+                self._ajouter_au_journal(
                     {
                         "ts": time.time(),
                         "tour": self.etat.tour,
@@ -205,8 +388,8 @@ class Moteur:
                     }
                 )
             ev = Evenement("fin_partie", {"label": label})
-            self.etat.pile_evenements.append(ev)
-            self.etat.journal.append(
+            self.etat.empiler_evenements([ev])
+            self._ajouter_au_journal(
                 {
                     "ts": time.time(),
                     "tour": self.etat.tour,
@@ -220,9 +403,10 @@ class Moteur:
             )
 
     def appliquer_action(self, action: Action) -> List[Evenement]:
+        self._point_de_controle()
         if self.etat.est_terminee():
             ev = Evenement("refus", {"msg": "partie_terminee"})
-            self.etat.pile_evenements.append(ev)
+            self.etat.empiler_evenements([ev])
             # Journalise le refus post-fin
             self._journaliser(action, [ev])
             return [ev]
@@ -251,17 +435,18 @@ class Moteur:
             )
             self._terminer(label)
 
-        self.etat.pile_evenements.extend(evenements)
+        self.etat.empiler_evenements(evenements)
         # Journalisation de l'action
         self._journaliser(action, evenements)
         return evenements
 
     def debut_nouveau_tour(self):
+        self._point_de_controle()
         if self.etat.est_terminee():
             ev = Evenement("refus", {"msg": "partie_terminee"})
-            self.etat.pile_evenements.append(ev)
+            self.etat.empiler_evenements([ev])
             # Journalise le refus post-fin
-            self.etat.journal.append(
+            self._ajouter_au_journal(
                 {
                     "ts": time.time(),
                     "tour": self.etat.tour,
@@ -280,9 +465,9 @@ class Moteur:
 
         self.etat.tour += 1
         ev = Evenement("nouveau_tour", {"tour": self.etat.tour})
-        self.etat.pile_evenements.append(ev)
+        self.etat.empiler_evenements([ev])
         # Journalise le passage de tour
-        self.etat.journal.append(
+        self._ajouter_au_journal(
             {
                 "ts": time.time(),
                 "tour": self.etat.tour,
@@ -299,56 +484,74 @@ class Moteur:
         if self.etat.tour > self.etat.max_tours:
             self._terminer("limite_de_tours_atteinte")
 
-    # helper RNG reproductible
+    # actions YAML jouables, recalculées seulement si ce qu'elles lisent change
+    def actions_possibles(self, joueur_id: str) -> List[str]:
+        """Actions de etat._cfg dont les préconditions passent pour joueur_id.
+
+        Le résultat est gardé par joueur avec la signature des préconditions
+        (phase, rôle, attention, champs de contentieux, types d'événements
+        cités) : tant qu'elle ne bouge pas, pas de nouvelle évaluation.
+        """
+        from .regles_loader import actions_legales, signature_preconditions
+
+        cfg = getattr(self.etat, "_cfg", None)
+        if cfg is None:
+            return []
+        cache = self.__dict__.setdefault("_actions_legales", {})
+        sig = signature_preconditions(self.etat, joueur_id, cfg)
+        hit = cache.get(joueur_id)
+        if hit is None or hit[0] is not cfg or hit[1] != sig:
+            legales = actions_legales(self.etat, joueur_id, cfg)
+            hit = cache[joueur_id] = (cfg, sig, legales)
+        return list(hit[2])
+
+    # helper RNG reproductible (générateur vivant porté par l'état)
     def _rng(self) -> random.Random:
-        r = random.Random(self.etat.rng_seed)
-        # avancer jusqu'à l'état courant
-        for _ in range(self.etat.rng_calls):
-            r.random()
-        return r
+        return self.etat.rng_vivant()
 
     # choix pondéré reproductible
     def _rng_choice_weighted(self, items: List[Any], weights: List[float]):
-        r = self._rng()
-        total = sum(weights)
-        x = r.random() * total
-        self.etat.rng_calls += 1
-        acc = 0.0
-        for item, w in zip(items, weights):
-            acc += w
-            if x <= acc:
-                return item
-        return items[-1]
+        return self._rng_choice_cumul(items, list(accumulate(weights)), sum(weights))
+
+    # idem avec poids cumulés précalculés (poids >= 0): un tirage, un bisect
+    def _rng_choice_cumul(self, items: List[Any], cumul: List[float], total: float):
+        x = self.etat.rng_random() * total
+        i = bisect_left(cumul, x)
+        return items[i] if i < len(items) else items[-1]
 
     # charger des règles YAML et initialiser contenu
     def charger_regles_yaml(self, path: str) -> None:
-        from pathlib import Path
-        from .regles_loader import (
-            charger_yaml,
-            construire_regle_generique,
-            appliquer_etat_initial_contentieux,
-            assigner_roles,
-        )
-
-        def _find_schema_upwards(start: Path) -> Path:
-            for parent in [start] + list(start.parents):
-                candidate = parent / "docs" / "schemas" / "regles.schema.json"
-                if candidate.exists():
-                    return candidate
-            raise FileNotFoundError(
-                "Impossible de localiser docs/schemas/regles.schema.json en remontant depuis "
-                + str(start)
-            )
-
-        here = Path(__file__).resolve()
-        schema_path = _find_schema_upwards(here)
-        cfg = charger_yaml(path, schema_path=str(schema_path))
+        from .regles_loader import appliquer_etat_initial_contentieux, assigner_roles
 
+        cfg = self.attacher_regles_yaml(path)
         appliquer_etat_initial_contentieux(self.etat, cfg)
         assigner_roles(self.etat, cfg)
+
+    # brancher des règles YAML sur un état existant (partie rechargée)
+    def attacher_regles_yaml(self, path: str):
+        from .regles_loader import charger_regles, construire_regle_generique
+
+        # config partagée par toutes les parties jouant ce fichier (registre)
+        cfg = charger_regles(path, schema_path=str(_chemin_schema_regles()))
+        self.etat._cfg = cfg
+
         regle_yaml = construire_regle_generique(cfg)
         # on remplace pour éviter la double facturation et les doublons d'effets
         self.regles = [regle_yaml]
+        return cfg
+
+
+@lru_cache(maxsize=1)
+def _chemin_schema_regles() -> Path:
+    here = Path(__file__).resolve()
+    for parent in [here] + list(here.parents):
+        candidate = parent / "docs" / "schemas" / "regles.schema.json"
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(
+        "Impossible de localiser docs/schemas/regles.schema.json en remontant depuis "
+        + str(here)
+    )
 
 
 # --- Règles par défaut -------------------------------------------------------
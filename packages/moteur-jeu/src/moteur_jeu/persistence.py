@@ -1,31 +1,71 @@
 from __future__ import annotations
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+import hashlib
 import json
+import os
+import zlib
 from pathlib import Path
 from .moteur import EtatJeu, Joueur, Evenement
 
+# codecs optionnels: on n'impose pas leur présence en runtime
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    msgpack = None
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover
+    zstandard = None
 
-def etat_to_dict(etat: EtatJeu) -> Dict[str, Any]:
-    return {
+
+def etat_to_dict(etat: EtatJeu, historique: bool = True) -> Dict[str, Any]:
+    """Sérialise l'état. historique=False omet journal et pile (état compact)."""
+    d = {
         "id": etat.id,
         "tour": etat.tour,
         "tension": etat.tension,
         "joueurs": {
-            jid: {"id": j.id, "nom": j.nom, "role": j.role, "attention": j.attention}
+            jid: {
+                "id": j.id,
+                "nom": j.nom,
+                "role": j.role,
+                "attention": j.attention,
+                "score": j.score,
+            }
             for jid, j in etat.joueurs.items()
         },
         "contentieux": etat.contentieux,
-        "pile_evenements": [
-            {"type": e.type, "donnees": e.donnees, "ts": e.ts}
-            for e in etat.pile_evenements
-        ],
         "partie_status": etat.partie_status,
         "raison_fin": etat.raison_fin,
         "max_tours": etat.max_tours,
+        "phase": etat.phase,
+        "scores": etat.scores,
         "rng_seed": etat.rng_seed,
         "rng_calls": etat.rng_calls,
-        "journal": etat.journal,  # déjà sérialisable
+        "rng_state": etat.rng_etat(),
     }
+    if historique:
+        d["pile_evenements"] = [
+            {"type": e.type, "donnees": e.donnees, "ts": e.ts}
+            for e in etat.pile_evenements
+        ]
+        d["journal"] = list(etat.journal)  # déjà sérialisable
+        d["points_controle"] = etat.points_controle
+        # hors état compact: ni l'empreinte ni le replay n'en dépendent
+        d["version"] = etat.version
+    return d
+
+
+def empreinte_etat(etat: EtatJeu) -> str:
+    """sha256 de l'état compact (JSON canonique) et de la taille du journal."""
+    d = etat_to_dict(etat, historique=False)
+    d["taille_journal"] = len(etat.journal)
+    brut = json.dumps(d, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(brut.encode("utf-8")).hexdigest()
 
 
 def etat_from_dict(d: Dict[str, Any]) -> EtatJeu:
@@ -44,28 +84,281 @@ def etat_from_dict(d: Dict[str, Any]) -> EtatJeu:
         partie_status=d.get("partie_status", "en_cours"),
         raison_fin=d.get("raison_fin"),
         max_tours=d.get("max_tours", 8),
+        phase=d.get("phase", "definition"),
+        scores=d.get("scores", {}),
         rng_seed=d.get("rng_seed", 42),
         rng_calls=d.get("rng_calls", 0),
         journal=d.get("journal", []),
+        points_controle=d.get("points_controle", []),
+        version=d.get("version", 0),
     )
+    # anciennes sauvegardes: pas de rng_state -> reconstruit depuis seed/calls
+    if d.get("rng_state") is not None:
+        etat.restaurer_rng(d["rng_state"])
     return etat
 
 
-def sauvegarder(etat: EtatJeu, path: str, meta: Dict[str, Any] | None = None) -> None:
-    payload = {"etat": etat_to_dict(etat), "meta": meta or {}}
+def appliquer_etat_compact(etat: EtatJeu, d: Dict[str, Any]) -> None:
+    """Recopie sur etat les champs d'un etat_to_dict(..., historique=False)."""
+    etat.tour = d["tour"]
+    etat.tension = d["tension"]
+    etat.joueurs = {jid: Joueur(**jd) for jid, jd in d["joueurs"].items()}
+    etat.contentieux = d["contentieux"]
+    etat.partie_status = d["partie_status"]
+    etat.raison_fin = d["raison_fin"]
+    etat.max_tours = d["max_tours"]
+    etat.phase = d["phase"]
+    etat.scores = d["scores"]
+    etat.rng_seed = d["rng_seed"]
+    etat.rng_calls = d["rng_calls"]
+    if d.get("rng_state") is not None:
+        etat.restaurer_rng(d["rng_state"])
+
+
+# --- Format binaire -----------------------------------------------------------
+#
+# En-tête de 7 octets: MAGIC (4) + version (1) + codec (1) + compression (1),
+# suivi du payload encodé puis éventuellement compressé.
+#   codec:       b"m" msgpack, b"j" JSON compact (via orjson si présent)
+#   compression: b"-" aucune, b"z" zlib, b"s" zstd
+
+MAGIC = b"AVPB"
+VERSION_BINAIRE = 1
+EXTENSIONS_BINAIRES = (".avp", ".avpb")
+
+_CODES_CODEC = {"msgpack": b"m", "json": b"j"}
+_CODES_COMPRESSION = {"aucune": b"-", "zlib": b"z", "zstd": b"s"}
+
+
+def codec_par_defaut() -> str:
+    return "msgpack" if msgpack is not None else "json"
+
+
+def compression_par_defaut() -> str:
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def _encoder(payload: Dict[str, Any], codec: str) -> bytes:
+    if codec == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("codec msgpack demandé mais msgpack est absent")
+        return msgpack.packb(payload, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _decoder(brut: bytes, code: bytes) -> Dict[str, Any]:
+    if code == b"m":
+        if msgpack is None:
+            raise RuntimeError("sauvegarde msgpack: installer msgpack pour la relire")
+        return msgpack.unpackb(brut, raw=False, strict_map_key=False)
+    if code == b"j":
+        return orjson.loads(brut) if orjson is not None else json.loads(brut)
+    raise ValueError(f"codec binaire inconnu: {code!r}")
+
+
+def _compresser(brut: bytes, compression: str) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(brut, 6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("compression zstd demandée mais zstandard est absent")
+        return zstandard.ZstdCompressor(level=3).compress(brut)
+    return brut
+
+
+def _decompresser(blob: bytes, code: bytes) -> bytes:
+    if code == b"-":
+        return blob
+    if code == b"z":
+        return zlib.decompress(blob)
+    if code == b"s":
+        if zstandard is None:
+            raise RuntimeError("sauvegarde zstd: installer zstandard pour la relire")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    raise ValueError(f"compression binaire inconnue: {code!r}")
+
+
+def encoder_binaire(
+    payload: Dict[str, Any],
+    codec: Optional[str] = None,
+    compression: Optional[str] = None,
+) -> bytes:
+    codec = codec or codec_par_defaut()
+    compression = compression or compression_par_defaut()
+    if codec not in _CODES_CODEC:
+        raise ValueError(f"codec inconnu: {codec}")
+    if compression not in _CODES_COMPRESSION:
+        raise ValueError(f"compression inconnue: {compression}")
+    entete = (
+        MAGIC
+        + bytes([VERSION_BINAIRE])
+        + _CODES_CODEC[codec]
+        + _CODES_COMPRESSION[compression]
+    )
+    return entete + _compresser(_encoder(payload, codec), compression)
+
+
+def decoder_binaire(blob: bytes) -> Dict[str, Any]:
+    if not blob.startswith(MAGIC):
+        raise ValueError("pas une sauvegarde binaire (en-tête absent)")
+    version = blob[4]
+    if version != VERSION_BINAIRE:
+        raise ValueError(f"version de sauvegarde binaire non supportée: {version}")
+    return _decoder(_decompresser(blob[7:], blob[6:7]), blob[5:6])
+
+
+def format_pour(path: str) -> str:
+    """'binaire' pour les extensions .avp/.avpb, 'json' sinon."""
+    return "binaire" if Path(path).suffix in EXTENSIONS_BINAIRES else "json"
+
+
+def sauvegarder(
+    etat: EtatJeu,
+    path: str,
+    meta: Dict[str, Any] | None = None,
+    *,
+    indent: Optional[int] = 2,
+    format: Optional[str] = None,
+    codec: Optional[str] = None,
+    compression: Optional[str] = None,
+) -> None:
+    """Écrit la partie en JSON ou en binaire (format déduit de l'extension).
+
+    codec/compression ne concernent que le binaire ; par défaut msgpack et zstd
+    s'ils sont installés, sinon JSON compact et zlib.
+    """
+    # l'empreinte permet de vérifier un replay sans relire tout le journal
+    meta = {**(meta or {}), "empreinte": empreinte_etat(etat)}
+    payload = {"etat": etat_to_dict(etat), "meta": meta}
     Path(path).parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    # écriture atomique: un instantané à moitié écrit ne remplace jamais le bon
+    tmp = f"{path}.tmp"
+    if (format or format_pour(path)) == "binaire":
+        with open(tmp, "wb") as f:
+            f.write(encoder_binaire(payload, codec, compression))
+    else:
+        # dumps d'un bloc: json.dump encode morceau par morceau, bien plus lent
+        texte = json.dumps(payload, ensure_ascii=False, indent=indent)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(texte)
+    os.replace(tmp, path)
 
 
 def charger(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Relit une sauvegarde ; format détecté à l'en-tête, pas à l'extension."""
+    with open(path, "rb") as f:
+        blob = f.read()
+    if blob.startswith(MAGIC):
+        return decoder_binaire(blob)
+    return orjson.loads(blob) if orjson is not None else json.loads(blob)
 
 
 def moteur_depuis_fichier(path: str) -> "Moteur":
+    """Recharge une partie (instantané + fin du journal d'écriture s'il existe)."""
     from .moteur import Moteur
 
     data = charger(path)
     etat = etat_from_dict(data["etat"])
+    rejouer_wal(etat, chemin_wal(path))
     return Moteur(etat=etat)
+
+
+# --- Journal d'écriture (WAL) -------------------------------------------------
+
+
+def chemin_wal(path: str) -> str:
+    return f"{path}.wal"
+
+
+def rejouer_wal(etat: EtatJeu, wal: str) -> None:
+    """Applique sur etat les enregistrements du WAL postérieurs à son journal."""
+    if not Path(wal).exists():
+        return
+    with open(wal, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break  # dernière ligne tronquée (arrêt brutal pendant l'écriture)
+            i = rec["i"]
+            if i < len(etat.journal):
+                continue  # déjà dans l'instantané
+            if i > len(etat.journal):
+                break  # trou: on s'arrête au dernier état cohérent
+            entree = rec["j"]
+            etat.journal.append(entree)
+            etat.empiler_evenements(
+                [
+                    Evenement(e["type"], e["donnees"], e.get("ts", 0.0))
+                    for e in entree.get("evenements", [])
+                ]
+            )
+            appliquer_etat_compact(etat, rec["e"])
+            etat.toucher()
+            if "pc" in rec:
+                etat.points_controle.append(rec["pc"])
+
+
+class JournalEcriture:
+    """Sauvegarde incrémentale d'une partie (write-ahead log).
+
+    `path` contient le dernier instantané complet (format de sauvegarder) et
+    `path`.wal une ligne JSON compacte par entrée de journal depuis cet
+    instantané : l'entrée elle-même et l'état compact qui en résulte (l'état du
+    RNG seulement s'il a bougé). Un nouvel instantané est écrit toutes les
+    `intervalle` entrées ; entre deux, une sauvegarde coûte un append de taille
+    constante.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        meta: Dict[str, Any] | None = None,
+        intervalle: int = 200,
+    ):
+        self.path = str(path)
+        self.wal = chemin_wal(self.path)
+        self.meta = dict(meta or {})
+        self.intervalle = intervalle
+        self.moteur = None
+        self._depuis_instantane = 0
+        self._rng_calls: Optional[int] = None
+
+    def attacher(self, moteur) -> "JournalEcriture":
+        self.moteur = moteur
+        self._rng_calls = moteur.etat.rng_calls
+        moteur.abonner(self.enregistrer)
+        return self
+
+    def detacher(self) -> None:
+        if self.moteur is not None:
+            self.moteur.desabonner(self.enregistrer)
+            self.moteur = None
+
+    def enregistrer(self, entree: Dict[str, Any]) -> None:
+        etat = self.moteur.etat
+        compact = etat_to_dict(etat, historique=False)
+        if etat.rng_calls == self._rng_calls:
+            compact.pop("rng_state")
+        self._rng_calls = etat.rng_calls
+        i = len(etat.journal) - 1
+        rec = {"i": i, "j": entree, "e": compact}
+        pcs = etat.points_controle
+        if pcs and pcs[-1]["index"] == i:  # point pris juste avant cette entrée
+            rec["pc"] = pcs[-1]
+        with open(self.wal, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+        self._depuis_instantane += 1
+        if self._depuis_instantane >= self.intervalle:
+            self.instantane()
+
+    def instantane(self) -> None:
+        """Écrit l'état complet puis vide le WAL (à appeler aussi après une
+        modification hors journal: ajout de joueur, chargement de règles...)."""
+        sauvegarder(self.moteur.etat, self.path, self.meta, indent=None)
+        open(self.wal, "w").close()
+        self._depuis_instantane = 0
+        self._rng_calls = self.moteur.etat.rng_calls
@@ -1,16 +1,20 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+import hashlib
+import os
+import threading
 import yaml
-import json
-from jsonschema import validate
 
 from .moteur import EtatJeu, Evenement, Action, Joueur  # types existants
+from .validation import valider
 
 Regle = Callable[[EtatJeu, Action], Optional[List[Evenement]]]
 
 
-@dataclass
+@dataclass(frozen=True)
 class ReglesConfig:
     actions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     contentieux_init: List[Dict[str, Any]] = field(default_factory=list)
@@ -20,6 +24,15 @@ class ReglesConfig:
     roles: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     evaluation: Dict[str, Any] = field(default_factory=dict)
     raw: Dict[str, Any] = field(default_factory=dict)
+    # forme compilée (cf. compiler_regles), calculée une fois au chargement
+    compilees: Optional["ReglesCompilees"] = None
+
+    # partagée entre parties (registre): une copie d'état garde la même config
+    def __copy__(self) -> "ReglesConfig":
+        return self
+
+    def __deepcopy__(self, memo) -> "ReglesConfig":
+        return self
 
 
 def _load_file(path: str) -> Dict[str, Any]:
@@ -27,18 +40,14 @@ def _load_file(path: str) -> Dict[str, Any]:
         return yaml.safe_load(f) or {}
 
 
-def _load_schema(schema_path: str) -> Dict[str, Any]:
-    with open(schema_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 def charger_yaml(path: str, schema_path: Optional[str] = None) -> ReglesConfig:
     data = _load_file(path)
     if schema_path:
-        schema = _load_schema(schema_path)
-        validate(instance=data, schema=schema)
+        valider(data, schema_path)  # validateur compilé, mis en cache
+    return _construire_config(data)
 
-    # après validate(instance=data, schema=schema)
+
+def _construire_config(data: Dict[str, Any]) -> ReglesConfig:
     actions_cfg = {}
     for a in data.get("actions", []):
         aid = a.get("id") or a.get("name")
@@ -60,7 +69,7 @@ def charger_yaml(path: str, schema_path: Optional[str] = None) -> ReglesConfig:
     perts = data.get("perturbations", []) or []
     evalo = data.get("evaluation", {}) or {}
 
-    return ReglesConfig(
+    cfg = ReglesConfig(
         actions=actions_cfg,
         contentieux_init=data.get("contentieux", []) or [],
         victoires=data.get("victoires", []) or [],
@@ -70,6 +79,91 @@ def charger_yaml(path: str, schema_path: Optional[str] = None) -> ReglesConfig:
         evaluation=evalo,
         raw=data,
     )
+    # la config est figée; seule la forme compilée est posée après coup
+    object.__setattr__(cfg, "compilees", compiler_regles(cfg))
+    return cfg
+
+
+# --- Registre des règles ------------------------------------------------------
+# Une config par fichier YAML pour tout le processus: les parties qui jouent les
+# mêmes règles partagent le même ReglesConfig (figé, à ne pas modifier).
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+@dataclass
+class _EntreeRegistre:
+    signature: Tuple[int, int]  # (mtime_ns, taille) du YAML
+    signature_schema: Optional[Tuple[int, int]]
+    empreinte: str  # sha256 du contenu YAML
+    cfg: ReglesConfig
+
+
+class RegistreRegles:
+    """Configs de règles parsées, validées et compilées, par fichier YAML.
+
+    Un stat suffit quand le fichier n'a pas bougé ; si mtime/taille changent,
+    le contenu est relu et la config n'est reconstruite que si son sha256 (ou
+    le schéma) a changé.
+    """
+
+    def __init__(self):
+        self._entrees: Dict[Tuple[str, Optional[str]], _EntreeRegistre] = {}
+        self._verrou = threading.Lock()
+
+    def obtenir(self, path: str, schema_path: Optional[str] = None) -> ReglesConfig:
+        path = str(Path(path).resolve())
+        schema_path = str(Path(schema_path).resolve()) if schema_path else None
+        cle = (path, schema_path)
+        signature = _signature(path)
+        signature_schema = _signature(schema_path) if schema_path else None
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if (
+                entree is not None
+                and entree.signature == signature
+                and entree.signature_schema == signature_schema
+            ):
+                return entree.cfg
+            with open(path, "rb") as f:
+                contenu = f.read()
+            empreinte = hashlib.sha256(contenu).hexdigest()
+            if (
+                entree is None
+                or entree.empreinte != empreinte
+                or entree.signature_schema != signature_schema
+            ):
+                data = yaml.safe_load(contenu) or {}
+                if schema_path:
+                    valider(data, schema_path)
+                cfg = _construire_config(data)
+            else:
+                cfg = entree.cfg  # simple touch: même contenu
+            self._entrees[cle] = _EntreeRegistre(
+                signature, signature_schema, empreinte, cfg
+            )
+            return cfg
+
+    def invalider(self, path: Optional[str] = None) -> None:
+        """Oublie un fichier (toutes ses variantes de schéma), ou tout le registre."""
+        with self._verrou:
+            if path is None:
+                self._entrees.clear()
+                return
+            path = str(Path(path).resolve())
+            for cle in [c for c in self._entrees if c[0] == path]:
+                del self._entrees[cle]
+
+
+registre_regles = RegistreRegles()
+
+
+def charger_regles(path: str, schema_path: Optional[str] = None) -> ReglesConfig:
+    """Comme charger_yaml, mais via le registre partagé du processus."""
+    return registre_regles.obtenir(path, schema_path)
 
 
 def appliquer_etat_initial_contentieux(etat: EtatJeu, cfg: ReglesConfig) -> None:
@@ -135,10 +229,10 @@ def _check_preconditions(
                 {"msg": "requires_role_tag", "need": req_tag, "have": tags},
             )
 
-    # requires_event: doit exister dans la pile d'événements
+    # requires_event: doit exister dans la pile d'événements (index par type)
     req_ev = cond.get("requires_event")
     if req_ev:
-        if not any(e.type == req_ev for e in etat.pile_evenements):
+        if not etat.compte_evenements(req_ev):
             return Evenement(
                 "refus_precondition", {"msg": "requires_event", "event": req_ev}
             )
@@ -177,165 +271,289 @@ def _check_preconditions(
     return None
 
 
-from typing import List, Optional  # si pas déjà présent
+# --- Compilation des règles ---------------------------------------------------
+#
+# Chaque effet YAML devient une closure `op(etat, evts, moteur, auteur_id)` dont les
+# paramètres sont déjà convertis (int, références de perturbation résolues).
 
+Op = Callable[[EtatJeu, List[Evenement], Optional[Any], Optional[str]], None]
+Verif = Callable[[EtatJeu, List[Evenement]], None]
 
-def _apply_effects(
-    etat: "EtatJeu",
-    effects: List[Dict[str, Any]],
-    evts: List["Evenement"],
-    *,
-    moteur: Optional[Any] = None,
-    cfg: Optional["ReglesConfig"] = None,
-    auteur_id: Optional[str] = None,
-) -> None:
-    """
-    Applique une liste d'effets au jeu. Peut utiliser le RNG du moteur (via etat._moteur)
-    et le catalogue de perturbations de cfg.
+
+@dataclass
+class ActionCompilee:
+    a_cfg: Dict[str, Any]  # dict d'origine (préconditions, phases)
+    cost: int
+    ops: List[Op]
+
+
+@dataclass
+class TablePerturbations:
+    """Perturbations éligibles pour un rôle, avec poids cumulés.
+
+    cumul[k] est la somme (de gauche à droite) des poids jusqu'à indices[k] inclus,
+    comme l'accumulateur de _rng_choice_weighted ; les poids étant >= 0 (schéma),
+    le tirage se fait par bisect avec exactement la même sélection.
     """
-    for eff in effects:
-        etype = eff.get("type")
-        params = eff.get("params", {}) or {}
 
-        if etype == "tension_delta":
-            delta = int(params.get("delta", 0))
-            etat.tension += delta
-            evts.append(
-                Evenement(
-                    "tension_changee",
-                    {"delta": delta, "nouvelle_tension": etat.tension},
-                )
+    indices: List[int]
+    cumul: List[float]
+    total: float
+
+
+def _table_perturbations(cfg: ReglesConfig, role: Optional[str]) -> TablePerturbations:
+    """role=None: pas d'auteur, toutes les perturbations sont éligibles."""
+    role_tags = (cfg.roles.get(role, {}).get("tags") if cfg.roles else []) or []
+    indices: List[int] = []
+    weights: List[float] = []
+    for i, p in enumerate(cfg.perturbations):
+        if role is not None:
+            only_roles = p.get("only_roles") or []
+            only_tags = p.get("only_role_tags") or []
+            if only_roles and role not in only_roles:
+                continue
+            if only_tags and not any(t in role_tags for t in only_tags):
+                continue
+        indices.append(i)
+        weights.append(float(p.get("weight", 1.0)))
+    return TablePerturbations(
+        indices=indices, cumul=list(accumulate(weights)), total=sum(weights)
+    )
+
+
+@dataclass
+class DependancesPreconditions:
+    """Parties de l'état (hors joueur et phase) lues par les préconditions."""
+
+    # (id, champ) de requires_contentieux_gte
+    champs_contentieux: List[Tuple[str, str]] = field(default_factory=list)
+    # types de requires_event (seule compte leur présence dans la pile)
+    types_evenements: List[str] = field(default_factory=list)
+
+
+def _dependances_preconditions(cfg: ReglesConfig) -> DependancesPreconditions:
+    dep = DependancesPreconditions()
+    for a_cfg in cfg.actions.values():
+        cond = a_cfg.get("preconditions", {}) or {}
+        rcg = cond.get("requires_contentieux_gte")
+        if rcg and (rcg["id"], rcg["field"]) not in dep.champs_contentieux:
+            dep.champs_contentieux.append((rcg["id"], rcg["field"]))
+        req_ev = cond.get("requires_event")
+        if req_ev and req_ev not in dep.types_evenements:
+            dep.types_evenements.append(req_ev)
+    return dep
+
+
+@dataclass
+class ReglesCompilees:
+    actions: Dict[str, ActionCompilee] = field(default_factory=dict)
+    # ops de chaque perturbation, dans l'ordre de cfg.perturbations
+    perturbations: List[List[Op]] = field(default_factory=list)
+    victoires: List[Verif] = field(default_factory=list)
+    # tables de tirage par rôle (None = sans auteur)
+    tables: Dict[Optional[str], TablePerturbations] = field(default_factory=dict)
+    dependances: DependancesPreconditions = field(
+        default_factory=DependancesPreconditions
+    )
+
+    def table_pour(self, cfg: ReglesConfig, role: Optional[str]) -> TablePerturbations:
+        table = self.tables.get(role)
+        if table is None:
+            table = self.tables[role] = _table_perturbations(cfg, role)
+        return table
+
+
+def _op_tension_delta(params: Dict[str, Any], cfg: ReglesConfig, comp) -> Op:
+    delta = int(params.get("delta", 0))
+
+    def op(etat, evts, moteur, auteur_id):
+        etat.tension += delta
+        evts.append(
+            Evenement(
+                "tension_changee",
+                {"delta": delta, "nouvelle_tension": etat.tension},
             )
+        )
+
+    return op
+
 
-        elif etype == "emit_event":
-            etype_ev = params.get("event_type", "evenement")
-            data = params.get("data", {}) or {}
+def _op_emit_event(params: Dict[str, Any], cfg: ReglesConfig, comp) -> Op:
+    etype_ev = params.get("event_type", "evenement")
+    data = params.get("data", {})
+
+    if data:
+        # le dict du YAML tel quel, comme l'interprète de référence
+        # (outils/scripts/regles_interpretees.py)
+        def op(etat, evts, moteur, auteur_id):
             evts.append(Evenement(etype_ev, data))
 
-        elif etype == "contentieux_delta":
-            cid = params["id"]
-            field = params["field"]
-            delta = int(params.get("delta", 0))
-            if not hasattr(etat, "contentieux") or cid not in etat.contentieux:
-                evts.append(
-                    Evenement("erreur", {"msg": "contentieux_introuvable", "id": cid})
-                )
-            else:
-                cont = etat.contentieux[cid]
-                cont[field] = int(cont.get(field, 0)) + delta
-                evts.append(
-                    Evenement(
-                        "contentieux_modifie",
-                        {
-                            "id": cid,
-                            "field": field,
-                            "delta": delta,
-                            "valeur": cont[field],
-                        },
-                    )
-                )
+    else:
 
-        elif etype == "phase_set":
-            name = params.get("name")
-            if not name:
-                evts.append(Evenement("erreur", {"msg": "phase_invalide"}))
-            else:
-                etat.phase = name
-                evts.append(Evenement("phase_changee", {"phase": name}))
-
-        elif etype == "attention_delta":
-            target = params.get("target", "auteur")
-            delta = int(params.get("delta", 0))
-            jid = params.get("joueur_id") if target != "auteur" else auteur_id
-            j = etat.joueurs.get(jid) if jid else None
-            if not j:
-                evts.append(
-                    Evenement("erreur", {"msg": "joueur_introuvable", "cible": target})
-                )
-            else:
-                j.attention = max(0, j.attention + delta)
-                evts.append(
-                    Evenement(
-                        "attention_changee",
-                        {"joueur_id": j.id, "delta": delta, "valeur": j.attention},
-                    )
-                )
+        def op(etat, evts, moteur, auteur_id):
+            evts.append(Evenement(etype_ev, {}))
 
-        elif etype == "random_perturbation":
-            if moteur is None and hasattr(etat, "_moteur"):
-                moteur = getattr(etat, "_moteur")
-            cfg = cfg  # déjà reçu
-            if moteur is None or cfg is None or not cfg.perturbations:
-                evts.append(Evenement("erreur", {"msg": "aucune_perturbation"}))
-                continue
+    return op
 
-            auteur = etat.joueurs.get(auteur_id) if auteur_id else None
-            items = []
-            weights = []
-            for p in cfg.perturbations:
-                ok = True
-                if auteur:
-                    only_roles = p.get("only_roles") or []
-                    only_tags = p.get("only_role_tags") or []
-                    if only_roles and auteur.role not in only_roles:
-                        ok = False
-                    if ok and only_tags:
-                        role_tags = (
-                            cfg.roles.get(auteur.role, {}).get("tags")
-                            if cfg.roles
-                            else []
-                        ) or []
-                        if not any(t in role_tags for t in only_tags):
-                            ok = False
-                if ok:
-                    items.append(p)
-                    weights.append(float(p.get("weight", 1.0)))
-
-            if not items:
-                evts.append(
-                    Evenement("erreur", {"msg": "aucune_perturbation_applicable"})
-                )
-                continue
 
-            choice = moteur._rng_choice_weighted(items, weights)
-            pid = choice.get("id")
-            evts.append(Evenement("perturbation_tiree", {"id": pid}))
-            sub_effects = choice.get("effects", []) or []
-            _apply_effects(
-                etat, sub_effects, evts, moteur=moteur, cfg=cfg, auteur_id=auteur_id
+def _op_contentieux_delta(params: Dict[str, Any], cfg: ReglesConfig, comp) -> Op:
+    cid = params["id"]
+    field = params["field"]
+    delta = int(params.get("delta", 0))
+
+    def op(etat, evts, moteur, auteur_id):
+        if not hasattr(etat, "contentieux") or cid not in etat.contentieux:
+            evts.append(
+                Evenement("erreur", {"msg": "contentieux_introuvable", "id": cid})
+            )
+            return
+        cont = etat.contentieux[cid]
+        cont[field] = int(cont.get(field, 0)) + delta
+        evts.append(
+            Evenement(
+                "contentieux_modifie",
+                {"id": cid, "field": field, "delta": delta, "valeur": cont[field]},
             )
+        )
+
+    return op
+
+
+def _op_phase_set(params: Dict[str, Any], cfg: ReglesConfig, comp) -> Op:
+    name = params.get("name")
+
+    if not name:
+
+        def op(etat, evts, moteur, auteur_id):
+            evts.append(Evenement("erreur", {"msg": "phase_invalide"}))
+
+    else:
+
+        def op(etat, evts, moteur, auteur_id):
+            etat.phase = name
+            evts.append(Evenement("phase_changee", {"phase": name}))
+
+    return op
+
+
+def _op_attention_delta(params: Dict[str, Any], cfg: ReglesConfig, comp) -> Op:
+    target = params.get("target", "auteur")
+    delta = int(params.get("delta", 0))
+    jid_fixe = params.get("joueur_id") if target != "auteur" else None
+
+    def op(etat, evts, moteur, auteur_id):
+        jid = auteur_id if target == "auteur" else jid_fixe
+        j = etat.joueurs.get(jid) if jid else None
+        if not j:
+            evts.append(
+                Evenement("erreur", {"msg": "joueur_introuvable", "cible": target})
+            )
+            return
+        j.attention = max(0, j.attention + delta)
+        evts.append(
+            Evenement(
+                "attention_changee",
+                {"joueur_id": j.id, "delta": delta, "valeur": j.attention},
+            )
+        )
+
+    return op
+
+
+def _op_random_perturbation(params: Dict[str, Any], cfg: ReglesConfig, comp) -> Op:
+    if not cfg.perturbations:
+
+        def op(etat, evts, moteur, auteur_id):
+            evts.append(Evenement("erreur", {"msg": "aucune_perturbation"}))
+
+        return op
+
+    def op(etat, evts, moteur, auteur_id):
+        if moteur is None:
+            moteur = getattr(etat, "_moteur", None)
+        if moteur is None:
+            evts.append(Evenement("erreur", {"msg": "aucune_perturbation"}))
+            return
+
+        auteur = etat.joueurs.get(auteur_id) if auteur_id else None
+        table = comp.table_pour(cfg, auteur.role if auteur else None)
+        if not table.indices:
+            evts.append(Evenement("erreur", {"msg": "aucune_perturbation_applicable"}))
+            return
+
+        i = moteur._rng_choice_cumul(table.indices, table.cumul, table.total)
+        pid = cfg.perturbations[i].get("id")
+        evts.append(Evenement("perturbation_tiree", {"id": pid}))
+        for sub in comp.perturbations[i]:
+            sub(etat, evts, moteur, auteur_id)
+
+    return op
+
 
-        elif etype == "apply_perturbation":
-            pid = params.get("id")
-            found = None
-            for p in cfg.perturbations if cfg else []:
-                if p.get("id") == pid:
-                    found = p
-                    break
-            if not found:
+def _op_apply_perturbation(params: Dict[str, Any], cfg: ReglesConfig, comp) -> Op:
+    pid = params.get("id")
+    idx = next(
+        (i for i, p in enumerate(cfg.perturbations) if p.get("id") == pid), None
+    )
+
+    if idx is None:
+
+        def op(etat, evts, moteur, auteur_id):
+            evts.append(
+                Evenement("erreur", {"msg": "perturbation_introuvable", "id": pid})
+            )
+
+    else:
+        # résolution tardive: les perturbations peuvent se référencer entre elles
+        def op(etat, evts, moteur, auteur_id):
+            evts.append(Evenement("perturbation_appliquee", {"id": pid}))
+            for sub in comp.perturbations[idx]:
+                sub(etat, evts, moteur, auteur_id)
+
+    return op
+
+
+_COMPILATEURS_EFFETS: Dict[str, Callable[..., Op]] = {
+    "tension_delta": _op_tension_delta,
+    "emit_event": _op_emit_event,
+    "contentieux_delta": _op_contentieux_delta,
+    "phase_set": _op_phase_set,
+    "attention_delta": _op_attention_delta,
+    "random_perturbation": _op_random_perturbation,
+    "apply_perturbation": _op_apply_perturbation,
+}
+
+
+def _compiler_effets(
+    effects: List[Dict[str, Any]], cfg: ReglesConfig, comp: "ReglesCompilees"
+) -> List[Op]:
+    ops: List[Op] = []
+    for eff in effects or []:
+        etype = eff.get("type")
+        compilateur = _COMPILATEURS_EFFETS.get(etype)
+        if compilateur is None:
+
+            def op(etat, evts, moteur, auteur_id, etype=etype):
                 evts.append(
-                    Evenement("erreur", {"msg": "perturbation_introuvable", "id": pid})
-                )
-            else:
-                evts.append(Evenement("perturbation_appliquee", {"id": pid}))
-                sub_effects = found.get("effects", []) or []
-                _apply_effects(
-                    etat, sub_effects, evts, moteur=moteur, cfg=cfg, auteur_id=auteur_id
+                    Evenement("erreur", {"msg": "effet_inconnu", "type": etype})
                 )
 
+            ops.append(op)
         else:
-            evts.append(Evenement("erreur", {"msg": "effet_inconnu", "type": etype}))
-
-
-def _check_victory(etat: EtatJeu, cfg: ReglesConfig, evts: List[Evenement]) -> None:
-    for rule in cfg.victoires:
-        t = rule["type"]
-        p = rule.get("params", {}) or {}
-        label = rule.get("label", t)
-        if t == "contentieux_gte":
-            cid = p["id"]
-            field = p["field"]
-            value = int(p["value"])
+            ops.append(compilateur(eff.get("params", {}) or {}, cfg, comp))
+    return ops
+
+
+def _compiler_victoire(rule: Dict[str, Any]) -> Optional[Verif]:
+    t = rule["type"]
+    p = rule.get("params", {}) or {}
+    label = rule.get("label", t)
+    if t == "contentieux_gte":
+        cid = p["id"]
+        field = p["field"]
+        value = int(p["value"])
+
+        def verif(etat, evts):
             cur = int(getattr(etat, "contentieux", {}).get(cid, {}).get(field, 0))
             if cur >= value:
                 evts.append(
@@ -350,8 +568,12 @@ def _check_victory(etat: EtatJeu, cfg: ReglesConfig, evts: List[Evenement]) -> N
                         },
                     )
                 )
-        elif t == "tension_gte":
-            value = int(p["value"])
+
+        return verif
+    if t == "tension_gte":
+        value = int(p["value"])
+
+        def verif(etat, evts):
             if etat.tension >= value:
                 evts.append(
                     Evenement(
@@ -360,17 +582,83 @@ def _check_victory(etat: EtatJeu, cfg: ReglesConfig, evts: List[Evenement]) -> N
                     )
                 )
 
+        return verif
+    return None
+
+
+def compiler_regles(cfg: ReglesConfig) -> ReglesCompilees:
+    """Compile actions, perturbations et victoires de cfg (une fois, au chargement)."""
+    # rempli au fur et à mesure: les ops y accèdent à l'exécution
+    comp = ReglesCompilees()
+    comp.perturbations.extend(
+        _compiler_effets(p.get("effects", []) or [], cfg, comp)
+        for p in cfg.perturbations
+    )
+    comp.actions.update(
+        (
+            aid,
+            ActionCompilee(
+                a_cfg=a_cfg,
+                cost=int(a_cfg.get("attention_cost", 1)),
+                ops=_compiler_effets(a_cfg.get("effects", []), cfg, comp),
+            ),
+        )
+        for aid, a_cfg in cfg.actions.items()
+    )
+    comp.victoires.extend(
+        v for v in map(_compiler_victoire, cfg.victoires) if v is not None
+    )
+    # tables de tirage: sans auteur + rôles déclarés (les autres à la demande)
+    for role in [None, *cfg.roles]:
+        comp.table_pour(cfg, role)
+    comp.dependances = _dependances_preconditions(cfg)
+    return comp
+
+
+def signature_preconditions(
+    etat: EtatJeu, joueur_id: str, cfg: ReglesConfig
+) -> Tuple[Any, ...]:
+    """Tout ce que lit _check_preconditions pour ce joueur (cfg fixée).
+
+    Deux états de même signature ont les mêmes actions jouables: phase, rôle
+    (et donc ses tags), attention, champs de contentieux et présence des types
+    d'événements cités par les préconditions.
+    """
+    dep = (cfg.compilees or compiler_regles(cfg)).dependances
+    j = etat.joueurs.get(joueur_id)
+    cont = getattr(etat, "contentieux", {}) or {}
+    return (
+        etat.phase,
+        None if j is None else (j.role, j.attention),
+        tuple(cont.get(cid, {}).get(f, 0) for cid, f in dep.champs_contentieux),
+        tuple(etat.compte_evenements(t) > 0 for t in dep.types_evenements),
+    )
+
+
+def actions_legales(etat: EtatJeu, joueur_id: str, cfg: ReglesConfig) -> List[str]:
+    """Actions de cfg dont les préconditions passent pour joueur_id (sans cache)."""
+    return [
+        aid
+        for aid, a_cfg in cfg.actions.items()
+        if _check_preconditions(etat, Action(aid, joueur_id, {}), a_cfg) is None
+    ]
+
 
 def construire_regle_generique(cfg: ReglesConfig) -> Regle:
+    comp = cfg.compilees or compiler_regles(cfg)
+    actions = comp.actions
+    victoires = comp.victoires
+
     def regle(etat: EtatJeu, action: Action) -> Optional[List[Evenement]]:
-        a_cfg = cfg.actions.get(action.type)
-        if not a_cfg:
+        ac = actions.get(action.type)
+        if ac is None:
             return None
 
         # Vérifier préconditions et ressources
-        pre = _check_preconditions(etat, action, a_cfg)
-        if pre:
-            return [pre]
+        if not action.preconditions_verifiees:
+            pre = _check_preconditions(etat, action, ac.a_cfg)
+            if pre:
+                return [pre]
 
         # Paiement de l'attention
         j: Optional[Joueur] = etat.joueurs.get(action.auteur_id)
@@ -381,31 +669,23 @@ def construire_regle_generique(cfg: ReglesConfig) -> Regle:
                     {"msg": "joueur_introuvable", "joueur_id": action.auteur_id},
                 )
             ]
-        cost = int(a_cfg.get("attention_cost", 1))
-        j.attention -= cost
+        j.attention -= ac.cost
 
         evts: List[Evenement] = [
             Evenement(
                 "attention_depensee",
-                {"joueur_id": j.id, "reste": j.attention, "cost": cost},
+                {"joueur_id": j.id, "reste": j.attention, "cost": ac.cost},
             )
         ]
 
-        # Appliquer effets
-        # >>> IMPORTANT: on récupère le moteur via closure? pas direct. On l'injecte par setattr temporaire
         moteur = getattr(etat, "_moteur", None)
-
-        _apply_effects(
-            etat,
-            a_cfg.get("effects", []),
-            evts,
-            moteur=moteur,
-            cfg=cfg,
-            auteur_id=action.auteur_id,
-        )
+        auteur_id = action.auteur_id
+        for op in ac.ops:
+            op(etat, evts, moteur, auteur_id)
 
         # Vérifier conditions de victoire/échec
-        _check_victory(etat, cfg, evts)
+        for verif in victoires:
+            verif(etat, evts)
         return evts
 
     return regle
@@ -1,12 +1,15 @@
 from __future__ import annotations
-from typing import List, Dict, Any
-from .moteur import Moteur, Action
+import copy
+from bisect import bisect_right
+from typing import Iterable, Dict, Any, Optional
+from .moteur import Moteur, Action, EtatJeu, Evenement
 
 
-def rejouer_actions(moteur: Moteur, journal: List[Dict[str, Any]]) -> None:
+def rejouer_actions(moteur: Moteur, journal: Iterable[Dict[str, Any]]) -> None:
     """
     Rejoue les 'vraies' actions utilisateur (on ignore les actions _system_*).
     Suppose que le moteur a déjà ses règles YAML chargées et un état initial correspondant.
+    Le journal peut être une liste ou un JournalSegmente (parcouru segment par segment).
     """
     for entry in journal:
         act = entry.get("action", {})
@@ -18,3 +21,99 @@ def rejouer_actions(moteur: Moteur, journal: List[Dict[str, Any]]) -> None:
         moteur.appliquer_action(Action(type=t, auteur_id=auteur_id, payload=payload))
         # si l’entrée représente un changement de tour système, on peut appeler le tour suivant;
         # mais on préfère laisser l’état reconduire via actions utilisateur.
+
+
+def rejouer_entree(moteur: Moteur, entree: Dict[str, Any]) -> None:
+    """Rejoue une entrée de journal « racine » (action joueur, passage de tour
+    ou arrivée d'un joueur).
+
+    Les entrées _system_scoring/_system_fin sont des conséquences d'une action
+    ou d'un tour : elles sont reproduites par l'appel qui les a produites.
+    """
+    act = entree.get("action", {})
+    t = act.get("type")
+    if not t:
+        return
+    if t.startswith("_system_nouveau_tour"):
+        moteur.debut_nouveau_tour()
+    elif t == "_system_joueur_ajoute":
+        p = act.get("payload", {})
+        moteur.ajouter_joueur(p.get("nom"), p.get("role"), joueur_id=p.get("id"))
+    elif not t.startswith("_system"):
+        payload = act.get("payload", {})
+        moteur.appliquer_action(Action(t, act.get("auteur_id"), payload))
+
+
+def index_du_tour(journal: Iterable[Dict[str, Any]], tour: int) -> int:
+    """Index de journal correspondant au début du tour `tour`."""
+    premier_tour = None
+    for i, entree in enumerate(journal):
+        if premier_tour is None:
+            premier_tour = entree.get("tour", 1)
+        act = entree.get("action", {})
+        if act.get("type") == "_system_nouveau_tour" and entree.get("tour") == tour:
+            return i + 1
+    if premier_tour is None or tour <= premier_tour:
+        return 0
+    raise ValueError(f"tour {tour} absent du journal")
+
+
+def rejouer_jusqua(
+    moteur: Moteur,
+    index: Optional[int] = None,
+    *,
+    tour: Optional[int] = None,
+    depuis_debut: bool = False,
+) -> Moteur:
+    """
+    Reconstruit dans un nouveau moteur l'état de la partie juste avant l'entrée
+    `index` du journal (ou au début du tour `tour`), sans toucher à `moteur`.
+
+    Part du dernier point de contrôle <= index (état compact + RNG) puis rejoue
+    les entrées suivantes avec les règles de `moteur` : au plus
+    intervalle_points_controle appels de règles au lieu de toute la partie.
+    depuis_debut=True force le premier point de contrôle (vérification de
+    règles modifiées: les points suivants masqueraient une divergence).
+    Si index tombe au milieu d'un appel (action gagnante suivie de
+    _system_scoring/_system_fin), l'appel est rejoué en entier.
+    Les arrivées de joueurs sont journalisées et rejouées ; les autres
+    modifications hors journal faites après le point de contrôle ne le sont pas.
+    """
+    from .persistence import appliquer_etat_compact
+
+    source = moteur.etat
+    journal = source.journal
+    if tour is not None:
+        index = index_du_tour(journal, tour)
+    index = len(journal) if index is None else min(max(index, 0), len(journal))
+
+    pcs = source.points_controle
+    k = bisect_right([pc["index"] for pc in pcs], index) - 1
+    if depuis_debut and k > 0:
+        k = 0
+    if k < 0:
+        raise ValueError(f"aucun point de contrôle avant l'entrée {index}")
+    pc = pcs[k]
+
+    debut = list(journal.iter_depuis(0, pc["index"]))
+    etat = EtatJeu(
+        id=source.id,
+        journal=debut,
+        pile_evenements=[
+            Evenement(e["type"], e["donnees"], e.get("ts", 0.0))
+            for entree in debut
+            for e in entree.get("evenements", [])
+        ],
+        points_controle=list(pcs[: k + 1]),
+    )
+    appliquer_etat_compact(etat, copy.deepcopy(pc["etat"]))
+    if hasattr(source, "_cfg"):
+        etat._cfg = source._cfg
+    rejoue = Moteur(etat=etat, regles=moteur.regles)
+    rejoue.intervalle_points_controle = moteur.intervalle_points_controle
+
+    for entree in journal.iter_depuis(pc["index"]):
+        if len(etat.journal) >= index:
+            break
+        rejouer_entree(rejoue, entree)
+    return rejoue
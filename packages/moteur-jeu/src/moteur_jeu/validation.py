@@ -0,0 +1,169 @@
+# packages/moteur-jeu/src/moteur_jeu/validation.py
+"""
+Validation JSON Schema en process, validateurs compilés une fois.
+
+Un validateur (classe choisie par validator_for selon le $schema, schéma
+vérifié une seule fois) est mis en cache par fichier de schéma et sha256 de
+son contenu ; moteur_jeu (règles) et cabinet (skins) partagent ce cache.
+Les erreurs sont rapportées comme check-jsonschema les affiche, et le mode
+lot valide tout un dossier de skins sans lancer un processus par YAML.
+
+    python -m moteur_jeu.validation --schemafile s.json skins/ [autre.yaml ...]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+from jsonschema import FormatChecker
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.validators import validator_for
+
+MOTIFS_YAML = ("*.yaml", "*.yml")
+
+_verrou = threading.Lock()
+# schéma résolu -> ((mtime_ns, taille), sha256, validateur)
+_VALIDATEURS: Dict[str, Tuple[Tuple[int, int], str, Any]] = {}
+# sha256 du schéma -> validateur (deux chemins, même contenu: même instance)
+_PAR_EMPREINTE: Dict[str, Any] = {}
+
+
+def validateur_pour(schema_path: str | Path):
+    """Validateur compilé pour ce fichier de schéma (recompilé s'il change)."""
+    cle = str(Path(schema_path).resolve())
+    st = os.stat(cle)
+    signature = (st.st_mtime_ns, st.st_size)
+    with _verrou:
+        entree = _VALIDATEURS.get(cle)
+        if entree is not None and entree[0] == signature:
+            return entree[2]
+        with open(cle, "rb") as f:
+            contenu = f.read()
+        empreinte = hashlib.sha256(contenu).hexdigest()
+        validateur = _PAR_EMPREINTE.get(empreinte)
+        if validateur is None:
+            schema = json.loads(contenu)
+            cls = validator_for(schema)
+            cls.check_schema(schema)
+            validateur = cls(schema, format_checker=FormatChecker())
+            _PAR_EMPREINTE[empreinte] = validateur
+        _VALIDATEURS[cle] = (signature, empreinte, validateur)
+        return validateur
+
+
+def vider_cache() -> None:
+    with _verrou:
+        _VALIDATEURS.clear()
+        _PAR_EMPREINTE.clear()
+
+
+def erreurs(instance: Any, schema_path: str | Path) -> List[ValidationError]:
+    """Toutes les erreurs de validation, dans l'ordre des chemins JSON."""
+    errs = validateur_pour(schema_path).iter_errors(instance)
+    return sorted(errs, key=lambda e: [str(p) for p in e.absolute_path])
+
+
+def formater_erreurs(nom: str, errs: Iterable[ValidationError]) -> str:
+    """Même rendu que check-jsonschema: `  fichier::$.chemin: message`."""
+    lignes = ["Schema validation errors were encountered."]
+    for e in errs:
+        # anyOf/oneOf: on remonte la sous-erreur la plus pertinente
+        detail = best_match(e.context) if e.context else None
+        lignes.append(f"  {nom}::{e.json_path}: {e.message}")
+        if detail is not None:
+            lignes.append(f"    Best Match: {detail.json_path}: {detail.message}")
+    return "\n".join(lignes)
+
+
+def valider(instance: Any, schema_path: str | Path) -> None:
+    """Lève la meilleure ValidationError (comme jsonschema.validate)."""
+    erreur = best_match(validateur_pour(schema_path).iter_errors(instance))
+    if erreur is not None:
+        raise erreur
+
+
+def _charger_yaml(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def verifier_yaml(
+    yaml_path: str | Path, schema_path: str | Path
+) -> Tuple[Any, Optional[str]]:
+    """Charge un YAML et le valide ; renvoie (données, rapport d'erreurs ou None)."""
+    p = Path(yaml_path)
+    data = _charger_yaml(p)
+    errs = erreurs(data, schema_path)
+    return data, (formater_erreurs(str(p), errs) if errs else None)
+
+
+def valider_yaml(yaml_path: str | Path, schema_path: str | Path) -> Any:
+    """Charge et valide un YAML ; ValueError au format de check-jsonschema."""
+    data, rapport = verifier_yaml(yaml_path, schema_path)
+    if rapport is not None:
+        raise ValueError(
+            f"Le YAML '{Path(yaml_path).name}' ne respecte pas le schéma "
+            f"'{Path(schema_path).name}':\n{rapport}\n"
+        )
+    return data
+
+
+def lister_yaml(
+    racines: Iterable[str | Path], exclure: Iterable[str] = ("archives",)
+) -> List[Path]:
+    exclure = set(exclure)
+    trouves = set()
+    for racine in racines:
+        base = Path(racine)
+        if base.is_file():
+            trouves.add(base)
+            continue
+        for motif in MOTIFS_YAML:
+            trouves.update(
+                p for p in base.rglob(motif) if not exclure.intersection(p.parts)
+            )
+    return sorted(trouves)
+
+
+def valider_lot(
+    fichiers: Iterable[str | Path], schema_path: str | Path
+) -> Dict[Path, Optional[str]]:
+    """Valide des YAML avec un seul validateur ; rapport d'erreurs par fichier."""
+    validateur_pour(schema_path)  # schéma illisible: échec avant le premier YAML
+    resultats: Dict[Path, Optional[str]] = {}
+    for f in fichiers:
+        p = Path(f)
+        try:
+            resultats[p] = verifier_yaml(p, schema_path)[1]
+        except (OSError, yaml.YAMLError) as exc:
+            resultats[p] = f"Failed to parse {p.name}: {exc}"
+    return resultats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m moteur_jeu.validation",
+        description="Valide des YAML (ou dossiers de skins) contre un schéma JSON.",
+    )
+    ap.add_argument("--schemafile", required=True)
+    ap.add_argument("chemins", nargs="+", help="fichiers YAML ou dossiers")
+    args = ap.parse_args(argv)
+
+    resultats = valider_lot(lister_yaml(args.chemins), args.schemafile)
+    echecs = {p: r for p, r in resultats.items() if r is not None}
+    for p, rapport in echecs.items():
+        print(rapport, file=sys.stderr)
+    if not echecs:
+        print("ok -- validation done")
+    return 1 if echecs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+# packages/moteur-jeu/src/moteur_jeu/verification.py
+"""
+Vérification en lot d'une archive de parties sauvegardées.
+
+Chaque sauvegarde est rejouée depuis son premier point de contrôle avec les
+règles actuelles, puis comparée à l'état stocké (empreinte sha256) ; en cas
+d'écart on rapporte le premier index de journal divergent. Les fichiers sont
+répartis sur un pool de processus (un fichier = une tâche indépendante).
+
+Une sauvegarde antérieure aux points de contrôle (pas de point à l'index 0)
+est rejouée depuis un état initial reconstruit: joueurs d'origine (id, nom,
+rôle) avec l'attention et le score de départ, contentieux initiaux des
+règles, tension à zéro, même graine. Le résultat le signale
+(etat_initial_reconstruit): une divergence peut alors venir de ce qui, au
+départ, ne suivait pas ces valeurs par défaut.
+
+    python -m moteur_jeu.verification ARCHIVE/ [--regles r.yaml] [--jobs 8]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .moteur import EtatJeu, Joueur, Moteur
+from .persistence import (
+    charger,
+    chemin_wal,
+    empreinte_etat,
+    etat_from_dict,
+    etat_to_dict,
+    rejouer_wal,
+)
+from .regles_loader import appliquer_etat_initial_contentieux
+from .replay import rejouer_jusqua
+
+MOTIFS_PAR_DEFAUT = ("*.json", "*.avp", "*.avpb")
+
+
+@dataclass
+class ResultatVerification:
+    fichier: str
+    statut: str  # "ok" | "divergence" | "corrompue" | "erreur"
+    empreinte_attendue: Optional[str] = None
+    empreinte_obtenue: Optional[str] = None
+    index_divergence: Optional[int] = None
+    message: str = ""
+    etat_initial_reconstruit: bool = False
+
+
+def _sans_ts(entree: Dict[str, Any]) -> Dict[str, Any]:
+    # aller-retour JSON: l'entrée rejouée (tuples...) comme l'entrée relue
+    entree = json.loads(json.dumps(entree))
+    e = {k: v for k, v in entree.items() if k != "ts"}
+    e["evenements"] = [
+        {k: v for k, v in ev.items() if k != "ts"}
+        for ev in entree.get("evenements", [])
+    ]
+    return e
+
+
+def premiere_divergence(
+    attendu: Iterable[Dict[str, Any]], obtenu: Iterable[Dict[str, Any]]
+) -> Optional[int]:
+    """Premier index où deux journaux diffèrent (horodatages ignorés), ou None."""
+    it_a, it_b = iter(attendu), iter(obtenu)
+    i = 0
+    while True:
+        a = next(it_a, None)
+        b = next(it_b, None)
+        if a is None and b is None:
+            return None
+        if a is None or b is None or _sans_ts(a) != _sans_ts(b):
+            return i
+        i += 1
+
+
+def point_controle_initial(etat: EtatJeu) -> Dict[str, Any]:
+    """Point de contrôle 0 reconstruit pour une sauvegarde qui n'en a pas.
+
+    Les joueurs arrivés en cours de partie (_system_joueur_ajoute) sont
+    retirés: le replay les ajoute lui-même.
+    """
+    arrives = {
+        e["action"].get("payload", {}).get("id")
+        for e in etat.journal
+        if e.get("action", {}).get("type") == "_system_joueur_ajoute"
+    }
+    initial = EtatJeu(id=etat.id, max_tours=etat.max_tours, rng_seed=etat.rng_seed)
+    if isinstance(etat.tension, dict):
+        initial.tension = {axe: 0 for axe in etat.tension}
+    else:
+        initial.tension = 0
+    for jid, j in etat.joueurs.items():
+        if jid not in arrives:
+            initial.joueurs[jid] = Joueur(id=jid, nom=j.nom, role=j.role)
+    initial.scores = {jid: 0 for jid in initial.joueurs if jid in etat.scores}
+    cfg = getattr(etat, "_cfg", None)
+    if cfg is not None:
+        appliquer_etat_initial_contentieux(initial, cfg)
+    return {"index": 0, "etat": etat_to_dict(initial, historique=False)}
+
+
+def verifier_fichier(path: str, regles: Optional[str] = None) -> ResultatVerification:
+    """Rejoue une sauvegarde (instantané + WAL) et la compare à l'état stocké."""
+    try:
+        data = charger(path)
+        etat = etat_from_dict(data["etat"])
+        meta = data.get("meta") or {}
+        n0 = len(etat.journal)
+        rejouer_wal(etat, chemin_wal(path))
+        attendue = empreinte_etat(etat)
+        # l'empreinte de meta ne couvre que l'instantané (pas la fin du WAL)
+        if len(etat.journal) == n0 and meta.get("empreinte") not in (None, attendue):
+            return ResultatVerification(
+                path,
+                "corrompue",
+                meta["empreinte"],
+                attendue,
+                message="l'état relu ne correspond pas à l'empreinte enregistrée",
+            )
+
+        # sans fichier de règles: partie jouée avec REGLES_PAR_DEFAUT
+        chemin_regles = regles or meta.get("regles")
+        moteur = Moteur(etat=etat)
+        if chemin_regles:
+            # config du registre: YAML lu une fois par processus (et _cfg posé,
+            # pour que le scoring de fin de partie soit rejoué lui aussi)
+            moteur.attacher_regles_yaml(chemin_regles)
+        message = ""
+        reconstruit = not etat.points_controle or etat.points_controle[0]["index"] != 0
+        if reconstruit:
+            # sauvegarde antérieure aux points de contrôle
+            etat.points_controle.insert(0, point_controle_initial(etat))
+            message = "état initial reconstruit (pas de point de contrôle 0)"
+        rejoue = rejouer_jusqua(moteur, depuis_debut=True)
+        obtenue = empreinte_etat(rejoue.etat)
+        if obtenue == attendue:
+            return ResultatVerification(
+                path,
+                "ok",
+                attendue,
+                obtenue,
+                message=message,
+                etat_initial_reconstruit=reconstruit,
+            )
+        return ResultatVerification(
+            path,
+            "divergence",
+            attendue,
+            obtenue,
+            premiere_divergence(etat.journal, rejoue.etat.journal),
+            message=message,
+            etat_initial_reconstruit=reconstruit,
+        )
+    except Exception as exc:  # une sauvegarde illisible ne doit pas arrêter le lot
+        msg = f"{type(exc).__name__}: {exc}"
+        return ResultatVerification(path, "erreur", message=msg)
+
+
+def lister_sauvegardes(
+    racine: str, motifs: Iterable[str] = MOTIFS_PAR_DEFAUT
+) -> List[str]:
+    base = Path(racine)
+    if base.is_file():
+        return [str(base)]
+    trouves = {str(p) for motif in motifs for p in base.rglob(motif) if p.is_file()}
+    return sorted(trouves)
+
+
+def _verifier_lot(lot: List[str], regles: Optional[str]) -> List[ResultatVerification]:
+    return [verifier_fichier(p, regles) for p in lot]
+
+
+def verifier_archive(
+    fichiers: List[str], regles: Optional[str] = None, jobs: Optional[int] = None
+) -> List[ResultatVerification]:
+    """Vérifie des sauvegardes sur `jobs` processus (tous les cœurs par défaut).
+
+    Les fichiers partent par lots pour amortir l'aller-retour inter-processus ;
+    les règles YAML ne sont chargées qu'une fois par processus.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(fichiers) <= 1:
+        return _verifier_lot(fichiers, regles)
+    taille = max(1, min(64, len(fichiers) // (jobs * 4)))
+    lots = [fichiers[i : i + taille] for i in range(0, len(fichiers), taille)]
+    resultats: List[ResultatVerification] = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for res in pool.map(_verifier_lot, lots, [regles] * len(lots)):
+            resultats.extend(res)
+    return resultats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m moteur_jeu.verification",
+        description="Rejoue une archive de sauvegardes et signale les divergences.",
+    )
+    ap.add_argument("archive", help="dossier de sauvegardes (ou un fichier)")
+    ap.add_argument(
+        "--regles", help="YAML de règles (défaut: meta 'regles' de chaque fichier)"
+    )
+    ap.add_argument("--jobs", "-j", type=int, default=None, help="nb de processus")
+    ap.add_argument(
+        "--motif",
+        action="append",
+        help=f"motif glob des sauvegardes (défaut: {' '.join(MOTIFS_PAR_DEFAUT)})",
+    )
+    ap.add_argument("--json", action="store_true", help="une ligne JSON par fichier")
+    args = ap.parse_args(argv)
+
+    fichiers = lister_sauvegardes(args.archive, args.motif or MOTIFS_PAR_DEFAUT)
+    resultats = verifier_archive(fichiers, args.regles, args.jobs)
+
+    echecs = 0
+    for r in resultats:
+        if args.json:
+            print(json.dumps(asdict(r), ensure_ascii=False))
+        elif r.statut != "ok":
+            detail = r.message
+            if r.statut == "divergence":
+                detail = f"premier index divergent: {r.index_divergence}"
+                if r.message:
+                    detail += f", {r.message}"
+            print(f"❌ {r.fichier}: {r.statut} ({detail})")
+        echecs += r.statut != "ok"
+    n = len(resultats)
+    bilan = f"{n} sauvegardes, {n - echecs} ok, {echecs} en échec"
+    reconstruits = sum(r.etat_initial_reconstruit for r in resultats)
+    if reconstruits:
+        bilan += f" ({reconstruits} rejouées depuis un état initial reconstruit)"
+    print(bilan, file=sys.stderr if args.json else sys.stdout)
+    return 1 if echecs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,28 @@
 
 import json
 import os
-from typing import Any, Dict, List
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - on n'impose pas la présence en runtime
+    orjson = None
+
+try:  # client asynchrone (ClientApiAsync)
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
 
 API_BASE = os.getenv("API_BASE", "http://127.0.0.1:8080")
+DELAI_CONNEXION = float(os.getenv("API_TIMEOUT_CONNEXION", "3"))
+DELAI_LECTURE = float(os.getenv("API_TIMEOUT", "5"))
+TENTATIVES = int(os.getenv("API_RETRIES", "3"))
+DELAI_LONG_POLL = 25.0
 
 
 class ApiErreur(Exception):
@@ -18,30 +35,38 @@ class ApiErreur(Exception):
         self.payload = payload or {}
 
 
-def _get(path: str) -> Dict[str, Any]:
-    r = requests.get(f"{API_BASE}{path}", timeout=5)
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(contenu: bytes) -> Any:
+    return orjson.loads(contenu) if orjson is not None else json.loads(contenu)
+
+
+# --- Décodage des réponses (commun aux clients sync et async) -----------------
+def _lire_get(status: int, contenu: bytes) -> Any:
     try:
-        data = r.json()
-    except Exception:
-        r.raise_for_status()
+        data = _loads(contenu)
+    except ValueError:
+        if status >= 400:
+            raw = contenu.decode("utf-8", "replace")
+            raise ApiErreur(f"http_error_{status}", {"raw": raw})
         raise
-    if r.status_code >= 400:
+    if status >= 400:
         raise ApiErreur(data.get("error", "http_error"), data)
     return data
 
 
-def _post(path: str, payload: Any) -> Any:
-    headers = {"Content-Type": "application/json"}
-    r = requests.post(
-        f"{API_BASE}{path}", headers=headers, data=json.dumps(payload), timeout=5
-    )
-    text = r.text
+def _lire_post(status: int, contenu: bytes) -> Any:
     try:
-        return r.json()
-    except Exception:
-        if r.status_code >= 400:
+        return _loads(contenu)
+    except ValueError:
+        text = contenu.decode("utf-8", "replace")
+        if status >= 400:
             # remonte une erreur applicative avec le corps brut pour debug
-            raise ApiErreur(f"http_error_{r.status_code}", {"raw": text})
+            raise ApiErreur(f"http_error_{status}", {"raw": text})
         # tolérance: certains endpoints peuvent répondre "OK" / vide
         if (text or "").strip().lower() in ("ok", "true", ""):
             return {"ok": True, "raw": text}
@@ -49,6 +74,241 @@ def _post(path: str, payload: Any) -> Any:
         raise ApiErreur("invalid_non_json_success", {"raw": text})
 
 
+def _entetes(compression: bool) -> Dict[str, str]:
+    return {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate" if compression else "identity",
+    }
+
+
+class ClientApi:
+    """Client HTTP de l'API: connexions gardées ouvertes (keep-alive, pool),
+    délais de connexion/lecture, nouvelles tentatives, réponses compressées.
+
+    Nouvelles tentatives: erreurs de connexion pour toutes les requêtes (rien
+    n'a été envoyé) ; 502/503/504 et erreurs de lecture pour les GET seulement
+    (un POST rejoué jouerait deux fois l'action).
+    """
+
+    def __init__(
+        self,
+        base: Optional[str] = None,
+        timeout: Optional[float] = None,
+        timeout_connexion: Optional[float] = None,
+        tentatives: Optional[int] = None,
+        compression: bool = True,
+        taille_pool: int = 10,
+    ):
+        self._base = base
+        self.timeout = (
+            DELAI_CONNEXION if timeout_connexion is None else timeout_connexion,
+            DELAI_LECTURE if timeout is None else timeout,
+        )
+        tentatives = TENTATIVES if tentatives is None else tentatives
+        retry = Retry(
+            total=tentatives,
+            connect=tentatives,
+            read=tentatives,
+            status=tentatives,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=taille_pool, max_retries=retry
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(_entetes(compression))
+        # chemin -> (ETag, dernière réponse): un 304 (rien n'a changé) renvoie
+        # la réponse gardée, sans corps ni parsing
+        self._etags: Dict[str, Tuple[str, Any]] = {}
+
+    @property
+    def base(self) -> str:
+        return self._base or API_BASE
+
+    def get(self, path: str, **kwargs) -> Any:
+        r = self.session.get(f"{self.base}{path}", timeout=self.timeout, **kwargs)
+        return _lire_get(r.status_code, r.content)
+
+    def get_conditionnel(self, path: str) -> Any:
+        """GET avec If-None-Match ; sur 304, la réponse précédente (même objet)."""
+        connu = self._etags.get(path)
+        headers = {"If-None-Match": connu[0]} if connu else {}
+        r = self.session.get(
+            f"{self.base}{path}", headers=headers, timeout=self.timeout
+        )
+        if r.status_code == 304 and connu:
+            return connu[1]
+        try:
+            data = _lire_get(r.status_code, r.content)
+        except ApiErreur:
+            self._etags.pop(path, None)
+            raise
+        etag = r.headers.get("ETag")
+        if etag:
+            self._etags[path] = (etag, data)
+        return data
+
+    def post(self, path: str, payload: Any) -> Any:
+        r = self.session.post(
+            f"{self.base}{path}",
+            data=_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        )
+        return _lire_post(r.status_code, r.content)
+
+    def changements(
+        self, path: str, since: int, timeout: float = DELAI_LONG_POLL
+    ) -> Optional[Any]:
+        """Long-poll: attend un changement ; None si rien dans le délai (304)."""
+        r = self.session.get(
+            f"{self.base}{path}",
+            params={"since": since, "timeout": timeout},
+            timeout=(self.timeout[0], timeout + self.timeout[1]),
+        )
+        if r.status_code == 304:
+            return None
+        return _lire_get(r.status_code, r.content)
+
+    def fermer(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "ClientApi":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+
+class ClientApiAsync:
+    """Variante asyncio de ClientApi (httpx, optionnel)."""
+
+    def __init__(
+        self,
+        base: Optional[str] = None,
+        timeout: Optional[float] = None,
+        timeout_connexion: Optional[float] = None,
+        tentatives: Optional[int] = None,
+        compression: bool = True,
+        taille_pool: int = 10,
+    ):
+        if httpx is None:
+            raise RuntimeError("ClientApiAsync: paquet 'httpx' non installé")
+        self._base = base
+        self.timeout = httpx.Timeout(
+            DELAI_LECTURE if timeout is None else timeout,
+            connect=DELAI_CONNEXION if timeout_connexion is None else timeout_connexion,
+        )
+        # httpx ne rejoue que les échecs de connexion: sûr pour les POST
+        transport = httpx.AsyncHTTPTransport(
+            retries=TENTATIVES if tentatives is None else tentatives,
+            limits=httpx.Limits(
+                max_connections=taille_pool, max_keepalive_connections=taille_pool
+            ),
+        )
+        self.client = httpx.AsyncClient(
+            transport=transport, timeout=self.timeout, headers=_entetes(compression)
+        )
+        self._etags: Dict[str, Tuple[str, Any]] = {}
+
+    @property
+    def base(self) -> str:
+        return self._base or API_BASE
+
+    async def get(self, path: str, **kwargs) -> Any:
+        r = await self.client.get(f"{self.base}{path}", **kwargs)
+        return _lire_get(r.status_code, r.content)
+
+    async def get_conditionnel(self, path: str) -> Any:
+        connu = self._etags.get(path)
+        headers = {"If-None-Match": connu[0]} if connu else {}
+        r = await self.client.get(f"{self.base}{path}", headers=headers)
+        if r.status_code == 304 and connu:
+            return connu[1]
+        try:
+            data = _lire_get(r.status_code, r.content)
+        except ApiErreur:
+            self._etags.pop(path, None)
+            raise
+        etag = r.headers.get("ETag")
+        if etag:
+            self._etags[path] = (etag, data)
+        return data
+
+    async def post(self, path: str, payload: Any) -> Any:
+        r = await self.client.post(
+            f"{self.base}{path}",
+            content=_dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+        return _lire_post(r.status_code, r.content)
+
+    async def changements(
+        self, path: str, since: int, timeout: float = DELAI_LONG_POLL
+    ) -> Optional[Any]:
+        r = await self.client.get(
+            f"{self.base}{path}",
+            params={"since": since, "timeout": timeout},
+            timeout=httpx.Timeout(
+                timeout + self.timeout.read, connect=self.timeout.connect
+            ),
+        )
+        if r.status_code == 304:
+            return None
+        return _lire_get(r.status_code, r.content)
+
+    async def fermer(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "ClientApiAsync":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.fermer()
+
+
+# client partagé des fonctions du module (créé au premier appel)
+_client: Optional[ClientApi] = None
+_verrou_client = threading.Lock()
+
+
+def client() -> ClientApi:
+    global _client
+    if _client is None:
+        with _verrou_client:
+            if _client is None:
+                _client = ClientApi()
+    return _client
+
+
+def configurer(**options) -> ClientApi:
+    """Remplace le client partagé (base, timeout, tentatives, compression...)."""
+    global _client
+    with _verrou_client:
+        ancien, _client = _client, ClientApi(**options)
+    if ancien is not None:
+        ancien.fermer()
+    return _client
+
+
+def _get(path: str) -> Dict[str, Any]:
+    return client().get(path)
+
+
+def _get_conditionnel(path: str) -> Dict[str, Any]:
+    return client().get_conditionnel(path)
+
+
+def _post(path: str, payload: Any) -> Any:
+    return client().post(path, payload)
+
+
 # --- Endpoints principaux ------------------------------------------------------
 def lister_parties() -> list[dict]:
     """Attend que l'API GET /parties renvoie une liste de parties.
@@ -73,7 +333,99 @@ def inscrire_joueur(pid: str, nom: str) -> dict:
 
 
 def etat_partie(pid: str) -> Dict[str, Any]:
-    return _get(f"/parties/{pid}")
+    """État de la partie ; inchangé (304), le même objet qu'au dernier appel."""
+    return _get_conditionnel(f"/parties/{pid}")
+
+
+# --- Long-poll (GET .../changes) ----------------------------------------------
+def changements_partie(
+    pid: str, since: int = -1, timeout: float = DELAI_LONG_POLL
+) -> Optional[Dict[str, Any]]:
+    """Delta de la partie depuis la version `since` (journal: nouvelles entrées)."""
+    return client().changements(f"/parties/{pid}/changes", since, timeout)
+
+
+def changements_table(
+    tid: str, since: int = -1, timeout: float = DELAI_LONG_POLL
+) -> Optional[Dict[str, Any]]:
+    return client().changements(f"/tables/{tid}/changes", since, timeout)
+
+
+def _fusionner_partie(etat: Optional[Dict[str, Any]], delta: Dict[str, Any]):
+    # même forme que etat_partie(): le journal garde les 10 dernières entrées
+    journal = delta["journal"]
+    if not delta.get("complet") and etat is not None:
+        journal = (etat.get("journal", []) + journal)[-10:]
+    return {**delta, "journal": journal}
+
+
+class Suivi:
+    """Suit une partie ou une table par long-poll, dans un thread.
+
+    La boucle d'affichage appelle prendre() à chaque tour: l'état le plus
+    récent s'il a changé depuis, sinon None (pas de requête de son côté).
+    `reveil` est appelé à chaque nouvel état, pour sortir la boucle de son
+    attente (voir rendu.Reveil).
+    """
+
+    def __init__(
+        self,
+        attendre: Callable[[int], Optional[Dict[str, Any]]],
+        fusionner: Callable[[Optional[Dict[str, Any]], Dict[str, Any]], Any] = (
+            lambda etat, delta: delta
+        ),
+        reveil: Optional[Callable[[], None]] = None,
+    ):
+        self._attendre = attendre
+        self._fusionner = fusionner
+        self._reveil = reveil
+        self._verrou = threading.Lock()
+        self._arret = threading.Event()
+        self._etat: Optional[Dict[str, Any]] = None
+        self._nouveau = False
+        self.version = -1
+        self.erreur: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._boucle, daemon=True)
+        self._thread.start()
+
+    def _boucle(self) -> None:
+        while not self._arret.is_set():
+            try:
+                delta = self._attendre(self.version)
+            except Exception as ex:  # API absente, partie supprimée...
+                self.erreur = ex
+                self._arret.wait(2.0)
+                continue
+            self.erreur = None
+            if delta is None:
+                continue
+            with self._verrou:
+                self._etat = self._fusionner(self._etat, delta)
+                self.version = delta.get("version", self.version)
+                self._nouveau = True
+            if self._reveil is not None:
+                self._reveil()
+
+    def prendre(self) -> Optional[Dict[str, Any]]:
+        with self._verrou:
+            if not self._nouveau:
+                return None
+            self._nouveau = False
+            return self._etat
+
+    def arreter(self) -> None:
+        # le thread (daemon) sort au retour de la requête en cours
+        self._arret.set()
+
+
+def suivre_partie(pid: str, reveil: Optional[Callable[[], None]] = None) -> Suivi:
+    return Suivi(
+        lambda since: changements_partie(pid, since), _fusionner_partie, reveil
+    )
+
+
+def suivre_table(tid: str, reveil: Optional[Callable[[], None]] = None) -> Suivi:
+    return Suivi(lambda since: changements_table(tid, since), reveil=reveil)
 
 
 def lister_actions_possibles(pid: str, joueur_id: str) -> List[str]:
@@ -84,6 +436,14 @@ def lister_actions_possibles(pid: str, joueur_id: str) -> List[str]:
         return []
 
 
+def lister_actions_possibles_tous(pid: str) -> Dict[str, List[str]]:
+    """Actions jouables de tous les joueurs de la partie, en une requête."""
+    try:
+        return _get(f"/parties/{pid}/actions/possibles/tous").get("possibles", {})
+    except ApiErreur:
+        return {}
+
+
 def valider_action(
     pid: str, type_action: str, joueur_id: str, payload: Dict[str, Any] | None = None
 ) -> Dict[str, Any]:
@@ -98,6 +458,14 @@ def jouer_action(
     return _post(f"/parties/{pid}/actions", body)
 
 
+def jouer_actions(
+    pid: str, actions: List[Dict[str, Any]], stop_on_refus: bool = False
+) -> Dict[str, Any]:
+    """Plusieurs actions ({type, auteur_id, payload}) en une requête, dans l'ordre."""
+    body = {"actions": actions, "stop_on_refus": stop_on_refus}
+    return _post(f"/parties/{pid}/actions/batch", body)
+
+
 def debut_nouveau_tour(pid: str) -> Any:
     return _post(f"/parties/{pid}/tour/debut", {})
 
@@ -146,7 +514,7 @@ def table_start(tid: str, nom: str, joueurs: dict[str, bool]) -> dict:
 
 
 def etat_table(tid: str) -> dict:
-    return _get(f"/tables/{tid}")
+    return _get_conditionnel(f"/tables/{tid}")
 
 
 def lister_tables_active_only() -> list[dict]:
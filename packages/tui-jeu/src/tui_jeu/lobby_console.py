@@ -14,6 +14,7 @@ from .client_api import (
 
 # 👉 quand on entre dans une table, on lance l'écran d'attente
 from .table_console import boucle_table
+from .rendu import Ecran
 
 
 HELP = [
@@ -38,6 +39,13 @@ def _fmt(maxw: int, s: str) -> str:
     return s[: maxw - 1] if len(s) >= maxw else s
 
 
+def _reprendre(stdscr, ecran: Ecran) -> None:
+    # retour de l'écran de table: il a repris l'affichage et rendu getch
+    # non bloquant
+    stdscr.nodelay(False)
+    ecran.invalider()
+
+
 def boucle_lobby(stdscr) -> Optional[LobbyResult]:
     """
     Écran de Lobby TUI basé sur les Tables:
@@ -48,8 +56,8 @@ def boucle_lobby(stdscr) -> Optional[LobbyResult]:
       5) on retourne (PID, nom) pour ouvrir la Table de jeu (ui_console)
     """
     curses.curs_set(1)
-    stdscr.nodelay(False)
-    maxy, maxx = stdscr.getmaxyx()
+    stdscr.nodelay(False)  # rien ne change sans touche: getch bloquant
+    ecran = Ecran(stdscr)
 
     # 3 zones éditables/navigables
     zone = "nom"  # "nom" | "liste" | "creation"
@@ -87,30 +95,32 @@ def boucle_lobby(stdscr) -> Optional[LobbyResult]:
     refresh_list()
 
     while True:
-        stdscr.erase()
-        maxy, maxx = stdscr.getmaxyx()
-        stdscr.addstr(
+        page = ecran.page()
+        maxy, maxx = page.hauteur, page.largeur
+        page.ecrire(
             0, 0, _fmt(maxx, "Lobby — Jeu d'aventure politique (Tables)"), curses.A_BOLD
         )
 
         # Aide
-        stdscr.addstr(2, 0, "Aide :", curses.A_UNDERLINE)
+        page.ecrire(2, 0, "Aide :", curses.A_UNDERLINE)
         for i, h in enumerate(HELP):
-            stdscr.addstr(3 + i, 2, _fmt(maxx, f"- {h}"))
+            page.ecrire(3 + i, 2, _fmt(maxx, f"- {h}"))
 
         # Zone Nom (identité joueur)
         y = 3 + len(HELP) + 1
-        stdscr.addstr(y, 0, "Votre nom (identification):", curses.A_UNDERLINE)
+        page.ecrire(y, 0, "Votre nom (identification):", curses.A_UNDERLINE)
         attr_nom = curses.A_REVERSE if zone == "nom" else curses.A_NORMAL
-        stdscr.addstr(
+        page.ecrire(
             y + 1, 2, _fmt(maxx, nom if nom else "(entrez votre nom)"), attr_nom
         )
+        if zone == "nom":
+            page.curseur = (y + 1, 2 + len(nom))
 
         # Liste des tables existantes
         yl = y + 3
-        stdscr.addstr(yl, 0, "Tables existantes:", curses.A_UNDERLINE)
+        page.ecrire(yl, 0, "Tables existantes:", curses.A_UNDERLINE)
         if not tables_list:
-            stdscr.addstr(yl + 1, 2, "(aucune)")
+            page.ecrire(yl + 1, 2, "(aucune)")
         else:
             for idx, t in enumerate(tables_list):
                 joueurs = t.get("joueurs", {})
@@ -128,24 +138,26 @@ def boucle_lobby(stdscr) -> Optional[LobbyResult]:
                     if (zone == "liste" and idx == selection)
                     else curses.A_NORMAL
                 )
-                stdscr.addstr(yl + 1 + idx, 2, _fmt(maxx, line), attr)
+                page.ecrire(yl + 1 + idx, 2, _fmt(maxx, line), attr)
 
         # Zone Création de table
         yc = yl + 2 + max(1, len(tables_list))
-        stdscr.addstr(yc, 0, "Créer une table (nom facultatif) :", curses.A_UNDERLINE)
+        page.ecrire(yc, 0, "Créer une table (nom facultatif) :", curses.A_UNDERLINE)
         attr_crea = curses.A_REVERSE if zone == "creation" else curses.A_NORMAL
         placeholder = (
             nom_table
             if nom_table
             else "(ex: 'Salon du samedi') — seuil=2, règles par défaut"
         )
-        stdscr.addstr(yc + 1, 2, _fmt(maxx, placeholder), attr_crea)
+        page.ecrire(yc + 1, 2, _fmt(maxx, placeholder), attr_crea)
+        if zone == "creation":
+            page.curseur = (yc + 1, 2 + len(nom_table))
 
         # Message bas
         if message:
-            stdscr.addstr(maxy - 1, 0, _fmt(maxx, message), curses.A_BOLD)
+            page.ecrire(maxy - 1, 0, _fmt(maxx, message), curses.A_BOLD)
 
-        stdscr.refresh()
+        ecran.afficher(page)
 
         ch = stdscr.getch()
         if ch in (ord("q"), ord("Q")):
@@ -178,6 +190,7 @@ def boucle_lobby(stdscr) -> Optional[LobbyResult]:
                     _ = table_join(tid, nom)
                     # ouvre l'écran d'attente; quand la table démarre → PID
                     pid = boucle_table(stdscr, tid, nom)
+                    _reprendre(stdscr, ecran)
                     if pid:
                         return LobbyResult(pid, nom)
                     else:
@@ -215,6 +228,7 @@ def boucle_lobby(stdscr) -> Optional[LobbyResult]:
                 try:
                     _ = table_join(tid, nom)
                     pid = boucle_table(stdscr, tid, nom)  # attend le démarrage
+                    _reprendre(stdscr, ecran)
                     if pid:
                         return LobbyResult(pid, nom)
                     else:
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Rendu différentiel des écrans curses.
+
+Un écran décrit son contenu dans une Page (une ligne par rangée, comme
+addstr) ; Ecran garde la dernière page affichée et ne réécrit que les
+rangées qui ont changé. Entre deux rendus, la boucle attend une touche ou
+un réveil (nouvel état reçu par Suivi) au lieu de tourner toutes les 50 ms.
+"""
+
+import curses
+import os
+import select
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# (colonne, texte, attribut)
+Ligne = Tuple[int, str, int]
+
+# échéance de secours: un redimensionnement (SIGWINCH, traité par ncurses
+# au prochain getch) ne réveille pas select
+DELAI_ATTENTE = 1.0
+
+
+class Page:
+    """Contenu voulu de l'écran, construit à chaque tour de boucle."""
+
+    def __init__(self, hauteur: int, largeur: int):
+        self.hauteur = hauteur
+        self.largeur = largeur
+        self.lignes: Dict[int, Ligne] = {}
+        self.curseur: Optional[Tuple[int, int]] = None
+
+    def ecrire(self, y: int, x: int, texte: str, attr: int = curses.A_NORMAL):
+        if 0 <= y < self.hauteur:
+            self.lignes[y] = (x, (texte or "").replace("\n", " "), attr)
+
+
+class Ecran:
+    """Applique une Page en ne touchant que les rangées modifiées."""
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self._affiche: Dict[int, Ligne] = {}
+        self._taille: Optional[Tuple[int, int]] = None
+        self._curseur: Optional[Tuple[int, int]] = None
+
+    def page(self) -> Page:
+        return Page(*self.stdscr.getmaxyx())
+
+    def invalider(self) -> None:
+        """Au prochain rendu, tout redessiner (un autre écran est passé)."""
+        self._taille = None
+
+    def afficher(self, page: Page) -> int:
+        """Rend la page; retourne le nombre de rangées réécrites."""
+        taille = self.stdscr.getmaxyx()
+        if taille != self._taille:
+            # premier rendu ou redimensionnement: on repart d'un écran vide
+            self.stdscr.clear()
+            self._affiche = {}
+            self._curseur = None
+            self._taille = taille
+        maxy, maxx = taille
+        touchees = 0
+        for y in sorted(set(self._affiche) | set(page.lignes)):
+            ligne = page.lignes.get(y)
+            if y >= maxy or self._affiche.get(y) == ligne:
+                continue
+            try:
+                self.stdscr.move(y, 0)
+                self.stdscr.clrtoeol()
+                if ligne is not None:
+                    x, texte, attr = ligne
+                    # jamais la dernière colonne: addstr y lèverait une erreur
+                    self.stdscr.addstr(y, x, texte[: max(0, maxx - 1 - x)], attr)
+            except curses.error:
+                pass
+            touchees += 1
+        self._affiche = {y: l for y, l in page.lignes.items() if y < maxy}
+        deplace = page.curseur != self._curseur
+        if page.curseur is not None and (touchees or deplace):
+            try:
+                self.stdscr.move(*page.curseur)
+            except curses.error:
+                pass
+        self._curseur = page.curseur
+        if touchees or deplace:
+            self.stdscr.refresh()
+        return touchees
+
+
+class Reveil:
+    """Tube d'auto-réveil: un thread signale, la boucle curses se réveille."""
+
+    def __init__(self):
+        self._lecture, self._ecriture = os.pipe()
+        os.set_blocking(self._lecture, False)
+        os.set_blocking(self._ecriture, False)
+        # un Suivi peut signaler après fermer(): le descripteur, réattribué
+        # entre-temps, ne doit pas recevoir l'octet
+        self._verrou = threading.Lock()
+        self._ferme = False
+
+    def fileno(self) -> int:
+        return self._lecture
+
+    def signaler(self) -> None:
+        with self._verrou:
+            if self._ferme:
+                return
+            try:
+                os.write(self._ecriture, b"!")
+            except OSError:
+                pass  # tube plein: un réveil est déjà en attente
+
+    def vider(self) -> None:
+        try:
+            while os.read(self._lecture, 512):
+                pass
+        except OSError:
+            pass
+
+    def fermer(self) -> None:
+        with self._verrou:
+            if self._ferme:
+                return
+            self._ferme = True
+            os.close(self._lecture)
+            os.close(self._ecriture)
+
+
+def attendre(reveil: Optional[Reveil] = None, delai: float = DELAI_ATTENTE) -> None:
+    """Bloque jusqu'à une touche, un réveil ou l'échéance.
+
+    À n'appeler qu'après un getch() revenu à -1: ncurses n'a alors plus de
+    touche en tampon et tout nouvel appui se voit sur stdin.
+    """
+    attendus = [sys.stdin] + ([reveil] if reveil is not None else [])
+    try:
+        prets, _, _ = select.select(attendus, [], [], delai)
+    except (OSError, ValueError):
+        time.sleep(delai)  # stdin non sélectionnable: simple temporisation
+        return
+    if reveil is not None and reveil in prets:
+        reveil.vider()
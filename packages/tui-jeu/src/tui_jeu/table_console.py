@@ -8,7 +8,8 @@ locale.setlocale(locale.LC_ALL, "")
 import time
 from typing import Optional
 
-from .client_api import etat_table, table_ready, table_start, ApiErreur
+from .client_api import etat_table, suivre_table, table_ready, table_start, ApiErreur
+from .rendu import Ecran, Reveil, attendre
 
 HELP = [
     "[espace] basculer prêt/pas prêt",
@@ -23,137 +24,126 @@ def _fmt(maxw: int, s: str) -> str:
     return s[: maxw - 1] if len(s) >= maxw else s
 
 
-def _safe_status_line(stdscr, y: int, text: str, attr=0):
-    try:
-        maxy, maxx = stdscr.getmaxyx()
-        if y < 0:
-            y = 0
-        if y >= maxy:
-            y = maxy - 1
-        # une seule ligne, pas de retours
-        s = (text or "").replace("\n", " ")
-        # tronquer en tenant compte de la largeur
-        if len(s) > maxx - 1:
-            s = s[: maxx - 1]
-        stdscr.move(y, 0)
-        stdscr.clrtoeol()
-        stdscr.addstr(y, 0, s, attr)
-    except Exception:
-        # en dernier recours : on n’affiche rien plutôt que crasher
-        pass
-
-
 def boucle_table(stdscr, tid: str, nom: str) -> Optional[str]:
     """Retourne pid si démarrée, sinon None si on quitte."""
     curses.curs_set(0)
     stdscr.nodelay(True)
+    ecran = Ecran(stdscr)
+    reveil = Reveil()
     message = ""
     last = 0.0
     data = {}
+    # long-poll dans un thread, qui réveille la boucle à chaque changement
+    suivi = suivre_table(tid, reveil.signaler)
 
-    while True:
-        now = time.time()
-        if now - last > 1.5:
-            try:
-                data = etat_table(tid)
-                # auto-sortie si partie démarrée
-                if data.get("demarree") and data.get("partie_id"):
-                    return data["partie_id"]
-            except ApiErreur as e:
-                message = f"Erreur: {e}"
-            last = now
-
-        stdscr.erase()
-        maxy, maxx = stdscr.getmaxyx()
-        stdscr.addstr(
-            0,
-            0,
-            _fmt(maxx, f"Table d’attente — {tid[:8]} | Vous: {nom}"),
-            curses.A_BOLD,
-        )
-
-        # Infos
-        host = data.get("host")
-        joueurs = data.get("joueurs", {})  # {nom:ready}
-        attendus_min = data.get("attendus_min", 2)
-        ready_count = sum(1 for v in joueurs.values() if v)
-        total = len(joueurs)
-
-        stdscr.addstr(
-            2,
-            0,
-            _fmt(
-                maxx,
-                f"Hôte: {host or '(non défini)'} | Joueurs: {total} | Prêts: {ready_count}/{total} | Seuil: {attendus_min}",
-            ),
-        )
-        stdscr.addstr(3, 0, _fmt(maxx, "État des joueurs:"), curses.A_UNDERLINE)
-        y = 4
-        if not joueurs:
-            stdscr.addstr(y, 2, "(en attente d’inscriptions depuis le lobby)")
-            y += 1
-        else:
-            for jn, rd in joueurs.items():
-                tag = "✅ prêt" if rd else "⏳ pas prêt"
-                mark = " (vous)" if jn == nom else ""
-                stdscr.addstr(y, 2, _fmt(maxx, f"- {jn}{mark} — {tag}"))
-                y += 1
-
-        # Bandeau “en attente”
-        if total < attendus_min:
-            stdscr.addstr(
-                y + 1,
+    try:
+        while True:
+            now = time.time()
+            nouvelle = suivi.prendre()
+            if nouvelle is not None or not last:
+                try:
+                    data = nouvelle or etat_table(tid)
+                    # auto-sortie si partie démarrée
+                    if data.get("demarree") and data.get("partie_id"):
+                        return data["partie_id"]
+                except ApiErreur as e:
+                    message = f"Erreur: {e}"
+                last = now
+
+            page = ecran.page()
+            maxy, maxx = page.hauteur, page.largeur
+            page.ecrire(
                 0,
-                _fmt(maxx, "🟡 En attente de joueurs supplémentaires…"),
-                curses.A_BOLD,
-            )
-        elif ready_count < total:
-            stdscr.addstr(
-                y + 1,
                 0,
-                _fmt(maxx, "🟡 Tous les joueurs ne sont pas prêts…"),
+                _fmt(maxx, f"Table d’attente — {tid[:8]} | Vous: {nom}"),
                 curses.A_BOLD,
             )
-        else:
-            stdscr.addstr(
-                y + 1,
+
+            # Infos
+            host = data.get("host")
+            joueurs = data.get("joueurs", {})  # {nom:ready}
+            attendus_min = data.get("attendus_min", 2)
+            ready_count = sum(1 for v in joueurs.values() if v)
+            total = len(joueurs)
+
+            page.ecrire(
+                2,
                 0,
-                _fmt(maxx, "🟢 Tous prêts — l’hôte peut démarrer (touche 's')."),
-                curses.A_BOLD,
+                _fmt(
+                    maxx,
+                    f"Hôte: {host or '(non défini)'} | Joueurs: {total} | Prêts: {ready_count}/{total} | Seuil: {attendus_min}",
+                ),
             )
-
-        # Aide
-        stdscr.addstr(y + 3, 0, "Aide :", curses.A_UNDERLINE)
-        for i, h in enumerate(HELP):
-            stdscr.addstr(y + 4 + i, 2, _fmt(maxx, f"- {h}"))
-
-        if message:
-            _safe_status_line(stdscr, stdscr.getmaxyx()[0] - 1, message, curses.A_BOLD)
-
-        stdscr.refresh()
-
-        ch = stdscr.getch()
-        if ch == -1:
-            time.sleep(0.05)
-            continue
-
-        if ch in (ord("q"), ord("Q")):
-            return None
-        elif ch in (ord("r"), ord("R")):
-            last = 0
-        elif ch == ord(" "):  # bascule prêt
-            try:
-                cur = bool(joueurs.get(nom, False))
-                _ = table_ready(tid, nom, not cur)
+            page.ecrire(3, 0, _fmt(maxx, "État des joueurs:"), curses.A_UNDERLINE)
+            y = 4
+            if not joueurs:
+                page.ecrire(y, 2, "(en attente d’inscriptions depuis le lobby)")
+                y += 1
+            else:
+                for jn, rd in joueurs.items():
+                    tag = "✅ prêt" if rd else "⏳ pas prêt"
+                    mark = " (vous)" if jn == nom else ""
+                    page.ecrire(y, 2, _fmt(maxx, f"- {jn}{mark} — {tag}"))
+                    y += 1
+
+            # Bandeau “en attente”
+            if total < attendus_min:
+                page.ecrire(
+                    y + 1,
+                    0,
+                    _fmt(maxx, "🟡 En attente de joueurs supplémentaires…"),
+                    curses.A_BOLD,
+                )
+            elif ready_count < total:
+                page.ecrire(
+                    y + 1,
+                    0,
+                    _fmt(maxx, "🟡 Tous les joueurs ne sont pas prêts…"),
+                    curses.A_BOLD,
+                )
+            else:
+                page.ecrire(
+                    y + 1,
+                    0,
+                    _fmt(maxx, "🟢 Tous prêts — l’hôte peut démarrer (touche 's')."),
+                    curses.A_BOLD,
+                )
+
+            # Aide
+            page.ecrire(y + 3, 0, "Aide :", curses.A_UNDERLINE)
+            for i, h in enumerate(HELP):
+                page.ecrire(y + 4 + i, 2, _fmt(maxx, f"- {h}"))
+
+            if message:
+                page.ecrire(maxy - 1, 0, message, curses.A_BOLD)
+
+            ecran.afficher(page)
+
+            ch = stdscr.getch()
+            if ch == -1:
+                attendre(reveil)
+                continue
+
+            if ch in (ord("q"), ord("Q")):
+                return None
+            elif ch in (ord("r"), ord("R")):
                 last = 0
-            except ApiErreur as e:
-                message = f"Erreur prêt: {(e.payload or {}).get('reason') or e}"
-        elif ch in (ord("s"), ord("S")):
-            try:
-                resp = table_start(tid, nom, joueurs)
-                if isinstance(resp, dict) and resp.get("ok") and resp.get("pid"):
-                    return resp["pid"]
-                else:
-                    message = "Start refusé"
-            except ApiErreur as e:
-                message = f"Erreur start: {(e.payload or {}).get('reason') or e}"
+            elif ch == ord(" "):  # bascule prêt
+                try:
+                    cur = bool(joueurs.get(nom, False))
+                    _ = table_ready(tid, nom, not cur)
+                    last = 0
+                except ApiErreur as e:
+                    message = f"Erreur prêt: {(e.payload or {}).get('reason') or e}"
+            elif ch in (ord("s"), ord("S")):
+                try:
+                    resp = table_start(tid, nom, joueurs)
+                    if isinstance(resp, dict) and resp.get("ok") and resp.get("pid"):
+                        return resp["pid"]
+                    else:
+                        message = "Start refusé"
+                except ApiErreur as e:
+                    message = f"Erreur start: {(e.payload or {}).get('reason') or e}"
+    finally:
+        suivi.arreter()
+        reveil.fermer()
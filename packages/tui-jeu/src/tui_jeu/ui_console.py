@@ -14,8 +14,10 @@ from .client_api import (
     debut_nouveau_tour,
     sauvegarder,
     charger,
+    suivre_partie,
     ApiErreur,
 )
+from .rendu import Ecran, Reveil, attendre
 
 ACTIONS_CONNUES = ["proposer_reforme", "ouvrir_negociation", "faire_campagne"]
 
@@ -48,7 +50,7 @@ def _trouver_joueur_id(etat: Dict[str, Any], nom_joueur: Optional[str]) -> str:
 
 
 def _dessiner(
-    stdscr,
+    ecran: Ecran,
     pid: str,
     jid: str,
     selection: int,
@@ -56,12 +58,12 @@ def _dessiner(
     etat: Dict[str, Any],
     message: str,
 ):
-    stdscr.erase()
-    maxy, maxx = stdscr.getmaxyx()
+    page = ecran.page()
+    maxy, maxx = page.hauteur, page.largeur
 
     # En-tête
     titre = f"Jeu d'aventure politique — TUI | Partie: {pid[:8]}"
-    stdscr.addstr(0, 0, _fmt(maxx, titre), curses.A_BOLD)
+    page.ecrire(0, 0, _fmt(maxx, titre), curses.A_BOLD)
 
     tour = etat.get("tour")
     phase = etat.get("phase")
@@ -77,7 +79,7 @@ def _dessiner(
     j_attention = joueur.get("attention", 0)
     j_score = joueur.get("score", 0)
 
-    stdscr.addstr(
+    page.ecrire(
         2,
         0,
         _fmt(
@@ -85,7 +87,7 @@ def _dessiner(
             f"Tour: {tour}   Phase: {phase}   Tension: {tension}   Statut: {statut}",
         ),
     )
-    stdscr.addstr(
+    page.ecrire(
         3,
         0,
         _fmt(
@@ -93,9 +95,9 @@ def _dessiner(
             f"Joueur: {j_nom} ({j_role})   Attention: {j_attention}   Score: {j_score}",
         ),
     )
-    stdscr.addstr(4, 0, _fmt(maxx, f"Contentieux: Réforme X   Soutien: {soutien}"))
+    page.ecrire(4, 0, _fmt(maxx, f"Contentieux: Réforme X   Soutien: {soutien}"))
     if en_inscription:
-        stdscr.addstr(
+        page.ecrire(
             5,
             0,
             _fmt(
@@ -106,35 +108,37 @@ def _dessiner(
         )
 
     # Actions
-    stdscr.addstr(6, 0, "Actions jouables :", curses.A_UNDERLINE)
+    page.ecrire(6, 0, "Actions jouables :", curses.A_UNDERLINE)
     if not actions:
-        stdscr.addstr(
+        page.ecrire(
             7, 2, "(aucune — vérifie la phase, l'attention ou les préconditions)"
         )
 
     for idx, act in enumerate(actions):
         prefix = "→ " if idx == selection else "  "
         attr = curses.A_REVERSE if idx == selection else curses.A_NORMAL
-        stdscr.addstr(7 + idx, 0, _fmt(maxx, f"{prefix}{act}"), attr)
+        page.ecrire(7 + idx, 0, _fmt(maxx, f"{prefix}{act}"), attr)
 
     # Aide
     y_help = 7 + max(len(actions), 1) + 1
-    stdscr.addstr(y_help, 0, "Aide :", curses.A_UNDERLINE)
+    page.ecrire(y_help, 0, "Aide :", curses.A_UNDERLINE)
     for i, h in enumerate(HELP):
-        stdscr.addstr(y_help + 1 + i, 2, _fmt(maxx, f"- {h}"))
+        page.ecrire(y_help + 1 + i, 2, _fmt(maxx, f"- {h}"))
 
     # Message
     if message:
-        stdscr.addstr(maxy - 1, 0, _fmt(maxx, message), curses.A_BOLD)
+        page.ecrire(maxy - 1, 0, _fmt(maxx, message), curses.A_BOLD)
 
-    stdscr.refresh()
+    ecran.afficher(page)
 
 
 def boucle_tui(
     stdscr, pid: Optional[str], joueur_nom: Optional[str], joueur_id: Optional[str]
 ):
     curses.curs_set(0)
-    stdscr.nodelay(True)  # non-bloquant
+    stdscr.nodelay(True)  # non-bloquant: on attend via rendu.attendre
+    ecran = Ecran(stdscr)
+    reveil = Reveil()
     selection = 0
     dernier_refresh = 0.0
     message = ""
@@ -155,94 +159,111 @@ def boucle_tui(
         message = f"⚠️ {ex} — défaut: {jid[:8]}"
 
     actions = lister_actions_possibles(pid, jid)
+    # plus de sondage périodique: un thread attend les changements (long-poll)
+    suivi = suivre_partie(pid, reveil.signaler)
+
+    try:
+        while True:
+            now = time.time()
+            nouvel_etat = suivi.prendre()
+            if nouvel_etat is not None or not dernier_refresh:
+                try:
+                    etat = nouvel_etat or etat_partie(pid)
+                    actions = lister_actions_possibles(pid, jid)
+                    # 👉 Verrou dur côté TUI
+                    if etat.get("phase") == "inscription":
+                        actions = []  # aucune action clickable
+                    if selection >= len(actions):
+                        selection = max(0, len(actions) - 1)
+                except Exception as ex:
+                    message = f"Erreur rafraîchissement: {ex}"
+                dernier_refresh = now
+
+            _dessiner(ecran, pid, jid, selection, actions, etat, message)
 
-    while True:
-        now = time.time()
-        if now - dernier_refresh > 2.0:
             try:
-                etat = etat_partie(pid)
-                actions = lister_actions_possibles(pid, jid)
-                # 👉 Verrou dur côté TUI
+                ch = stdscr.getch()
+            except Exception:
+                ch = -1
+
+            if ch == -1:
+                # rien à faire: on dort jusqu'à une touche ou un nouvel état
+                attendre(reveil)
+                continue
+            message = ""  # le message reste affiché jusqu'à la touche suivante
+
+            if ch in (curses.KEY_UP, ord("k")):
+                selection = max(0, selection - 1)
+            elif ch in (curses.KEY_DOWN, ord("j")):
+                selection = min(max(0, len(actions) - 1), selection + 1)
+            elif ch in (ord("\n"), curses.KEY_ENTER, 10, 13):
                 if etat.get("phase") == "inscription":
-                    actions = []  # aucune action clickable
-                if selection >= len(actions):
-                    selection = max(0, len(actions) - 1)
-            except Exception as ex:
-                message = f"Erreur rafraîchissement: {ex}"
-            dernier_refresh = now
-
-        _dessiner(stdscr, pid, jid, selection, actions, etat, message)
-        message = ""
-
-        try:
-            ch = stdscr.getch()
-        except Exception:
-            ch = -1
-
-        if ch == -1:
-            time.sleep(0.05)
-            continue
-
-        if ch in (curses.KEY_UP, ord("k")):
-            selection = max(0, selection - 1)
-        elif ch in (curses.KEY_DOWN, ord("j")):
-            selection = min(max(0, len(actions) - 1), selection + 1)
-        elif ch in (ord("\n"), curses.KEY_ENTER, 10, 13):
-            if etat.get("phase") == "inscription":
-                message = "Phase d'inscription — aucune action jouable."
-            elif actions:
-                act = actions[selection]
+                    message = "Phase d'inscription — aucune action jouable."
+                elif actions:
+                    act = actions[selection]
+                    try:
+                        v = valider_action(pid, act, jid, {})
+                        if not v.get("ok", False):
+                            message = f"Refus: {v.get('reason', 'inconnu')}"
+                        else:
+                            r = jouer_action(pid, act, jid, {})
+                            if isinstance(r, dict) and r.get("error") == "refus":
+                                message = f"Refus: {r.get('reason', 'inconnu')}"
+                            else:
+                                message = f"Action jouée: {act}"
+                                dernier_refresh = 0
+                    except ApiErreur as e:
+                        reason = (e.payload or {}).get("reason") or str(e)
+                        message = f"Erreur: {reason}"
+
+            elif ch in (ord("r"), ord("R")):
+                dernier_refresh = 0
+            elif ch in (ord("n"), ord("N")):
+                if etat.get("phase") == "inscription":
+                    message = (
+                        "Phase d'inscription — patiente qu'un second joueur rejoigne."
+                    )
+                else:
+                    try:
+                        _ = debut_nouveau_tour(pid)
+                        message = "Nouveau tour."
+                        dernier_refresh = 0
+                    except ApiErreur as e:
+                        message = (
+                            f"Erreur nouveau tour: {(e.payload or {}).get('reason') or e}"
+                        )
+
+            elif ch in (ord("v"), ord("V")):
                 try:
-                    v = valider_action(pid, act, jid, {})
-                    if not v.get("ok", False):
-                        message = f"Refus: {v.get('reason', 'inconnu')}"
+                    path = "/tmp/partie-reforme.json"
+                    s = sauvegarder(pid, path)
+                    if isinstance(s, dict) and s.get("ok"):
+                        message = f"Sauvegardé: {path}"
                     else:
-                        r = jouer_action(pid, act, jid, {})
-                        if isinstance(r, dict) and r.get("error") == "refus":
-                            message = f"Refus: {r.get('reason', 'inconnu')}"
-                        else:
-                            message = f"Action jouée: {act}"
-                            dernier_refresh = 0
+                        message = "Réponse inattendue sauvegarde"
                 except ApiErreur as e:
-                    reason = (e.payload or {}).get("reason") or str(e)
-                    message = f"Erreur: {reason}"
-
-        elif ch in (ord("r"), ord("R")):
-            dernier_refresh = 0
-        elif ch in (ord("n"), ord("N")):
-            if etat.get("phase") == "inscription":
-                message = "Phase d'inscription — patiente qu'un second joueur rejoigne."
-            else:
+                    message = (
+                        f"Erreur sauvegarde: {(e.payload or {}).get('reason') or e}"
+                    )
+            elif ch in (ord("c"), ord("C")):
                 try:
-                    _ = debut_nouveau_tour(pid)
-                    message = "Nouveau tour."
+                    path = "/tmp/partie-reforme.json"
+                    info = charger(path)
+                    if info.get("id", pid) != pid:
+                        suivi.arreter()
+                        pid = info["id"]
+                        suivi = suivre_partie(pid, reveil.signaler)
+                    message = f"Chargé: PID={pid[:8]} (phase={info.get('phase')})"
+                    etat = etat_partie(pid)
+                    if jid not in etat.get("joueurs", {}):
+                        jid = _trouver_joueur_id(etat, joueur_nom)
                     dernier_refresh = 0
                 except ApiErreur as e:
                     message = (
-                        f"Erreur nouveau tour: {(e.payload or {}).get('reason') or e}"
+                        f"Erreur chargement: {(e.payload or {}).get('reason') or e}"
                     )
-
-        elif ch in (ord("v"), ord("V")):
-            try:
-                path = "/tmp/partie-reforme.json"
-                s = sauvegarder(pid, path)
-                if isinstance(s, dict) and s.get("ok"):
-                    message = f"Sauvegardé: {path}"
-                else:
-                    message = "Réponse inattendue sauvegarde"
-            except ApiErreur as e:
-                message = f"Erreur sauvegarde: {(e.payload or {}).get('reason') or e}"
-        elif ch in (ord("c"), ord("C")):
-            try:
-                path = "/tmp/partie-reforme.json"
-                info = charger(path)
-                pid = info.get("id", pid)
-                message = f"Chargé: PID={pid[:8]} (phase={info.get('phase')})"
-                etat = etat_partie(pid)
-                if jid not in etat.get("joueurs", {}):
-                    jid = _trouver_joueur_id(etat, joueur_nom)
-                dernier_refresh = 0
-            except ApiErreur as e:
-                message = f"Erreur chargement: {(e.payload or {}).get('reason') or e}"
-        elif ch in (ord("q"), ord("Q")):
-            break
+            elif ch in (ord("q"), ord("Q")):
+                break
+    finally:
+        suivi.arreter()
+        reveil.fermer()